@@ -44,6 +44,8 @@ class Settings(BaseSettings):
     # Codebase Oracle Settings
     codebase_root: str = Field(default_factory=os.getcwd)
     max_file_lines: int = 500
+    # Directory for pickled search indexes keyed by commit; empty disables
+    codebase_index_cache_dir: str = ""
 
     # Database Settings
     database_url: str = ""
@@ -20,7 +20,7 @@ from starlette.responses import Response, StreamingResponse
 
 from app.config import get_settings
 from app.agent import portfolio_agent
-from app.tools.experience import get_full_profile, ProfileData
+from app.tools.experience import get_full_profile_json, ProfileData
 from app.schemas.brain_log import BrainLogCollector, set_brain_log_collector
 from app.posthog_client import (
     init_posthog,
@@ -154,14 +154,14 @@ async def root() -> dict:
     }
 
 
-@app.get("/profile")
-async def profile() -> ProfileData:
+@app.get("/profile", response_model=ProfileData)
+async def profile() -> Response:
     """Profile endpoint returning complete profile information.
 
     Returns professional experience, skills, projects, and education data
     for the profile page.
     """
-    return get_full_profile()
+    return Response(content=get_full_profile_json(), media_type="application/json")
 
 
 def _extract_user_message(messages: list[dict[str, Any]]) -> str:
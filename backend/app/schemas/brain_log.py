@@ -303,7 +303,6 @@ class BrainLogCollector:
         import time
 
         self.entries: list[BrainLogEntry] = []
-        self._pending: list[BrainLogEntry] = []
         self._start_time: float = time.time()
         self.first_token_time: float | None = None
         self._entry_id_map: dict[str, BrainLogEntry] = {}
@@ -311,7 +310,6 @@ class BrainLogCollector:
     def add(self, entry: BrainLogEntry) -> None:
         """Add an entry to the collector."""
         self.entries.append(entry)
-        self._pending.append(entry)
         self._entry_id_map[entry.id] = entry
 
     def add_entry(self, entry: BrainLogEntry) -> None:
@@ -320,9 +318,9 @@ class BrainLogCollector:
 
     def get_pending_entries(self) -> list[BrainLogEntry]:
         """Get and clear pending entries."""
-        pending = self.entries.copy()
-        self.entries.clear()
-        self._pending.clear()
+        # Hand over the list itself and start a new one, rather than copying
+        pending = self.entries
+        self.entries = []
         return pending
 
     def get_all_entries(self) -> list[BrainLogEntry]:
@@ -414,7 +412,6 @@ class BrainLogCollector:
 
         # Add updated entry back to pending list for streaming
         self.entries.append(entry)
-        self._pending.append(entry)
 
     def add_tool_call_complete(
         self,
@@ -1,7 +1,18 @@
 """Tools for the Glass Box Portfolio agent."""
 
-from .experience import get_professional_experience, get_skills, get_projects
-from .codebase import find_symbol, get_file_content, find_references
+from importlib import import_module
+from typing import Any
+
+# Exported names mapped to their submodules. They are imported on first
+# access, so importing one tool module doesn't load all of the others.
+_EXPORTS = {
+    "get_professional_experience": "experience",
+    "get_skills": "experience",
+    "get_projects": "experience",
+    "find_symbol": "codebase",
+    "get_file_content": "codebase",
+    "find_references": "codebase",
+}
 
 __all__ = [
     "get_professional_experience",
@@ -11,3 +22,10 @@ __all__ = [
     "get_file_content",
     "find_references",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
@@ -6,18 +6,54 @@ API contracts.
 """
 
 import ast
+import functools
 import json
+import os
 import re
+import stat
+import threading
+import time
 from collections import defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, TypeVar
 
 from pydantic import BaseModel, Field
 
 from ..config import get_settings
 from ..logging_config import get_logger
+from .codebase import _looks_binary
 
 logger = get_logger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Directories that are never analyzed
+_SKIP_DIRS = frozenset(
+    {
+        ".git",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".next",
+        "dist",
+        "build",
+        ".uv",
+        ".pytest_cache",
+        ".mypy_cache",
+        "coverage",
+    }
+)
+
+# Seconds a codebase fingerprint is reused before the tree is walked again
+_FINGERPRINT_TTL = 2.0
+
+# Results kept per cached tool (one per distinct set of arguments)
+_MAX_CACHED_RESULTS = 16
+
 
 def _check_codebase_exists() -> str | None:
     """Check if codebase exists, return error message if not."""
@@ -155,70 +191,241 @@ PURPOSE_PATTERNS = {
 }
 
 
+# Purpose inference from file extensions, in order of precedence
+_EXTENSION_PURPOSES = {
+    ".css": "Stylesheets",
+    ".scss": "Stylesheets",
+    ".json": "Configuration or data files",
+}
+
+
 def _should_skip_path(path: Path) -> bool:
     """Check if a path should be skipped during analysis."""
-    skip_dirs = {
-        ".git",
-        ".venv",
-        "venv",
-        "node_modules",
-        "__pycache__",
-        ".next",
-        "dist",
-        "build",
-        ".uv",
-        ".pytest_cache",
-        "coverage",
-    }
-    parts = path.parts
-    return any(skip_dir in parts for skip_dir in skip_dirs)
+    return not _SKIP_DIRS.isdisjoint(path.parts)
 
 
-def _infer_purpose(dir_name: str, files: list[str]) -> str:
-    """Infer the purpose of a directory from its name and contents."""
-    name_lower = dir_name.lower()
+def _iter_source_files(root: Path, include_dirs: bool = False) -> Iterator[Path]:
+    """Walk the tree under root, yielding every file outside skipped directories.
 
+    Files come out in the same order as ``Path.rglob("*")``. Skipped
+    directories are pruned by name as soon as they are listed, so none of
+    their descendants are ever visited. With include_dirs, each directory
+    is yielded too, just before its contents.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs: list[Path] = []
+        for entry in entries:
+            if entry.name in _SKIP_DIRS:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(Path(entry.path))
+                if include_dirs:
+                    yield subdirs[-1]
+            elif entry.is_file():
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+_fingerprints: dict[str, tuple[float, int]] = {}
+
+
+def _codebase_fingerprint(root: Path) -> int:
+    """Hash the path, mtime and size of every file the tools would read.
+
+    Directories are hashed by path alone, so adding or removing one (even
+    an empty one) changes the fingerprint. A fingerprint is reused for _FINGERPRINT_TTL seconds, so back-to-back
+    tool calls in one agent turn share a single walk.
+    """
+    key = str(root)
+    now = time.monotonic()
+    cached = _fingerprints.get(key)
+    if cached is not None and now - cached[0] < _FINGERPRINT_TTL:
+        return cached[1]
+
+    stamps = []
+    for path in _iter_source_files(root, include_dirs=True):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            # A directory's mtime also moves when skipped entries such as
+            # __pycache__ are written, so only its presence counts
+            stamps.append((str(path), 0, 0))
+        else:
+            stamps.append((str(path), st.st_mtime_ns, st.st_size))
+    fingerprint = hash(tuple(stamps))
+    _fingerprints[key] = (now, fingerprint)
+    return fingerprint
+
+
+def _codebase_cached(func: Callable[..., ModelT]) -> Callable[..., ModelT]:
+    """Decorator to reuse a tool's result until the codebase changes.
+
+    Results are keyed by the codebase root and the call's arguments, and are
+    only returned while the codebase fingerprint still matches. Callers get
+    a deep copy, so changing a result never alters the cached one.
+    """
+    cache: dict[tuple, tuple[int, ModelT]] = {}
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> ModelT:
+        root = Path(get_settings().codebase_root)
+        if not root.is_dir():
+            return func(*args, **kwargs)
+
+        key = (str(root), args, tuple(sorted(kwargs.items())))
+        fingerprint = _codebase_fingerprint(root)
+        with lock:
+            hit = cache.get(key)
+        if hit is not None and hit[0] == fingerprint:
+            return hit[1].model_copy(deep=True)
+
+        result = func(*args, **kwargs)
+        with lock:
+            cache.pop(key, None)
+            if len(cache) >= _MAX_CACHED_RESULTS:
+                del cache[next(iter(cache))]
+            cache[key] = (fingerprint, result)
+        return result.model_copy(deep=True)
+
+    return wrapper
+
+
+@lru_cache(maxsize=256)
+def _purpose_from_name(name_lower: str) -> str | None:
+    """Look up a purpose from a lowercased directory name, or None."""
     # Check direct matches
-    if name_lower in PURPOSE_PATTERNS:
-        return PURPOSE_PATTERNS[name_lower]
+    purpose = PURPOSE_PATTERNS.get(name_lower)
+    if purpose is not None:
+        return purpose
 
     # Check partial matches
     for pattern, purpose in PURPOSE_PATTERNS.items():
         if pattern in name_lower:
             return purpose
+    return None
 
-    # Infer from file contents
-    if any("test" in f.lower() for f in files):
-        return "Test files"
-    if any(f.endswith(".css") or f.endswith(".scss") for f in files):
-        return "Stylesheets"
-    if any(f.endswith(".json") for f in files):
-        return "Configuration or data files"
+
+def _infer_purpose(dir_name: str, files: list[str]) -> str:
+    """Infer the purpose of a directory from its name and contents."""
+    purpose = _purpose_from_name(dir_name.lower())
+    if purpose is not None:
+        return purpose
+
+    # Infer from file contents in one pass; test files take precedence
+    extensions = set()
+    for f in files:
+        if "test" in f.lower():
+            return "Test files"
+        dot = f.rfind(".")
+        if dot != -1:
+            extensions.add(f[dot:])
+
+    for extension, purpose in _EXTENSION_PURPOSES.items():
+        if extension in extensions:
+            return purpose
 
     return "Application module"
 
 
-def _get_main_exports_python(file_path: Path) -> list[str]:
-    """Extract main exports from a Python file."""
-    exports = []
+@dataclass(slots=True)
+class _PythonSummary:
+    """What the architecture tools extract from one Python file."""
+
+    exports: list[str] = field(default_factory=list)
+    # (target_module, import_type)
+    imports: list[tuple[str, str]] = field(default_factory=list)
+    # (name, line, fields, base_classes) for each Pydantic model
+    schemas: list[tuple[str, int, list[SchemaField], list[str]]] = field(
+        default_factory=list
+    )
+
+
+@lru_cache(maxsize=512)
+def _summarize_python(path: str, stamp: tuple[int, int]) -> _PythonSummary:
+    """Extract a Python file's exports, imports and schemas in one tree walk.
+
+    Cached until the file's (mtime_ns, size) stamp changes. Nodes are visited
+    in ``ast.walk`` order, so each list comes out in the same order as a
+    separate walk would produce.
+    """
+    tree = ast.parse(Path(path).read_text())
+    summary = _PythonSummary()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            if not node.name.startswith("_"):
+                summary.exports.append(f"def {node.name}")
+        elif isinstance(node, ast.AsyncFunctionDef):
+            if not node.name.startswith("_"):
+                summary.exports.append(f"async def {node.name}")
+        elif isinstance(node, ast.ClassDef):
+            if not node.name.startswith("_"):
+                summary.exports.append(f"class {node.name}")
+
+            # Check if it inherits from BaseModel or similar
+            base_names = []
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    base_names.append(base.id)
+                elif isinstance(base, ast.Attribute):
+                    base_names.append(base.attr)
+
+            if any(b in ["BaseModel", "BaseSettings"] for b in base_names):
+                fields = []
+                for item in node.body:
+                    if isinstance(item, ast.AnnAssign) and isinstance(
+                        item.target, ast.Name
+                    ):
+                        field_name = item.target.id
+                        type_str = (
+                            ast.unparse(item.annotation) if item.annotation else "Any"
+                        )
+                        fields.append(
+                            SchemaField(
+                                name=field_name,
+                                type_annotation=type_str,
+                                required=item.value is None,
+                            )
+                        )
+                summary.schemas.append((node.name, node.lineno, fields, base_names))
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                summary.imports.append((alias.name, "namespace"))
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                import_type = "named" if node.names else "namespace"
+                summary.imports.append((node.module, import_type))
+
+    return summary
+
+
+def _python_summary(file_path: Path) -> _PythonSummary:
+    """Get the summary of a Python file, empty if it can't be read or parsed.
+
+    The exports, imports and schema extractors all read the same files, often
+    across several tool calls, so each unchanged file is parsed once.
+    """
     try:
-        content = file_path.read_text()
-        tree = ast.parse(content)
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                if not node.name.startswith("_"):
-                    exports.append(f"def {node.name}")
-            elif isinstance(node, ast.AsyncFunctionDef):
-                if not node.name.startswith("_"):
-                    exports.append(f"async def {node.name}")
-            elif isinstance(node, ast.ClassDef):
-                if not node.name.startswith("_"):
-                    exports.append(f"class {node.name}")
+        st = file_path.stat()
+        return _summarize_python(str(file_path), (st.st_mtime_ns, st.st_size))
     except Exception:
-        pass
+        return _PythonSummary()
 
-    return exports[:10]  # Limit to 10
+
+def _get_main_exports_python(file_path: Path) -> list[str]:
+    """Extract main exports from a Python file."""
+    return _python_summary(file_path).exports[:10]  # Limit to 10
 
 
 def _get_main_exports_typescript(file_path: Path) -> list[str]:
@@ -251,24 +458,14 @@ def _extract_python_imports(file_path: Path, root: Path) -> list[tuple[str, str,
 
     Returns list of (source_file, target_module, import_type)
     """
-    imports = []
     try:
-        content = file_path.read_text()
-        tree = ast.parse(content)
         relative_path = str(file_path.relative_to(root))
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append((relative_path, alias.name, "namespace"))
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    import_type = "named" if node.names else "namespace"
-                    imports.append((relative_path, node.module, import_type))
-    except Exception:
-        pass
-
-    return imports
+    except ValueError:
+        return []
+    return [
+        (relative_path, target, import_type)
+        for target, import_type in _python_summary(file_path).imports
+    ]
 
 
 def _extract_typescript_imports(
@@ -309,55 +506,20 @@ def _extract_typescript_imports(
 
 def _extract_pydantic_schemas(file_path: Path, root: Path) -> list[SchemaInfo]:
     """Extract Pydantic model schemas from a Python file."""
-    schemas = []
     try:
-        content = file_path.read_text()
-        tree = ast.parse(content)
         relative_path = str(file_path.relative_to(root))
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                # Check if it inherits from BaseModel or similar
-                base_names = []
-                for base in node.bases:
-                    if isinstance(base, ast.Name):
-                        base_names.append(base.id)
-                    elif isinstance(base, ast.Attribute):
-                        base_names.append(base.attr)
-
-                if any(b in ["BaseModel", "BaseSettings"] for b in base_names):
-                    fields = []
-                    for item in node.body:
-                        if isinstance(item, ast.AnnAssign) and isinstance(
-                            item.target, ast.Name
-                        ):
-                            field_name = item.target.id
-                            type_str = (
-                                ast.unparse(item.annotation)
-                                if item.annotation
-                                else "Any"
-                            )
-                            fields.append(
-                                SchemaField(
-                                    name=field_name,
-                                    type_annotation=type_str,
-                                    required=item.value is None,
-                                )
-                            )
-
-                    schemas.append(
-                        SchemaInfo(
-                            name=node.name,
-                            file=relative_path,
-                            line=node.lineno,
-                            fields=fields,
-                            base_classes=base_names,
-                        )
-                    )
-    except Exception:
-        pass
-
-    return schemas
+    except ValueError:
+        return []
+    return [
+        SchemaInfo(
+            name=name,
+            file=relative_path,
+            line=line,
+            fields=fields,
+            base_classes=base_classes,
+        )
+        for name, line, fields, base_classes in _python_summary(file_path).schemas
+    ]
 
 
 def _extract_typescript_interfaces(file_path: Path, root: Path) -> list[SchemaInfo]:
@@ -413,6 +575,7 @@ def _extract_typescript_interfaces(file_path: Path, root: Path) -> list[SchemaIn
     return schemas
 
 
+@_codebase_cached
 def get_module_structure() -> ModuleStructureResult:
     """Analyze the high-level module structure of the codebase.
 
@@ -458,12 +621,7 @@ def get_module_structure() -> ModuleStructureResult:
         exports = []
 
         # Scan files in this directory
-        for file_path in item.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if _should_skip_path(file_path):
-                continue
-
+        for file_path in _iter_source_files(item):
             rel_path = str(file_path.relative_to(item))
             files.append(rel_path)
 
@@ -533,6 +691,7 @@ def get_module_structure() -> ModuleStructureResult:
     )
 
 
+@_codebase_cached
 def get_dependency_graph(scope: str = "all") -> DependencyGraphResult:
     """Build a dependency graph showing import relationships.
 
@@ -584,12 +743,7 @@ def get_dependency_graph(scope: str = "all") -> DependencyGraphResult:
     imports_map: dict[str, list[str]] = defaultdict(list)
 
     # Collect all imports
-    for file_path in search_root.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if _should_skip_path(file_path):
-            continue
-
+    for file_path in _iter_source_files(search_root):
         if file_path.suffix == ".py":
             imports = _extract_python_imports(file_path, root)
         elif file_path.suffix in [".ts", ".tsx", ".js", ".jsx"]:
@@ -649,6 +803,7 @@ def get_dependency_graph(scope: str = "all") -> DependencyGraphResult:
     )
 
 
+@_codebase_cached
 def get_api_contracts() -> APIContractsResult:
     """Extract all data schemas, interfaces, and API contracts.
 
@@ -679,12 +834,7 @@ def get_api_contracts() -> APIContractsResult:
     schemas: list[SchemaInfo] = []
     endpoints: list[dict] = []
 
-    for file_path in root.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if _should_skip_path(file_path):
-            continue
-
+    for file_path in _iter_source_files(root):
         if file_path.suffix == ".py":
             schemas.extend(_extract_pydantic_schemas(file_path, root))
 
@@ -716,6 +866,7 @@ def get_api_contracts() -> APIContractsResult:
     )
 
 
+@_codebase_cached
 def explain_architecture() -> ArchitectureOverview:
     """Generate a high-level architecture overview of the entire codebase.
 
@@ -900,6 +1051,132 @@ def explain_architecture() -> ArchitectureOverview:
     )
 
 
+# Known data flows, traced without searching the codebase
+_CHAT_FLOW_STEPS = (
+    DataFlowStep(
+        file="web/components/chat/ChatInterface.tsx",
+        function="handleSubmit",
+        line=0,
+        description="User submits message through chat input",
+    ),
+    DataFlowStep(
+        file="web/components/chat/ChatInterface.tsx",
+        function="useChat",
+        line=0,
+        description="Vercel AI SDK sends message to backend API",
+    ),
+    DataFlowStep(
+        file="backend/app/main.py",
+        function="chat_endpoint",
+        line=0,
+        description="FastAPI receives POST /chat request",
+    ),
+    DataFlowStep(
+        file="backend/app/brain_log_stream.py",
+        function="BrainLogAdapter",
+        line=0,
+        description="Adapter wraps agent for streaming with brain logs",
+    ),
+    DataFlowStep(
+        file="backend/app/agent.py",
+        function="portfolio_agent.run",
+        line=0,
+        description="pydantic-ai agent processes message and selects tools",
+    ),
+    DataFlowStep(
+        file="backend/app/tools/",
+        function="tool functions",
+        line=0,
+        description="Agent executes selected tools to gather information",
+    ),
+    DataFlowStep(
+        file="backend/app/brain_log_stream.py",
+        function="BrainLogEventStream",
+        line=0,
+        description="Stream events including brain logs back to client",
+    ),
+    DataFlowStep(
+        file="web/components/chat/ChatInterface.tsx",
+        function="useChat.onDataChunk",
+        line=0,
+        description="Frontend receives and displays streaming response",
+    ),
+)
+
+_BRAIN_LOG_FLOW_STEPS = (
+    DataFlowStep(
+        file="backend/app/schemas/brain_log.py",
+        function="BrainLogCollector",
+        line=0,
+        description="Collector initialized at request start",
+    ),
+    DataFlowStep(
+        file="backend/app/brain_log_stream.py",
+        function="before_stream",
+        line=0,
+        description="Input log entry emitted",
+    ),
+    DataFlowStep(
+        file="backend/app/brain_log_stream.py",
+        function="handle_tool_call_start",
+        line=0,
+        description="Tool selection logged",
+    ),
+    DataFlowStep(
+        file="backend/app/brain_log_stream.py",
+        function="handle_tool_call_end",
+        line=0,
+        description="Tool result logged",
+    ),
+    DataFlowStep(
+        file="backend/app/brain_log_stream.py",
+        function="after_stream",
+        line=0,
+        description="Performance metrics logged",
+    ),
+    DataFlowStep(
+        file="web/lib/api.ts",
+        function="parseBrainLogChunk",
+        line=0,
+        description="Frontend parses brain log from stream",
+    ),
+    DataFlowStep(
+        file="web/components/glass-box/BrainLog.tsx",
+        function="BrainLog",
+        line=0,
+        description="Brain log entries rendered in Glass Box panel",
+    ),
+)
+
+# Entity keyword -> (flow_type, entry_point, exit_point, steps), checked in order
+_KNOWN_FLOWS: dict[str, tuple[str, str, str, tuple[DataFlowStep, ...]]] = {
+    "message": (
+        "request",
+        "User chat input",
+        "Rendered response in chat",
+        _CHAT_FLOW_STEPS,
+    ),
+    "chat": (
+        "request",
+        "User chat input",
+        "Rendered response in chat",
+        _CHAT_FLOW_STEPS,
+    ),
+    "brainlog": (
+        "event",
+        "Agent processing start",
+        "Brain Log panel display",
+        _BRAIN_LOG_FLOW_STEPS,
+    ),
+    "log": (
+        "event",
+        "Agent processing start",
+        "Brain Log panel display",
+        _BRAIN_LOG_FLOW_STEPS,
+    ),
+}
+
+
 def trace_data_flow(entity_name: str) -> DataFlowResult:
     """Trace how a piece of data flows through the system.
 
@@ -918,159 +1195,56 @@ def trace_data_flow(entity_name: str) -> DataFlowResult:
     settings = get_settings()
     root = Path(settings.codebase_root)
 
-    steps: list[DataFlowStep] = []
-
-    # Search for the entity across the codebase
     entity_lower = entity_name.lower()
 
     # Common flow patterns based on entity type
-    if "message" in entity_lower or "chat" in entity_lower:
-        # Chat message flow
-        steps = [
-            DataFlowStep(
-                file="web/components/chat/ChatInterface.tsx",
-                function="handleSubmit",
-                line=0,
-                description="User submits message through chat input",
-            ),
-            DataFlowStep(
-                file="web/components/chat/ChatInterface.tsx",
-                function="useChat",
-                line=0,
-                description="Vercel AI SDK sends message to backend API",
-            ),
-            DataFlowStep(
-                file="backend/app/main.py",
-                function="chat_endpoint",
-                line=0,
-                description="FastAPI receives POST /chat request",
-            ),
-            DataFlowStep(
-                file="backend/app/brain_log_stream.py",
-                function="BrainLogAdapter",
-                line=0,
-                description="Adapter wraps agent for streaming with brain logs",
-            ),
-            DataFlowStep(
-                file="backend/app/agent.py",
-                function="portfolio_agent.run",
-                line=0,
-                description="pydantic-ai agent processes message and selects tools",
-            ),
-            DataFlowStep(
-                file="backend/app/tools/",
-                function="tool functions",
-                line=0,
-                description="Agent executes selected tools to gather information",
-            ),
-            DataFlowStep(
-                file="backend/app/brain_log_stream.py",
-                function="BrainLogEventStream",
-                line=0,
-                description="Stream events including brain logs back to client",
-            ),
-            DataFlowStep(
-                file="web/components/chat/ChatInterface.tsx",
-                function="useChat.onDataChunk",
-                line=0,
-                description="Frontend receives and displays streaming response",
-            ),
-        ]
-        flow_type = "request"
-        entry_point = "User chat input"
-        exit_point = "Rendered response in chat"
-
-    elif "brainlog" in entity_lower or "log" in entity_lower:
-        # Brain log flow
-        steps = [
-            DataFlowStep(
-                file="backend/app/schemas/brain_log.py",
-                function="BrainLogCollector",
-                line=0,
-                description="Collector initialized at request start",
-            ),
-            DataFlowStep(
-                file="backend/app/brain_log_stream.py",
-                function="before_stream",
-                line=0,
-                description="Input log entry emitted",
-            ),
-            DataFlowStep(
-                file="backend/app/brain_log_stream.py",
-                function="handle_tool_call_start",
-                line=0,
-                description="Tool selection logged",
-            ),
-            DataFlowStep(
-                file="backend/app/brain_log_stream.py",
-                function="handle_tool_call_end",
-                line=0,
-                description="Tool result logged",
-            ),
-            DataFlowStep(
-                file="backend/app/brain_log_stream.py",
-                function="after_stream",
-                line=0,
-                description="Performance metrics logged",
-            ),
-            DataFlowStep(
-                file="web/lib/api.ts",
-                function="parseBrainLogChunk",
-                line=0,
-                description="Frontend parses brain log from stream",
-            ),
-            DataFlowStep(
-                file="web/components/glass-box/BrainLog.tsx",
-                function="BrainLog",
-                line=0,
-                description="Brain log entries rendered in Glass Box panel",
-            ),
-        ]
-        flow_type = "event"
-        entry_point = "Agent processing start"
-        exit_point = "Brain Log panel display"
+    for keyword, known_flow in _KNOWN_FLOWS.items():
+        if keyword in entity_lower:
+            flow_type, entry_point, exit_point, flow_steps = known_flow
+            return DataFlowResult(
+                entity=entity_name,
+                flow_type=flow_type,
+                # Copies, so callers can't alter the shared module-level steps
+                steps=[step.model_copy() for step in flow_steps],
+                entry_point=entry_point,
+                exit_point=exit_point,
+            )
 
-    else:
-        # Generic search for the entity
-        for file_path in root.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if _should_skip_path(file_path):
-                continue
-            if file_path.suffix not in [".py", ".ts", ".tsx", ".js", ".jsx"]:
-                continue
+    # Generic search for the entity across the codebase
+    steps: list[DataFlowStep] = []
+    for file_path in _iter_source_files(root):
+        if file_path.suffix not in [".py", ".ts", ".tsx", ".js", ".jsx"]:
+            continue
+        if _looks_binary(file_path):
+            continue
 
-            try:
-                content = file_path.read_text()
-                if entity_name in content:
-                    rel_path = str(file_path.relative_to(root))
-                    lines = content.splitlines()
-                    for i, line in enumerate(lines):
-                        if entity_name in line:
-                            steps.append(
-                                DataFlowStep(
-                                    file=rel_path,
-                                    function="(see context)",
-                                    line=i + 1,
-                                    description=line.strip()[:100],
-                                )
+        try:
+            content = file_path.read_text()
+            if entity_name in content:
+                rel_path = str(file_path.relative_to(root))
+                lines = content.splitlines()
+                for i, line in enumerate(lines):
+                    if entity_name in line:
+                        steps.append(
+                            DataFlowStep.model_construct(
+                                file=rel_path,
+                                function="(see context)",
+                                line=i + 1,
+                                description=line.strip()[:100],
                             )
-                            if len(steps) >= 10:
-                                break
-            except Exception:
-                continue
-
-            if len(steps) >= 10:
-                break
+                        )
+                        if len(steps) >= 10:
+                            break
+        except Exception:
+            continue
 
-        flow_type = "data"
-        entry_point = "Unknown"
-        exit_point = "Unknown"
+        if len(steps) >= 10:
+            break
 
     return DataFlowResult(
         entity=entity_name,
-        flow_type=flow_type,
+        flow_type="data",
         steps=steps,
-        entry_point=entry_point,
-        exit_point=exit_point,
+        entry_point="Unknown",
+        exit_point="Unknown",
     )
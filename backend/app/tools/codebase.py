@@ -4,15 +4,123 @@ These tools enable the agent to answer technical questions about the codebase
 by structurally understanding the code through file analysis and symbol search.
 """
 
+import json
+import mmap
 import os
+import pickle
 import re
+import shutil
 import subprocess
+import threading
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Callable, Container, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property, lru_cache, partial
+from itertools import groupby, islice
+from operator import itemgetter
 from pathlib import Path
+from typing import TypeVar
 
 from pydantic import BaseModel, Field
 
 from ..config import get_settings
 
+T = TypeVar("T")
+
+# Number of leading bytes inspected when sniffing for binary content
+_BINARY_SNIFF_BYTES = 4096
+
+# Any byte outside ASCII; files without one are valid UTF-8 as they stand
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+# Maximum number of file reads kept in flight while scanning the codebase,
+# which also bounds the file descriptors a scan holds open
+_READ_AHEAD = 64
+
+# Thread pool shared by all scans, so searches don't start threads per call.
+# The tools themselves stay synchronous: the agent already runs sync tools
+# off the event loop, and concurrent scans overlap their reads on this pool.
+_READ_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="codebase-read"
+)
+
+# Maximum locations returned by find_symbol
+_MAX_SYMBOLS = 20
+
+# find_symbol stops scanning once this many definitions have been found
+_MAX_SYMBOL_SCAN = 200
+
+# Maximum references returned by find_references
+_MAX_REFERENCES = 50
+
+# find_references stops scanning once this many references have been found
+_MAX_REFERENCE_SCAN = 500
+
+# Bumped whenever the pickled _CodebaseIndex layout changes
+_INDEX_CACHE_VERSION = 1
+
+# ripgrep binary used for searches when installed; None falls back to Python
+_RG_PATH = shutil.which("rg")
+
+# Maximum number of git cat-file processes kept running, one per checkout
+_MAX_CAT_FILES = 4
+
+# Maximum number of rendered folder trees kept by get_folder_tree
+_MAX_CACHED_TREES = 32
+
+# Directories that are never searched
+_SKIP_DIRS = frozenset(
+    {
+        ".git",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".next",
+        "dist",
+        "build",
+        ".uv",
+    }
+)
+
+# "/<dir>/" substrings marking a skipped directory in a "/"-separated path
+_SKIP_TOKENS = tuple(f"/{skip_dir}/" for skip_dir in sorted(_SKIP_DIRS))
+
+# Files searched by find_symbol
+_SYMBOL_EXTENSIONS = frozenset({".py", ".ts", ".tsx", ".js", ".jsx"})
+
+# Files searched by find_references (a superset of _SYMBOL_EXTENSIONS)
+_REFERENCE_EXTENSIONS = frozenset(
+    {
+        ".py",
+        ".ts",
+        ".tsx",
+        ".js",
+        ".jsx",
+        ".json",
+        ".md",
+        ".yaml",
+        ".yml",
+        ".toml",
+    }
+)
+
+# File extension -> language name reported by get_file_content
+_EXT_MAP = {
+    ".py": "python",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".json": "json",
+    ".md": "markdown",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".css": "css",
+    ".html": "html",
+}
+
 
 class CloneCodebaseResult(BaseModel):
     """Result of cloning or checking the codebase."""
@@ -25,6 +133,28 @@ class CloneCodebaseResult(BaseModel):
     )
 
 
+def _short_commit_hash(codebase_path: Path) -> str | None:
+    """Get the abbreviated commit checked out at codebase_path.
+
+    The commit is read from .git directly, and git is only run when that
+    fails (e.g. a worktree whose .git is a file).
+    """
+    commit = _head_commit(codebase_path)
+    if commit is not None:
+        return commit[:8]
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=codebase_path,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        return result.stdout.strip()[:8] if result.returncode == 0 else None
+    except Exception:
+        return None
+
+
 def clone_codebase() -> CloneCodebaseResult:
     """Clone the portfolio codebase for exploration if not already present.
 
@@ -35,8 +165,7 @@ def clone_codebase() -> CloneCodebaseResult:
     Returns:
         CloneCodebaseResult with status and path information.
     """
-    settings = get_settings()
-    codebase_path = Path(settings.codebase_root)
+    codebase_path = _root_path(get_settings().codebase_root)
     repo_url = os.environ.get(
         "CODEBASE_REPO_URL", "https://github.com/ged1182/george-dekermenjian.git"
     )
@@ -44,24 +173,11 @@ def clone_codebase() -> CloneCodebaseResult:
 
     # Check if already cloned
     if codebase_path.exists() and (codebase_path / ".git").exists():
-        # Get current commit hash
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                cwd=codebase_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            current_hash = result.stdout.strip()[:8] if result.returncode == 0 else None
-        except Exception:
-            current_hash = None
-
         return CloneCodebaseResult(
             status="already_exists",
             path=str(codebase_path),
             message=f"Codebase already available at {codebase_path}",
-            commit_hash=current_hash,
+            commit_hash=_short_commit_hash(codebase_path),
         )
 
     # Clone the repository
@@ -69,9 +185,15 @@ def clone_codebase() -> CloneCodebaseResult:
         # Ensure parent directory exists
         codebase_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Clone
+        # Only the checked-out files are ever read, so skip the history: the
+        # default branch needs just its tip, and a pinned commit is checked
+        # out from a blobless clone that fetches only that commit's files
+        pinned = bool(commit_hash) and commit_hash != "main"
+        clone_args = (
+            ["--filter=blob:none", "--no-checkout"] if pinned else ["--depth=1"]
+        )
         result = subprocess.run(
-            ["git", "clone", repo_url, str(codebase_path)],
+            ["git", "clone", *clone_args, repo_url, str(codebase_path)],
             capture_output=True,
             text=True,
             timeout=120,
@@ -86,34 +208,32 @@ def clone_codebase() -> CloneCodebaseResult:
             )
 
         # Checkout specific commit if specified
-        if commit_hash and commit_hash != "main":
-            subprocess.run(
+        if pinned:
+            checkout = subprocess.run(
                 ["git", "checkout", commit_hash],
                 cwd=codebase_path,
                 capture_output=True,
                 timeout=30,
             )
-
-        # Get current commit hash
-        try:
-            hash_result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                cwd=codebase_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            current_hash = (
-                hash_result.stdout.strip()[:8] if hash_result.returncode == 0 else None
-            )
-        except Exception:
-            current_hash = None
+            if checkout.returncode != 0:
+                # Unknown commit: fall back to the default branch as before
+                subprocess.run(
+                    ["git", "checkout", "HEAD", "--", "."],
+                    cwd=codebase_path,
+                    capture_output=True,
+                    timeout=30,
+                )
+
+        # A fresh checkout invalidates any previously indexed contents, and
+        # cat-file processes still reading the replaced repository
+        _codebase_index.cache_clear()
+        _close_git_cat_files()
 
         return CloneCodebaseResult(
             status="cloned",
             path=str(codebase_path),
             message=f"Successfully cloned repository to {codebase_path}",
-            commit_hash=current_hash,
+            commit_hash=_short_commit_hash(codebase_path),
         )
 
     except subprocess.TimeoutExpired:
@@ -155,6 +275,10 @@ class FindSymbolResult(BaseModel):
     symbol: str
     locations: list[SymbolLocation]
     total_found: int
+    truncated: bool = Field(
+        default=False,
+        description="True if the search stopped early and total_found is a lower bound",
+    )
 
 
 class FileContent(BaseModel):
@@ -182,70 +306,636 @@ class FindReferencesResult(BaseModel):
     symbol: str
     references: list[Reference]
     total_found: int
+    truncated: bool = Field(
+        default=False,
+        description="True if the search stopped early and total_found is a lower bound",
+    )
 
 
 def _check_codebase_exists() -> str | None:
     """Check if codebase exists, return error message if not."""
-    settings = get_settings()
-    codebase_path = Path(settings.codebase_root)
+    codebase_path = _root_path(get_settings().codebase_root)
     if not codebase_path.exists():
         return f"Codebase not found at {codebase_path}. Call clone_codebase() first to clone the repository."
     return None
 
 
+@lru_cache(maxsize=8)
+def _root_path(codebase_root: str) -> Path:
+    """Build the configured codebase root once per setting value."""
+    return Path(codebase_root)
+
+
+@lru_cache(maxsize=8)
+def _resolved_root(codebase_root: str) -> Path:
+    """Resolve the configured codebase root once per setting value."""
+    return _root_path(codebase_root).resolve()
+
+
 def _get_language(file_path: str) -> str:
     """Determine the programming language from file extension."""
-    ext_map = {
-        ".py": "python",
-        ".ts": "typescript",
-        ".tsx": "typescript",
-        ".js": "javascript",
-        ".jsx": "javascript",
-        ".json": "json",
-        ".md": "markdown",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".toml": "toml",
-        ".css": "css",
-        ".html": "html",
-    }
-    ext = Path(file_path).suffix.lower()
-    return ext_map.get(ext, "text")
+    # Same suffix rules as Path.suffix, without building a Path
+    dot = file_path.rfind(".")
+    if dot <= file_path.rfind("/") + 1:
+        return "text"
+    return _EXT_MAP.get(file_path[dot:].lower(), "text")
 
 
 def _should_skip_path(path: Path) -> bool:
     """Check if a path should be skipped during search."""
-    skip_dirs = {
-        ".git",
-        ".venv",
-        "venv",
-        "node_modules",
-        "__pycache__",
-        ".next",
-        "dist",
-        "build",
-        ".uv",
-    }
-    parts = path.parts
-    return any(skip_dir in parts for skip_dir in skip_dirs)
+    return not _SKIP_DIRS.isdisjoint(path.parts)
+
+
+def _iter_files(root: Path, extensions: Container[str]) -> Iterator[Path]:
+    """Walk the tree under root, yielding files with one of the given extensions.
+
+    Directories are visited depth-first in the same order as ``Path.rglob``.
+    Skipped directories are pruned by name as soon as they are listed, so
+    none of their descendants are ever visited.
+    """
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs: list[Path] = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    subdirs.append(Path(entry.path))
+            elif entry.is_file() and os.path.splitext(entry.name)[1] in extensions:
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+def _looks_binary(path: Path) -> bool:
+    """Check if a file looks binary by sniffing its first bytes for a null byte.
+
+    This lets searches skip images, archives and other binary files without
+    paying for a failed UTF-8 decode of the whole file.
+    """
+    try:
+        with path.open("rb") as f:
+            return b"\x00" in f.read(_BINARY_SNIFF_BYTES)
+    except OSError:
+        return True
+
+
+def _read_text(path: Path) -> str | None:
+    """Read a file as UTF-8 text, returning None if it is binary or unreadable."""
+    if _looks_binary(path):
+        return None
+    try:
+        return path.read_text(encoding="utf-8")
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+def _iter_pooled(
+    paths: Iterable[Path], read: Callable[[Path], T | None]
+) -> Iterator[tuple[Path, T]]:
+    """Run read over paths on the shared pool, yielding (path, result) in order.
+
+    Up to ``_READ_AHEAD`` reads are kept in flight so disk latency overlaps
+    with the caller's processing. Paths whose result is None are skipped.
+    Reads that have not started yet are cancelled if the caller stops
+    iterating early.
+    """
+    window: deque[tuple[Path, Future[T | None]]] = deque()
+    try:
+        for path in paths:
+            window.append((path, _READ_POOL.submit(read, path)))
+            if len(window) < _READ_AHEAD:
+                continue
+            done_path, future = window.popleft()
+            result = future.result()
+            if result is not None:
+                yield done_path, result
+
+        while window:
+            done_path, future = window.popleft()
+            result = future.result()
+            if result is not None:
+                yield done_path, result
+    finally:
+        for _, future in window:
+            future.cancel()
+
+
+def _iter_file_texts(paths: Iterable[Path]) -> Iterator[tuple[Path, str]]:
+    """Read files on the shared pool, yielding (path, content) in input order.
+
+    Files that cannot be read as text are skipped.
+    """
+    return _iter_pooled(paths, _read_text)
+
+
+def _line_starts(content: str) -> list[int]:
+    """Get the character offset at which each line of content starts."""
+    return [0, *(m.end() for m in re.finditer("\n", content))]
+
+
+def _ripgrep_search(
+    pattern: re.Pattern[str], root: Path, extensions: Iterable[str]
+) -> Iterator[tuple[Path, int, str]]:
+    """Search files under root with ripgrep, yielding (path, line number, line).
+
+    Applies the same extension and skip-directory filters as ``_iter_files``
+    and reports one record per matching line, in path order. Raises OSError
+    if ripgrep fails without reporting a match, so callers can fall back to
+    the Python search.
+    """
+    args = [
+        _RG_PATH,
+        "--json",
+        "--no-config",
+        "--hidden",
+        "--no-ignore",
+        "--sort",
+        "path",
+    ]
+    if pattern.flags & re.IGNORECASE:
+        args.append("--ignore-case")
+    for ext in sorted(extensions):
+        args += ["--glob", f"*{ext}"]
+    for skip_dir in sorted(_SKIP_DIRS):
+        args += ["--glob", f"!{skip_dir}/"]
+    args += ["--regexp", pattern.pattern, "--", str(root)]
+
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    matched = False
+    try:
+        for raw in proc.stdout:
+            record = json.loads(raw)
+            if record.get("type") != "match":
+                continue
+            data = record["data"]
+            path_text = data["path"].get("text")
+            line_text = data["lines"].get("text")
+            if path_text is None or line_text is None:
+                continue  # Not valid UTF-8
+            matched = True
+            yield Path(path_text), data["line_number"], line_text.rstrip("\r\n")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+    # Exit status 1 only means nothing matched
+    if proc.returncode not in (0, 1) and not matched:
+        raise OSError(f"ripgrep exited with status {proc.returncode}")
+
+
+def _head_commit(root: Path) -> str | None:
+    """Read the commit checked out at root from its .git directory.
+
+    Returns None if root is not the top of a git checkout or the commit
+    cannot be resolved without running git.
+    """
+    git_dir = root / ".git"
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head or None  # Detached HEAD
+        ref = head.removeprefix("ref: ")
+        ref_path = git_dir / ref
+        if ref_path.is_file():
+            return ref_path.read_text().strip() or None
+        for line in (git_dir / "packed-refs").read_text().splitlines():
+            commit, _, name = line.partition(" ")
+            if name == ref:
+                return commit
+    except OSError:
+        return None
+    return None
+
+
+def _git_tracked_files(root: Path, extensions: Container[str]) -> list[Path] | None:
+    """List tracked files under root with one of the given extensions.
+
+    Uses a single ``git ls-files`` call instead of walking the tree, so
+    ignored directories are never visited. Returns None if git fails.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(root), "ls-files", "-z"],
+            capture_output=True,
+            timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+
+    paths: list[Path] = []
+    for raw in result.stdout.split(b"\0"):
+        name = os.fsdecode(raw)
+        if os.path.splitext(name)[1] not in extensions:
+            continue
+        # git always separates with "/", so skipped directories are substrings
+        wrapped = f"/{name}"
+        if any(token in wrapped for token in _SKIP_TOKENS):
+            continue
+        paths.append(root / name)
+    return paths
+
+
+class _GitCatFile:
+    """A long-running ``git cat-file --batch`` process serving file blobs.
 
+    Reads are serialized with a lock, so one process can be shared by every
+    tool call for a checkout instead of starting git per read.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(root), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._lock = threading.Lock()
+
+    def read(self, commit: str, path: str) -> bytes | None:
+        """Return the blob at commit:path, or None if there is no such blob.
+
+        Raises OSError if the git process has exited.
+        """
+        if "\n" in path:
+            return None  # Cannot be expressed in the batch protocol
+        with self._lock:
+            self._proc.stdin.write(f"{commit}:{path}\n".encode())
+            self._proc.stdin.flush()
+            header = self._proc.stdout.readline()
+            if not header:
+                raise OSError("git cat-file exited")
+            # "<oid> <type> <size>", or "<name> missing" for unknown objects
+            fields = header.split()
+            if len(fields) != 3 or not fields[2].isdigit():
+                return None
+            data = self._proc.stdout.read(int(fields[2]) + 1)[:-1]
+        return data if fields[1] == b"blob" else None
+
+    def close(self) -> None:
+        """Stop the git process and close its pipes."""
+        self._proc.kill()
+        self._proc.wait()
+        self._proc.stdin.close()
+        self._proc.stdout.close()
+
+
+# Running cat-file processes by checkout root, least recently used first
+_cat_files: OrderedDict[Path, _GitCatFile] = OrderedDict()
+_cat_files_lock = threading.Lock()
+
+
+def _git_cat_file(root: Path) -> _GitCatFile:
+    """Return the shared cat-file process for a checkout.
+
+    At most _MAX_CAT_FILES processes are kept; starting another stops the
+    least recently used one.
+    """
+    with _cat_files_lock:
+        cat_file = _cat_files.get(root)
+        if cat_file is not None:
+            _cat_files.move_to_end(root)
+            return cat_file
+        cat_file = _cat_files[root] = _GitCatFile(root)
+        if len(_cat_files) > _MAX_CAT_FILES:
+            _, evicted = _cat_files.popitem(last=False)
+            evicted.close()
+        return cat_file
+
+
+def _discard_git_cat_file(root: Path, cat_file: _GitCatFile) -> None:
+    """Stop a cat-file process and forget it, if it is still the one for root."""
+    with _cat_files_lock:
+        if _cat_files.get(root) is cat_file:
+            del _cat_files[root]
+    cat_file.close()
+
+
+def _close_git_cat_files() -> None:
+    """Stop every cat-file process."""
+    with _cat_files_lock:
+        cat_files = list(_cat_files.values())
+        _cat_files.clear()
+    for cat_file in cat_files:
+        cat_file.close()
+
+
+def _read_checkout_file(root: Path, relative_path: Path) -> str:
+    """Read a file under root as UTF-8 text.
+
+    When root is a git checkout, tracked files are served from the checked
+    out commit by a shared ``git cat-file`` process; anything else is read
+    from disk.
+    """
+    commit = _head_commit(root)
+    if commit is not None:
+        cat_file: _GitCatFile | None = None
+        try:
+            cat_file = _git_cat_file(root)
+            data = cat_file.read(commit, relative_path.as_posix())
+        except OSError:
+            # git is missing or the process died; start afresh next time
+            if cat_file is not None:
+                _discard_git_cat_file(root, cat_file)
+            data = None
+        if data is not None:
+            return data.decode("utf-8")
+    return (root / relative_path).read_text(encoding="utf-8")
+
+
+def _trigrams(text: str) -> set[str]:
+    """Return the set of 3-character substrings of text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class _CodebaseIndex:
+    """Searchable file contents for one checkout.
+
+    A cloned checkout does not change until the next clone, so its files
+    are read once here and shared by every later search. A lowercase
+    trigram index over the contents narrows searches for names of three or
+    more characters to the files that can contain them.
+    """
+
+    def __init__(self, root: Path) -> None:
+        paths = _git_tracked_files(root, _REFERENCE_EXTENSIONS)
+        if paths is None:
+            paths = list(_iter_files(root, _REFERENCE_EXTENSIONS))
+        self.files: list[tuple[Path, str, str]] = [
+            (path, os.path.splitext(path.name)[1], content)
+            for path, content in _iter_file_texts(paths)
+        ]
+
+    def __getstate__(self) -> dict:
+        # Persist the trigram postings too, building them first if needed
+        return {"files": self.files, "postings": self.postings}
+
+    @cached_property
+    def postings(self) -> dict[str, list[int]]:
+        """Map each lowercase trigram to the indices of files containing it."""
+        postings: dict[str, list[int]] = defaultdict(list)
+        for file_idx, (_, _, content) in enumerate(self.files):
+            for trigram in _trigrams(content.lower()):
+                postings[trigram].append(file_idx)
+        return dict(postings)
+
+    def candidates(self, needle: str) -> list[int] | None:
+        """Return indices of files that may contain needle, ignoring case.
+
+        Returns None when needle is too short to be narrowed by trigrams.
+        """
+        trigrams = _trigrams(needle.lower())
+        if not trigrams:
+            return None
+        lists = sorted((self.postings.get(t, []) for t in trigrams), key=len)
+        matches = set(lists[0])
+        for posting in lists[1:]:
+            if not matches:
+                break
+            matches.intersection_update(posting)
+        return sorted(matches)
+
+    def iter_texts(
+        self, extensions: frozenset[str], needle: str | None = None
+    ) -> Iterator[tuple[Path, str]]:
+        """Yield (path, content) for indexed files with one of the extensions.
+
+        If needle is given, files that cannot contain it are skipped.
+        """
+        candidates = self.candidates(needle) if needle else None
+        files = (
+            self.files
+            if candidates is None
+            else [self.files[file_idx] for file_idx in candidates]
+        )
+        for path, ext, content in files:
+            if ext in extensions:
+                yield path, content
+
+
+def _load_index(cache_path: Path, root: Path) -> _CodebaseIndex | None:
+    """Load a pickled index for root, or None if missing or unusable."""
+    try:
+        with cache_path.open("rb") as f:
+            cached = pickle.load(f)
+    except Exception:
+        # Missing, corrupt or truncated caches are rebuilt and overwritten
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("version") != _INDEX_CACHE_VERSION
+        or cached.get("root") != str(root)
+    ):
+        return None
+    return cached["index"]
+
+
+def _store_index(cache_path: Path, root: Path, index: _CodebaseIndex) -> None:
+    """Pickle index to cache_path, ignoring failures to write it."""
+    payload = {"version": _INDEX_CACHE_VERSION, "root": str(root), "index": index}
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic rename, so concurrent workers never read a partial file
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=4)
+def _codebase_index(root: Path, commit: str) -> _CodebaseIndex:
+    """Build the index for a checkout, cached per (root, commit).
+
+    If codebase_index_cache_dir is set, the index is also persisted there
+    as {commit}.pkl, so a new process can load it instead of re-reading the
+    whole checkout. The commit in the file name invalidates it on change.
+    """
+    cache_dir = get_settings().codebase_index_cache_dir
+    if not cache_dir:
+        return _CodebaseIndex(root)
+
+    cache_path = Path(cache_dir) / f"{commit}.pkl"
+    index = _load_index(cache_path, root)
+    if index is None:
+        index = _CodebaseIndex(root)
+        _store_index(cache_path, root, index)
+    return index
+
+
+def _get_codebase_index(root: Path) -> _CodebaseIndex | None:
+    """Return the index for root's current commit, or None outside git."""
+    commit = _head_commit(root)
+    if commit is None:
+        return None
+    return _codebase_index(root, commit)
+
+
+def warm_codebase_index() -> bool:
+    """Build (or load) the search index for the configured codebase root.
+
+    Used at image build time, with codebase_index_cache_dir set, so the
+    index is already on disk when the server starts.
+
+    Returns:
+        True if an index was built or loaded, False outside a git checkout
+    """
+    root = _root_path(get_settings().codebase_root)
+    return _get_codebase_index(root) is not None
+
+
+def _get_snippet(content: str, line_start: int, line_num: int, context: int = 2) -> str:
+    """Get a code snippet around the line starting at offset line_start.
+
+    Only the surrounding lines are sliced out of content, so the file never
+    has to be split into a list of lines.
+    """
+    # Walk back to the start of the first context line
+    start = line_start
+    first = line_num
+    while first > max(1, line_num - context):
+        start = content.rfind("\n", 0, start - 1) + 1
+        first -= 1
+
+    # Walk forward past the end of the last context line
+    end = line_start
+    for _ in range(context + 1):
+        newline = content.find("\n", end)
+        if newline == -1:
+            end = len(content)
+            break
+        end = newline + 1
 
-def _get_snippet(lines: list[str], line_num: int, context: int = 2) -> str:
-    """Get a code snippet around a specific line."""
-    start = max(0, line_num - context - 1)
-    end = min(len(lines), line_num + context)
     snippet_lines = []
-    for i in range(start, end):
-        prefix = ">>> " if i == line_num - 1 else "    "
-        snippet_lines.append(f"{prefix}{i + 1}: {lines[i]}")
+    for i, line in enumerate(content[start:end].removesuffix("\n").split("\n")):
+        prefix = ">>> " if first + i == line_num else "    "
+        snippet_lines.append(f"{prefix}{first + i}: {line}")
     return "\n".join(snippet_lines)
 
 
+# Definition patterns for find_symbol; {s} is the escaped symbol name and
+# {ws} is whitespace other than a newline, so matches never span lines
+_SYMBOL_PATTERN_TEMPLATES = (
+    r"^{ws}*def{ws}+{s}{ws}*\(",  # Python function
+    r"^{ws}*class{ws}+{s}{ws}*[:\(]",  # Python class
+    r"^{ws}*{s}{ws}*=",  # Variable assignment
+    r"^{ws}*(async{ws}+)?function{ws}+{s}{ws}*\(",  # JS/TS function
+    r"^{ws}*(export{ws}+)?(const|let|var){ws}+{s}{ws}*=",  # JS/TS variable
+    r"^{ws}*(export{ws}+)?class{ws}+{s}{ws}*",  # JS/TS class
+    r"^{ws}*(export{ws}+)?interface{ws}+{s}{ws}*",  # TS interface
+    r"^{ws}*(export{ws}+)?type{ws}+{s}{ws}*=",  # TS type
+)
+
+
+@lru_cache(maxsize=1024)
+def _symbol_pattern(symbol_name: str) -> re.Pattern[str]:
+    """Compile the definition patterns for a symbol, cached per symbol name.
+
+    The pattern is multiline, so it can be run over a whole file as well as
+    over a single line.
+    """
+    name = re.escape(symbol_name)
+    return re.compile(
+        "|".join(
+            template.format(s=name, ws=r"[^\S\n]")
+            for template in _SYMBOL_PATTERN_TEMPLATES
+        ),
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _reference_pattern(symbol_name: str) -> re.Pattern[str]:
+    """Compile the word-boundary usage pattern for a symbol, cached per name."""
+    return re.compile(rf"\b{re.escape(symbol_name)}\b")
+
+
+def _iter_symbol_lines(
+    symbol_name: str, root: Path
+) -> Iterator[tuple[Path, str, int, int]]:
+    """Yield (path, content, line start offset, line number) for each definition."""
+    combined_pattern = _symbol_pattern(symbol_name)
+
+    extensions = _SYMBOL_EXTENSIONS
+    index = _get_codebase_index(root)
+
+    if index is None and _RG_PATH is not None:
+        hits = _ripgrep_search(combined_pattern, root, extensions)
+        try:
+            # ripgrep only reports the matching line; read the file for snippets
+            for file_path, file_hits in groupby(hits, key=itemgetter(0)):
+                content = _read_text(file_path)
+                if content is None:
+                    continue
+                line_starts = _line_starts(content)
+                for _, line_num, _ in file_hits:
+                    if line_num <= len(line_starts):
+                        yield file_path, content, line_starts[line_num - 1], line_num
+            return
+        except OSError:
+            pass  # Nothing was yielded; fall back to the Python search
+        finally:
+            hits.close()
+
+    # The patterns are case-insensitive, so prefilter on the folded name
+    folded_name = symbol_name.casefold()
+
+    texts = (
+        index.iter_texts(extensions, symbol_name)
+        if index is not None
+        else _iter_file_texts(_iter_files(root, extensions))
+    )
+    for file_path, content in texts:
+        # Cheap substring check before running the regex on any line
+        folded = content.casefold()
+        if folded_name not in folded:
+            continue
+
+        if len(folded) != len(content):
+            # Folding changed offsets; search the whole file instead
+            line_num = 1
+            counted = 0
+            for match in combined_pattern.finditer(content):
+                # Matches are anchored at the start of their line
+                line_num += content.count("\n", counted, match.start())
+                counted = match.start()
+                yield file_path, content, match.start(), line_num
+            continue
+
+        # Only lines that contain the name can define it; line numbers are
+        # counted between occurrences and each line is searched in place
+        line_num = 1
+        counted = 0
+        pos = folded.find(folded_name)
+        while pos != -1:
+            line_num += content.count("\n", counted, pos)
+            counted = pos
+            line_start = content.rfind("\n", 0, pos) + 1
+            line_end = content.find("\n", pos)
+            if line_end == -1:
+                line_end = len(content)
+            if combined_pattern.search(content, line_start, line_end):
+                yield file_path, content, line_start, line_num
+            pos = folded.find(folded_name, line_end + 1)
+
+
 def find_symbol(symbol_name: str) -> FindSymbolResult:
     """Find where a function, class, or variable is defined in the codebase.
 
     Searches for definitions of the given symbol name across all Python
-    and TypeScript files in the repository.
+    and TypeScript files in the repository. Snippets are only built for
+    the returned locations, and the search stops once enough definitions
+    have been counted, in which case the result is marked as truncated.
 
     Args:
         symbol_name: The name of the function, class, or variable to find.
@@ -253,56 +943,32 @@ def find_symbol(symbol_name: str) -> FindSymbolResult:
     Returns:
         FindSymbolResult with locations where the symbol is defined.
     """
-    settings = get_settings()
-    root = Path(settings.codebase_root)
-    locations: list[SymbolLocation] = []
-
-    # Patterns for finding definitions
-    patterns = [
-        rf"^\s*def\s+{re.escape(symbol_name)}\s*\(",  # Python function
-        rf"^\s*class\s+{re.escape(symbol_name)}\s*[:\(]",  # Python class
-        rf"^\s*{re.escape(symbol_name)}\s*=",  # Variable assignment
-        rf"^\s*(async\s+)?function\s+{re.escape(symbol_name)}\s*\(",  # JS/TS function
-        rf"^\s*(export\s+)?(const|let|var)\s+{re.escape(symbol_name)}\s*=",  # JS/TS variable
-        rf"^\s*(export\s+)?class\s+{re.escape(symbol_name)}\s*",  # JS/TS class
-        rf"^\s*(export\s+)?interface\s+{re.escape(symbol_name)}\s*",  # TS interface
-        rf"^\s*(export\s+)?type\s+{re.escape(symbol_name)}\s*=",  # TS type
-    ]
-
-    combined_pattern = re.compile("|".join(patterns), re.IGNORECASE)
-
-    extensions = {".py", ".ts", ".tsx", ".js", ".jsx"}
-
-    for file_path in root.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if file_path.suffix not in extensions:
-            continue
-        if _should_skip_path(file_path):
-            continue
+    root = _root_path(get_settings().codebase_root)
 
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            lines = content.splitlines()
-
-            for i, line in enumerate(lines):
-                if combined_pattern.search(line):
-                    relative_path = str(file_path.relative_to(root))
-                    snippet = _get_snippet(lines, i + 1)
-                    locations.append(
-                        SymbolLocation(
-                            file=relative_path,
-                            line=i + 1,
-                            snippet=snippet,
-                        )
-                    )
-        except (UnicodeDecodeError, PermissionError):
-            continue
+    found = _iter_symbol_lines(symbol_name, root)
+    try:
+        # Fields are built here from trusted values; skip validation
+        locations = [
+            SymbolLocation.model_construct(
+                file=str(file_path.relative_to(root)),
+                line=line_num,
+                snippet=_get_snippet(content, line_start, line_num),
+            )
+            for file_path, content, line_start, line_num in islice(found, _MAX_SYMBOLS)
+        ]
+        # Keep counting past the returned page, up to the scan cap
+        total_found = len(locations) + sum(
+            1 for _ in islice(found, _MAX_SYMBOL_SCAN - len(locations))
+        )
+        truncated = next(found, None) is not None
+    finally:
+        found.close()
 
-    return FindSymbolResult(
+    return FindSymbolResult.model_construct(
         symbol=symbol_name,
-        locations=locations[:20],  # Limit results
-        total_found=len(locations),
+        locations=locations,
+        total_found=total_found,
+        truncated=truncated,
     )
 
 
@@ -338,7 +1004,7 @@ def get_file_content(
         )
 
     settings = get_settings()
-    root = Path(settings.codebase_root)
+    root = _root_path(settings.codebase_root)
 
     # Normalize and validate path
     file_path = file_path.lstrip("/")
@@ -347,8 +1013,8 @@ def get_file_content(
     # Security: ensure path is within codebase root
     try:
         full_path = full_path.resolve()
-        root_resolved = root.resolve()
-        if not str(full_path).startswith(str(root_resolved)):
+        root_resolved = _resolved_root(settings.codebase_root)
+        if not full_path.is_relative_to(root_resolved):
             raise ValueError(f"Path {file_path} is outside the codebase root")
     except (OSError, ValueError) as e:
         return FileContent(
@@ -371,7 +1037,7 @@ def get_file_content(
         )
 
     try:
-        content = full_path.read_text(encoding="utf-8")
+        content = _read_checkout_file(root, full_path.relative_to(root_resolved))
         lines = content.splitlines()
         total_lines = len(lines)
 
@@ -409,11 +1075,126 @@ def get_file_content(
         )
 
 
+def _iter_text_matches(
+    texts: Iterator[tuple[Path, str]], pattern: re.Pattern[str]
+) -> Iterator[tuple[Path, int, str]]:
+    """Yield (path, line number, line) for each line of texts matching pattern."""
+    try:
+        for file_path, content in texts:
+            # Scan the whole file at once, counting lines between matches
+            line_num = 1
+            counted = 0
+            last_line = 0
+            for match in pattern.finditer(content):
+                start = match.start()
+                line_num += content.count("\n", counted, start)
+                counted = start
+                if line_num == last_line:
+                    continue  # One match per line
+                last_line = line_num
+
+                line_start = content.rfind("\n", 0, start) + 1
+                line_end = content.find("\n", start)
+                line = content[line_start : line_end if line_end != -1 else None]
+                yield file_path, line_num, line
+    finally:
+        texts.close()
+
+
+def _scan_file_bytes(
+    needle: bytes, pattern: re.Pattern[str], path: Path
+) -> list[tuple[int, str]] | None:
+    """Return (line number, line) for each line of a file matching pattern.
+
+    The file is memory-mapped and searched as raw bytes for needle, the
+    UTF-8 encoded symbol; only lines containing it are decoded, and each is
+    confirmed with the same str pattern the other searches use, so word
+    boundaries match theirs exactly. Returns None for binary, empty,
+    unreadable or non-UTF-8 files.
+    """
+    try:
+        with (
+            open(path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            if mm.find(b"\0", 0, _BINARY_SNIFF_BYTES) != -1:
+                return None
+            hits: list[tuple[int, str]] = []
+            line_num = 1
+            pos = 0
+            start = mm.find(needle)
+            if start != -1 and _NON_ASCII.search(mm):
+                # The other searches skip files that aren't valid UTF-8
+                str(mm, "utf-8")
+            while start != -1:
+                line_num += mm[pos:start].count(b"\n")
+                line_start = mm.rfind(b"\n", 0, start) + 1
+                line_end = mm.find(b"\n", start)
+                if line_end == -1:
+                    line_end = len(mm)
+                line = mm[line_start:line_end].decode("utf-8").removesuffix("\r")
+                if pattern.search(line):
+                    hits.append((line_num, line))
+                # One match per line; continue on the next one
+                pos = line_end
+                start = mm.find(needle, line_end + 1)
+            return hits
+    except (OSError, ValueError):
+        return None
+
+
+def _iter_byte_matches(
+    paths: Iterable[Path], symbol_name: str, pattern: re.Pattern[str]
+) -> Iterator[tuple[Path, int, str]]:
+    """Yield (path, line number, line) for each line of the files matching pattern."""
+    scans = _iter_pooled(
+        paths, partial(_scan_file_bytes, symbol_name.encode(), pattern)
+    )
+    try:
+        for file_path, hits in scans:
+            for line_num, line in hits:
+                yield file_path, line_num, line
+    finally:
+        scans.close()
+
+
+def _iter_references(symbol_name: str, root: Path) -> Iterator[tuple[Path, int, str]]:
+    """Yield (path, line number, line) for each line referencing a symbol.
+
+    Hits are yielded as they are found and left raw, so callers only build
+    Reference objects for the ones they return. The walk is lazy: closing
+    the generator stops the file walk and cancels any reads still in flight.
+    """
+    pattern = _reference_pattern(symbol_name)
+
+    extensions = _REFERENCE_EXTENSIONS
+    index = _get_codebase_index(root)
+
+    if index is None and _RG_PATH is not None:
+        try:
+            yield from _ripgrep_search(pattern, root, extensions)
+            return
+        except OSError:
+            pass  # Nothing was yielded; fall back to the Python search
+
+    if index is not None:
+        hits = _iter_text_matches(index.iter_texts(extensions, symbol_name), pattern)
+    else:
+        # Without an index, scan raw bytes and decode only the matching lines
+        hits = _iter_byte_matches(_iter_files(root, extensions), symbol_name, pattern)
+    try:
+        yield from hits
+    finally:
+        hits.close()
+
+
 def find_references(symbol_name: str) -> FindReferencesResult:
     """Find all references to a symbol in the codebase.
 
     Searches for usages of the given symbol name across all code files,
-    helping understand how components are connected.
+    helping understand how components are connected. The search stops once
+    enough references have been found to fill the result, in which case
+    the result is marked as truncated.
 
     Args:
         symbol_name: The name of the symbol to find references for.
@@ -421,58 +1202,77 @@ def find_references(symbol_name: str) -> FindReferencesResult:
     Returns:
         FindReferencesResult with all locations where the symbol is used.
     """
-    settings = get_settings()
-    root = Path(settings.codebase_root)
-    references: list[Reference] = []
-
-    # Pattern to find symbol usage (word boundary match)
-    pattern = re.compile(rf"\b{re.escape(symbol_name)}\b")
-
-    extensions = {
-        ".py",
-        ".ts",
-        ".tsx",
-        ".js",
-        ".jsx",
-        ".json",
-        ".md",
-        ".yaml",
-        ".yml",
-        ".toml",
-    }
+    root = _root_path(get_settings().codebase_root)
 
-    for file_path in root.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if file_path.suffix not in extensions:
-            continue
-        if _should_skip_path(file_path):
-            continue
-
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            lines = content.splitlines()
-
-            for i, line in enumerate(lines):
-                if pattern.search(line):
-                    relative_path = str(file_path.relative_to(root))
-                    references.append(
-                        Reference(
-                            file=relative_path,
-                            line=i + 1,
-                            context=line.strip()[:200],  # Limit context length
-                        )
-                    )
-        except (UnicodeDecodeError, PermissionError):
-            continue
+    found = _iter_references(symbol_name, root)
+    try:
+        # Fields are built here from trusted values; skip validation
+        references = [
+            Reference.model_construct(
+                file=str(file_path.relative_to(root)),
+                line=line_num,
+                context=line.strip()[:200],  # Limit context length
+            )
+            for file_path, line_num, line in islice(found, _MAX_REFERENCES)
+        ]
+        # Keep counting past the returned page, up to the scan cap
+        total_found = len(references) + sum(
+            1 for _ in islice(found, _MAX_REFERENCE_SCAN - len(references))
+        )
+        truncated = next(found, None) is not None
+    finally:
+        found.close()
 
-    return FindReferencesResult(
+    return FindReferencesResult.model_construct(
         symbol=symbol_name,
-        references=references[:50],  # Limit results
-        total_found=len(references),
+        references=references,
+        total_found=total_found,
+        truncated=truncated,
     )
 
 
+# Rendered folder trees, keyed by (root, path, max_depth, show_files). Each is
+# stored with the mtime of every directory it listed, and is reused only
+# while none of them has changed, i.e. no entry was added, removed or renamed
+_folder_trees: OrderedDict[
+    tuple[str, str, int, bool],
+    tuple[tuple[tuple[str, int], ...], FolderTreeResult],
+] = OrderedDict()
+_folder_trees_lock = threading.Lock()
+
+
+def _cached_folder_tree(
+    key: tuple[str, str, int, bool],
+) -> FolderTreeResult | None:
+    """Return the cached tree for key if no directory in it has changed."""
+    with _folder_trees_lock:
+        cached = _folder_trees.get(key)
+        if cached is None:
+            return None
+        _folder_trees.move_to_end(key)
+    dir_stamps, result = cached
+    try:
+        for dir_path, mtime_ns in dir_stamps:
+            if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                return None
+    except OSError:
+        return None
+    return result
+
+
+def _store_folder_tree(
+    key: tuple[str, str, int, bool],
+    dir_stamps: tuple[tuple[str, int], ...],
+    result: FolderTreeResult,
+) -> None:
+    """Cache a rendered tree with the directory stamps it was built from."""
+    with _folder_trees_lock:
+        _folder_trees[key] = (dir_stamps, result)
+        _folder_trees.move_to_end(key)
+        if len(_folder_trees) > _MAX_CACHED_TREES:
+            _folder_trees.popitem(last=False)
+
+
 def get_folder_tree(
     path: str = "",
     max_depth: int = 3,
@@ -502,7 +1302,7 @@ def get_folder_tree(
         )
 
     settings = get_settings()
-    root = Path(settings.codebase_root)
+    root = _root_path(settings.codebase_root)
 
     # Normalize path
     if path:
@@ -514,8 +1314,7 @@ def get_folder_tree(
     # Security: ensure path is within codebase root
     try:
         start_path = start_path.resolve()
-        root_resolved = root.resolve()
-        if not str(start_path).startswith(str(root_resolved)):
+        if not start_path.is_relative_to(_resolved_root(settings.codebase_root)):
             return FolderTreeResult(
                 root=path or ".",
                 tree=f"Error: Path '{path}' is outside the codebase root",
@@ -546,61 +1345,74 @@ def get_folder_tree(
             total_dirs=0,
         )
 
+    cache_key = (str(root), path, max_depth, show_files)
+    cached = _cached_folder_tree(cache_key)
+    if cached is not None:
+        return cached
+
     lines: list[str] = []
     total_files = 0
     total_dirs = 0
+    # (directory, mtime_ns) for every directory listed, to validate the cache
+    dir_stamps: list[tuple[str, int]] = []
 
-    def build_tree(current_path: Path, prefix: str = "", depth: int = 0) -> None:
-        nonlocal total_files, total_dirs
-
-        if depth > max_depth:
-            return
+    def visible_entries(dir_path: str | Path) -> list[os.DirEntry[str]]:
+        try:
+            # Stat before listing, so a change during the listing is caught
+            dir_stamps.append((str(dir_path), os.stat(dir_path).st_mtime_ns))
+            # Get sorted directory contents; DirEntry caches the file type
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: (not e.is_dir(), e.name.lower()))
+        except OSError:
+            return []
+
+        # Filter entries
+        return [
+            entry
+            for entry in entries
+            if not (entry.name.startswith(".") and entry.name != ".github")
+            and entry.name not in _SKIP_DIRS
+            and (show_files or not entry.is_file())
+        ]
 
-        if _should_skip_path(current_path):
-            return
+    # Explicit stack of (entry, prefix, depth, is_last), popped in tree order
+    stack: list[tuple[os.DirEntry[str], str, int, bool]] = []
 
-        try:
-            # Get sorted directory contents
-            items = sorted(
-                current_path.iterdir(),
-                key=lambda x: (not x.is_dir(), x.name.lower()),
-            )
-        except PermissionError:
+    def push_children(dir_path: str | Path, prefix: str, depth: int) -> None:
+        if depth > max_depth:
             return
-
-        # Filter items
-        visible_items = []
-        for item in items:
-            if item.name.startswith(".") and item.name not in {".github"}:
-                continue
-            if _should_skip_path(item):
-                continue
-            if not show_files and item.is_file():
-                continue
-            visible_items.append(item)
-
-        for i, item in enumerate(visible_items):
-            is_last = i == len(visible_items) - 1
-            connector = "\u2514\u2500\u2500 " if is_last else "\u251c\u2500\u2500 "
-
-            if item.is_dir():
-                total_dirs += 1
-                lines.append(f"{prefix}{connector}{item.name}/")
-                # Recurse with updated prefix
-                extension = "    " if is_last else "\u2502   "
-                build_tree(item, prefix + extension, depth + 1)
-            else:
-                total_files += 1
-                lines.append(f"{prefix}{connector}{item.name}")
+        children = visible_entries(dir_path)
+        for i in range(len(children) - 1, -1, -1):
+            stack.append((children[i], prefix, depth, i == len(children) - 1))
 
     # Start building tree
     display_root = path if path else "."
     lines.append(f"{display_root}/")
-    build_tree(start_path, "", 0)
+    if not _should_skip_path(start_path):
+        push_children(start_path, "", 0)
+
+    while stack:
+        entry, prefix, depth, is_last = stack.pop()
+        connector = "\u2514\u2500\u2500 " if is_last else "\u251c\u2500\u2500 "
+
+        if entry.is_dir():
+            total_dirs += 1
+            lines.append(f"{prefix}{connector}{entry.name}/")
+            extension = "    " if is_last else "\u2502   "
+            push_children(entry.path, prefix + extension, depth + 1)
+        else:
+            total_files += 1
+            lines.append(f"{prefix}{connector}{entry.name}")
 
-    return FolderTreeResult(
+    result = FolderTreeResult(
         root=display_root,
         tree="\n".join(lines),
         total_files=total_files,
         total_dirs=total_dirs,
     )
+    _store_folder_tree(cache_key, tuple(dir_stamps), result)
+    return result
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if warm_codebase_index() else 1)
@@ -4,38 +4,46 @@ These tools provide structured information about George's professional
 background, skills, and projects.
 """
 
-from pydantic import BaseModel, Field
+from typing import Final
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Experience(BaseModel):
     """A professional experience entry."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     company: str
     title: str
     role: str | None = None
     period: str
     location: str
     description: str
-    highlights: list[str]
-    technologies: list[str]
+    highlights: tuple[str, ...]
+    technologies: tuple[str, ...]
     logo: str | None = None
 
 
 class Skill(BaseModel):
     """A skill category with proficiency."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     category: str
-    skills: list[str]
+    skills: tuple[str, ...]
     proficiency: str = Field(description="One of: expert, proficient, familiar")
 
 
 class Project(BaseModel):
     """A project entry."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     description: str
-    technologies: list[str]
-    highlights: list[str]
+    technologies: tuple[str, ...]
+    highlights: tuple[str, ...]
     url: str | None = None
     github: str | None = None
 
@@ -43,17 +51,21 @@ class Project(BaseModel):
 class Education(BaseModel):
     """An education entry."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     institution: str
     degree: str
     field: str
     period: str
     location: str
-    highlights: list[str] | None = None
+    highlights: tuple[str, ...] | None = None
 
 
 class ProfileInfo(BaseModel):
     """Profile metadata."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     title: str
     location: str
@@ -67,35 +79,44 @@ class ProfileData(BaseModel):
     """Complete profile data for the /profile endpoint."""
 
     profile: ProfileInfo
-    experiences: list[Experience]
-    skills: list["Skill"]
-    projects: list[Project]
-    education: list[Education]
+    experiences: tuple[Experience, ...]
+    skills: tuple["Skill", ...]
+    projects: tuple[Project, ...]
+    education: tuple[Education, ...]
 
 
 class ProfessionalExperience(BaseModel):
     """Complete professional experience response."""
 
-    experiences: list[Experience]
+    model_config = ConfigDict(defer_build=True)
+
+    experiences: tuple[Experience, ...]
     summary: str
 
 
 class SkillsResponse(BaseModel):
     """Complete skills response."""
 
-    skills: list[Skill]
+    model_config = ConfigDict(defer_build=True)
+
+    skills: tuple[Skill, ...]
     summary: str
 
 
 class ProjectsResponse(BaseModel):
     """Complete projects response."""
 
-    projects: list[Project]
+    model_config = ConfigDict(defer_build=True)
+
+    projects: tuple[Project, ...]
     summary: str
 
 
+# The literals below are built without validation since they are trusted;
+# the tests validate them against the models instead
+
 # Profile metadata
-PROFILE = ProfileInfo(
+PROFILE: Final[ProfileInfo] = ProfileInfo.model_construct(
     name="George Dekermenjian",
     title="Director of Data & AI",
     location="Barcelona, Spain",
@@ -112,170 +133,170 @@ PROFILE = ProfileInfo(
 )
 
 # Professional experience data
-EXPERIENCES: list[Experience] = [
-    Experience(
+EXPERIENCES: Final[tuple[Experience, ...]] = (
+    Experience.model_construct(
         company="Fundcraft",
         title="VP Data & AI",
         period="Jul 2025 - Dec 2025",
         location="Remote (Luxembourg)",
         description="Luxembourg-based fund administrator (AIFMD regulated)",
-        highlights=[
+        highlights=(
             "Built tamper-proof audit trail system for AI+human document classification workflows—every AI decision logged, every human override captured, full traceability for compliance (AIFMD, GDPR)",
             "Deployed GenAI document classification (OpenAI/Anthropic APIs) processing thousands of fund, KYC, and transaction documents monthly; reduced classification time from 45-60 seconds to near-zero (80%+ confident) or 10 seconds (human review), saving 150-300 hours/month",
             "Reduced financial reporting latency by 99.5% (40s → 200ms) through real-time architecture redesign using ClickHouse—eliminated client complaints on NAV reporting",
             "Scaled data team from 6 to 12 in 4 months; established Data Governance framework using dbt contracts and custom schema validation",
             "Led AI-First culture transformation: trained 40+ developers in AI-assisted development, reduced code review cycles by 50%",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "ClickHouse",
             "OpenAI",
             "Anthropic",
             "dbt",
             "Python",
             "AIFMD/GDPR Compliance",
-        ],
+        ),
     ),
-    Experience(
+    Experience.model_construct(
         company="Decipher AI (YC W24)",
         title="Senior Data Platform Engineer",
         period="Mar 2025 - Jun 2025",
         location="Remote",
         description="AI-powered session replay analytics",
-        highlights=[
+        highlights=(
             "Partnered with founders on data platform modernization for enterprise growth; worked in TypeScript/Next.js codebase with OpenAI SDK integration",
             "Executed zero-downtime cloud migration from Supabase to Azure PostgreSQL: partitioned tables, TTL policies, schema versioning—reduced query latency from 15s to 2s (87% improvement)",
             "Architected real-time analytics platform: ClickHouse with Kafka ingestion, MaterializedViews, AggregatingMergeTree—95% latency reduction for AI-powered funnel analysis",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "TypeScript",
             "Next.js",
             "OpenAI SDK",
             "Azure PostgreSQL",
             "ClickHouse",
             "Kafka",
-        ],
+        ),
     ),
-    Experience(
+    Experience.model_construct(
         company="Mouseflow",
         title="Director of Data & Analytics",
         period="Jan 2023 - Feb 2025",
         location="Barcelona, Spain",
         description="Session replay and heatmap analytics platform",
-        highlights=[
+        highlights=(
             "Led $1.2M digital transformation and cloud migration (GCP): migrated 500TB data estate across EU + US datacenters, processing 500M monthly pageviews—enabled 30% increase in enterprise customer adoption",
             "Built data organization from 1 to 4 members; established documentation standards, engineering best practices, and data quality frameworks",
             "Implemented real-time analytics on ClickHouse: 90% query latency reduction, enabled cohort retention analysis and funnel visualization previously impossible",
             "Partnered with CTO/CEO on data strategy alignment; secured executive buy-in for multi-year infrastructure investment",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "GCP",
             "ClickHouse",
             "BigQuery",
             "Dataflow",
             "Python",
-        ],
+        ),
     ),
-    Experience(
+    Experience.model_construct(
         company="Mouseflow",
         title="Data Scientist",
         period="Oct 2021 - Dec 2022",
         location="Copenhagen, Denmark",
         description="Session replay and heatmap analytics platform",
-        highlights=[
+        highlights=(
             "Conducted infrastructure assessment of legacy Elasticsearch and HBase systems; created prototype 'flows' visualization that became key enterprise differentiator",
             "Established cross-functional relationships with Product, Sales, and Customer Success to align technical solutions with business needs",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "Elasticsearch",
             "HBase",
             "Python",
             "Data Visualization",
-        ],
+        ),
     ),
-    Experience(
+    Experience.model_construct(
         company="Independent",
         title="Cloud Data Solutions Consultant",
         period="2018 - Present",
         location="Remote",
         description="Startups and regulated industries",
-        highlights=[
+        highlights=(
             "Architected cloud-native migrations and real-time analytics solutions using GCP (BigQuery, Dataflow, Pub/Sub) for clients transitioning from legacy systems",
             "Developed data strategies incorporating governance, security, and compliance requirements",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "GCP",
             "BigQuery",
             "Dataflow",
             "Pub/Sub",
             "Terraform",
-        ],
+        ),
     ),
-    Experience(
+    Experience.model_construct(
         company="Cubris (A Thales Company)",
         title="Data Scientist",
         period="Nov 2020 - Sep 2021",
         location="Copenhagen, Denmark",
         description="Railway technology",
-        highlights=[
+        highlights=(
             "Achieved 75% improvement in GPS data processing algorithms for European rail operations while maintaining accuracy standards",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "Python",
             "GPS Processing",
             "Algorithm Optimization",
-        ],
+        ),
     ),
-    Experience(
+    Experience.model_construct(
         company="BMW Group",
         title="Data Scientist (Master's Thesis)",
         period="Jan 2020 - Jul 2020",
         location="Munich, Germany",
         description="Master's thesis research",
-        highlights=[
+        highlights=(
             "Developed metamodel using adapted stochastic gradient descent for B-splines—reduced vehicle crash simulation time from 24+ hours to minutes",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "Python",
             "Machine Learning",
             "Numerical Optimization",
             "B-splines",
-        ],
+        ),
     ),
-    Experience(
+    Experience.model_construct(
         company="Los Angeles City College",
         title="Professor of Mathematics",
         role="Including Mathematics Department Chair",
         period="2007 - 2017",
         location="Los Angeles, USA",
         description="Higher education",
-        highlights=[
+        highlights=(
             "10 years in higher education: developed communication, organizational leadership, and ability to simplify complex technical concepts for diverse audiences",
-        ],
-        technologies=[
+        ),
+        technologies=(
             "Mathematics",
             "Teaching",
             "Leadership",
             "Curriculum Development",
-        ],
+        ),
     ),
-]
+)
 
-SKILLS: list[Skill] = [
-    Skill(
+SKILLS: Final[tuple[Skill, ...]] = (
+    Skill.model_construct(
         category="Real-Time Data & Analytics",
-        skills=[
+        skills=(
             "ClickHouse",
             "Kafka",
             "Materialized Views",
             "Low-Latency Architecture",
             "Streaming ETL",
             "BigQuery",
-        ],
+        ),
         proficiency="expert",
     ),
-    Skill(
+    Skill.model_construct(
         category="Cloud & Infrastructure",
-        skills=[
+        skills=(
             "GCP (Professional Data Engineer certified)",
             "Azure",
             "PostgreSQL",
@@ -284,122 +305,150 @@ SKILLS: list[Skill] = [
             "Cloud Run",
             "Dataflow",
             "Pub/Sub",
-        ],
+        ),
         proficiency="expert",
     ),
-    Skill(
+    Skill.model_construct(
         category="AI/ML & GenAI",
-        skills=[
+        skills=(
             "LLM APIs (OpenAI, Anthropic, Gemini)",
             "Agentic Frameworks (pydantic-ai, Temporal)",
             "RAG Pipelines",
             "Human-in-the-Loop Workflows",
             "Python",
             "FastAPI",
-        ],
+        ),
         proficiency="expert",
     ),
-    Skill(
+    Skill.model_construct(
         category="Data Governance",
-        skills=[
+        skills=(
             "dbt contracts",
             "Custom Schema Validation",
             "Audit Trail Design",
             "AIFMD/GDPR Compliance",
-        ],
+        ),
         proficiency="proficient",
     ),
-    Skill(
+    Skill.model_construct(
         category="Leadership",
-        skills=[
+        skills=(
             "Digital Transformation",
             "Team Scaling (1→12)",
             "Regulated Industries",
             "C-Suite Stakeholder Management",
-        ],
+        ),
         proficiency="expert",
     ),
-]
+)
 
-PROJECTS: list[Project] = [
-    Project(
+PROJECTS: Final[tuple[Project, ...]] = (
+    Project.model_construct(
         name="Glass Box Portfolio",
         description="Production-grade demonstration of explainable, agentic systems with transparent visibility into AI decision-making.",
-        technologies=[
+        technologies=(
             "Next.js",
             "FastAPI",
             "pydantic-ai",
             "Gemini",
             "Vercel",
             "Cloud Run",
-        ],
-        highlights=[
+        ),
+        highlights=(
             "Toggle between polished UX and transparent engineering view",
             "Real-time Brain Log showing agent reasoning and tool execution",
             "Codebase Oracle for answering questions about the system itself",
-        ],
+        ),
         url="https://george-dekermenjian.vercel.app",
         github="https://github.com/ged1182/george-dekermenjian",
     ),
-    Project(
+    Project.model_construct(
         name="Auditable AI Document Classification",
         description="AIFMD/GDPR compliant document classification system with full audit trails for fund administration.",
-        technologies=[
+        technologies=(
             "OpenAI",
             "Anthropic",
             "Python",
             "ClickHouse",
             "dbt",
-        ],
-        highlights=[
+        ),
+        highlights=(
             "Tamper-proof audit trail for AI+human workflows",
             "150-300 hours/month saved across operations team",
             "Full traceability for regulatory compliance",
-        ],
+        ),
     ),
-    Project(
+    Project.model_construct(
         name="Real-Time Financial Reporting",
         description="99.5% latency reduction for NAV reporting using ClickHouse real-time architecture.",
-        technologies=[
+        technologies=(
             "ClickHouse",
             "Kafka",
             "MaterializedViews",
             "Python",
-        ],
-        highlights=[
+        ),
+        highlights=(
             "Reduced reporting latency from 40s to 200ms",
             "Eliminated client complaints on NAV reporting",
             "Real-time architecture redesign",
-        ],
+        ),
     ),
-]
+)
 
-EDUCATION: list[Education] = [
-    Education(
+EDUCATION: Final[tuple[Education, ...]] = (
+    Education.model_construct(
         institution="Technical University of Munich",
         degree="M.S.",
         field="Mathematics in Data Science",
         period="2020",
         location="Munich, Germany",
-        highlights=[
-            "Master's thesis at BMW Group on crash simulation optimization",
-        ],
+        highlights=("Master's thesis at BMW Group on crash simulation optimization",),
     ),
-    Education(
+    Education.model_construct(
         institution="Claremont Graduate University",
         degree="M.S.",
         field="Mathematics",
         period="2009",
         location="Claremont, CA",
     ),
-    Education(
+    Education.model_construct(
         institution="American University of Beirut",
         degree="B.A.",
         field="Mathematics",
         period="2003",
         location="Beirut, Lebanon",
     ),
-]
+)
+
+
+# Summaries of the static data above, formatted once
+_EXPERIENCE_SUMMARY = f"George has {len(EXPERIENCES)} professional experiences spanning AI/ML, data engineering, and mathematics education."
+_SKILLS_SUMMARY = f"George has expertise across {len(SKILLS)} skill categories, with particular depth in real-time data systems and AI/ML."
+_PROJECTS_SUMMARY = f"George has worked on {len(PROJECTS)} notable projects demonstrating production-grade AI systems."
+_EDUCATION_SUMMARY = f"George has {len(EDUCATION)} degree(s) in Mathematics and Data Science, plus Google Cloud Professional Data Engineer certification."
+_LATEST_EXPERIENCE_SUMMARY = (
+    f"George's most recent role is {EXPERIENCES[0].title} at {EXPERIENCES[0].company}."
+)
+
+
+# The source lists never change at runtime, so each response is built once
+# at import instead of on every tool call. They wrap already-validated data,
+# so they are built without validation, which also leaves their deferred
+# schemas unbuilt until a response is first serialized.
+_PROFESSIONAL_EXPERIENCE = ProfessionalExperience.model_construct(
+    experiences=EXPERIENCES,
+    summary=_EXPERIENCE_SUMMARY,
+)
+
+_SKILLS_RESPONSE = SkillsResponse.model_construct(
+    skills=SKILLS,
+    summary=_SKILLS_SUMMARY,
+)
+
+_PROJECTS_RESPONSE = ProjectsResponse.model_construct(
+    projects=PROJECTS,
+    summary=_PROJECTS_SUMMARY,
+)
 
 
 def get_professional_experience() -> ProfessionalExperience:
@@ -408,10 +457,7 @@ def get_professional_experience() -> ProfessionalExperience:
     Returns structured information about past roles, responsibilities,
     and key achievements.
     """
-    return ProfessionalExperience(
-        experiences=EXPERIENCES,
-        summary=f"George has {len(EXPERIENCES)} professional experiences spanning AI/ML, data engineering, and mathematics education.",
-    )
+    return _PROFESSIONAL_EXPERIENCE
 
 
 def get_skills() -> SkillsResponse:
@@ -419,10 +465,7 @@ def get_skills() -> SkillsResponse:
 
     Returns categorized skills with proficiency levels (expert, proficient, familiar).
     """
-    return SkillsResponse(
-        skills=SKILLS,
-        summary=f"George has expertise across {len(SKILLS)} skill categories, with particular depth in real-time data systems and AI/ML.",
-    )
+    return _SKILLS_RESPONSE
 
 
 def get_projects() -> ProjectsResponse:
@@ -431,41 +474,65 @@ def get_projects() -> ProjectsResponse:
     Returns detailed information about significant projects including
     technologies used and key highlights.
     """
-    return ProjectsResponse(
-        projects=PROJECTS,
-        summary=f"George has worked on {len(PROJECTS)} notable projects demonstrating production-grade AI systems.",
-    )
+    return _PROJECTS_RESPONSE
 
 
 class EducationResponse(BaseModel):
     """Complete education response."""
 
-    education: list[Education]
+    model_config = ConfigDict(defer_build=True)
+
+    education: tuple[Education, ...]
     summary: str
 
 
 class ProfileResponse(BaseModel):
     """Profile info response."""
 
+    model_config = ConfigDict(defer_build=True)
+
     profile: ProfileInfo
 
 
 class LatestExperienceResponse(BaseModel):
     """Latest experience response."""
 
+    model_config = ConfigDict(defer_build=True)
+
     experience: Experience
     summary: str
 
 
+_EDUCATION_RESPONSE = EducationResponse.model_construct(
+    education=EDUCATION,
+    summary=_EDUCATION_SUMMARY,
+)
+
+_PROFILE_RESPONSE = ProfileResponse.model_construct(profile=PROFILE)
+
+_LATEST_EXPERIENCE_RESPONSE = LatestExperienceResponse.model_construct(
+    experience=EXPERIENCES[0],
+    summary=_LATEST_EXPERIENCE_SUMMARY,
+)
+
+_FULL_PROFILE = ProfileData.model_construct(
+    profile=PROFILE,
+    experiences=EXPERIENCES,
+    skills=SKILLS,
+    projects=PROJECTS,
+    education=EDUCATION,
+)
+
+# The /profile endpoint serves these bytes as-is instead of re-serializing
+_FULL_PROFILE_JSON = _FULL_PROFILE.model_dump_json().encode()
+
+
 def get_education() -> EducationResponse:
     """Get George's educational background.
 
     Returns structured information about degrees and institutions.
     """
-    return EducationResponse(
-        education=EDUCATION,
-        summary=f"George has {len(EDUCATION)} degree(s) in Mathematics and Data Science, plus Google Cloud Professional Data Engineer certification.",
-    )
+    return _EDUCATION_RESPONSE
 
 
 def get_profile() -> ProfileResponse:
@@ -473,7 +540,7 @@ def get_profile() -> ProfileResponse:
 
     Returns contact information and professional summary.
     """
-    return ProfileResponse(profile=PROFILE)
+    return _PROFILE_RESPONSE
 
 
 def get_latest_experience() -> LatestExperienceResponse:
@@ -481,11 +548,7 @@ def get_latest_experience() -> LatestExperienceResponse:
 
     Returns information about the current role only.
     """
-    latest = EXPERIENCES[0]
-    return LatestExperienceResponse(
-        experience=latest,
-        summary=f"George's most recent role is {latest.title} at {latest.company}.",
-    )
+    return _LATEST_EXPERIENCE_RESPONSE
 
 
 def get_full_profile() -> ProfileData:
@@ -494,10 +557,13 @@ def get_full_profile() -> ProfileData:
     Returns all profile information including experiences, skills,
     projects, and education.
     """
-    return ProfileData(
-        profile=PROFILE,
-        experiences=EXPERIENCES,
-        skills=SKILLS,
-        projects=PROJECTS,
-        education=EDUCATION,
-    )
+    return _FULL_PROFILE
+
+
+def get_full_profile_json() -> bytes:
+    """Get the complete profile data pre-serialized as JSON.
+
+    Same content as get_full_profile(), serialized once at import so the
+    /profile endpoint can return it without any per-request serialization.
+    """
+    return _FULL_PROFILE_JSON
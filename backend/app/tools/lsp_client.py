@@ -10,13 +10,137 @@ import json
 import logging
 import os
 import subprocess
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+_CONTENT_LENGTH = b"Content-Length:"
+
+# Documents kept open on a server before the least recently used is closed
+_MAX_OPEN_DOCUMENTS = 128
+# Raw results of document requests kept for repeat lookups
+_MAX_CACHED_RESPONSES = 512
+# Workspace symbol searches kept, and for how many seconds
+_MAX_CACHED_SYMBOL_QUERIES = 128
+_WORKSPACE_SYMBOL_TTL = 30.0
+# Pipe capacity requested for server stdio; 1 MiB is the unprivileged limit
+_PIPE_SIZE = 1 << 20
+
+# Capabilities announced in every initialize request; only read, never mutated
+_CLIENT_CAPABILITIES: dict[str, Any] = {
+    "textDocument": {
+        "hover": {"contentFormat": ("markdown", "plaintext")},
+        "definition": {"linkSupport": True},
+        "references": {},
+        "documentSymbol": {
+            "hierarchicalDocumentSymbolSupport": True,
+        },
+        "callHierarchy": {},
+    },
+    "workspace": {
+        "symbol": {"symbolKind": {"valueSet": tuple(range(1, 27))}},
+    },
+}
+
+# Seconds to wait for each kind of response before giving up on it
+_REQUEST_TIMEOUTS = {
+    "initialize": 60.0,
+    "shutdown": 5.0,
+    "textDocument/hover": 5.0,
+    "workspace/symbol": 15.0,
+}
+_DEFAULT_REQUEST_TIMEOUT = 10.0
+
+# Seconds a request waits for another caller to finish starting the servers
+_READY_TIMEOUT = 30.0
+
+
+_LANGUAGE_IDS = {
+    ".py": "python",
+    ".ts": "typescript",
+    ".tsx": "typescriptreact",
+    ".js": "javascript",
+    ".jsx": "javascriptreact",
+    ".json": "json",
+}
+
+
+@lru_cache(maxsize=4096)
+def _language_id(file_path: str) -> str:
+    """Get the LSP language ID for a file from its extension."""
+    ext = os.path.splitext(file_path)[1].lower()
+    return _LANGUAGE_IDS.get(ext, "plaintext")
+
+
+@lru_cache(maxsize=4096)
+def _uri(file_path: str) -> str:
+    """Get the file:// URI for an absolute path."""
+    return "file://" + file_path
+
+
+def _notification(method: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Build a JSON-RPC notification message."""
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+def _did_open(file_path: str, content: str, language_id: str) -> dict[str, Any]:
+    """Build a didOpen notification carrying the document's full text."""
+    return _notification(
+        "textDocument/didOpen",
+        {
+            "textDocument": {
+                "uri": _uri(file_path),
+                "languageId": language_id,
+                "version": 1,
+                "text": content,
+            }
+        },
+    )
+
+
+def _did_change(file_path: str, content: str, version: int) -> dict[str, Any]:
+    """Build a full-text didChange notification."""
+    return _notification(
+        "textDocument/didChange",
+        {
+            "textDocument": {"uri": _uri(file_path), "version": version},
+            "contentChanges": [{"text": content}],
+        },
+    )
+
+
+def _did_close(file_path: str) -> dict[str, Any]:
+    """Build a didClose notification."""
+    return _notification(
+        "textDocument/didClose", {"textDocument": {"uri": _uri(file_path)}}
+    )
+
+
+def _grow_pipe(fd: int) -> None:
+    """Enlarge a pipe's kernel buffer where the platform allows it.
+
+    Frames larger than the default 64 KiB pipe would otherwise block the
+    writer until the other side catches up.
+    """
+    set_size = getattr(fcntl, "F_SETPIPE_SZ", None)
+    if set_size is None:
+        return
+    try:
+        fcntl.fcntl(fd, set_size, _PIPE_SIZE)
+    except OSError:
+        pass
+
 
 class LanguageServer(Enum):
     """Supported language servers."""
@@ -25,7 +149,7 @@ class LanguageServer(Enum):
     PYTHON = "python"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """A position in a text document (0-indexed)."""
 
@@ -36,7 +160,7 @@ class Position:
         return {"line": self.line, "character": self.character}
 
 
-@dataclass
+@dataclass(slots=True)
 class Range:
     """A range in a text document."""
 
@@ -46,8 +170,17 @@ class Range:
     def to_dict(self) -> dict[str, Any]:
         return {"start": self.start.to_dict(), "end": self.end.to_dict()}
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Range":
+        start = data["start"]
+        end = data["end"]
+        return cls(
+            start=Position(start["line"], start["character"]),
+            end=Position(end["line"], end["character"]),
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """A location in a text document."""
 
@@ -56,22 +189,10 @@ class Location:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Location":
-        return cls(
-            uri=data["uri"],
-            range=Range(
-                start=Position(
-                    line=data["range"]["start"]["line"],
-                    character=data["range"]["start"]["character"],
-                ),
-                end=Position(
-                    line=data["range"]["end"]["line"],
-                    character=data["range"]["end"]["character"],
-                ),
-            ),
-        )
+        return cls(uri=data["uri"], range=Range.from_dict(data["range"]))
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolInformation:
     """Information about a symbol in a document."""
 
@@ -90,7 +211,7 @@ class SymbolInformation:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class HoverResult:
     """Result of a hover request."""
 
@@ -98,7 +219,7 @@ class HoverResult:
     range: Range | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CallHierarchyItem:
     """An item in the call hierarchy."""
 
@@ -108,6 +229,8 @@ class CallHierarchyItem:
     range: Range
     selection_range: Range
     detail: str | None = None
+    # The item as the server sent it, returned verbatim in follow-up requests
+    raw: dict[str, Any] | None = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "CallHierarchyItem":
@@ -115,31 +238,27 @@ class CallHierarchyItem:
             name=data["name"],
             kind=data["kind"],
             uri=data["uri"],
-            range=Range(
-                start=Position(
-                    line=data["range"]["start"]["line"],
-                    character=data["range"]["start"]["character"],
-                ),
-                end=Position(
-                    line=data["range"]["end"]["line"],
-                    character=data["range"]["end"]["character"],
-                ),
-            ),
-            selection_range=Range(
-                start=Position(
-                    line=data["selectionRange"]["start"]["line"],
-                    character=data["selectionRange"]["start"]["character"],
-                ),
-                end=Position(
-                    line=data["selectionRange"]["end"]["line"],
-                    character=data["selectionRange"]["end"]["character"],
-                ),
-            ),
+            range=Range.from_dict(data["range"]),
+            selection_range=Range.from_dict(data["selectionRange"]),
             detail=data.get("detail"),
+            raw=data,
         )
 
+    def to_dict(self) -> dict[str, Any]:
+        # The server's own dict also keeps its opaque "data" field, which
+        # it needs back to resolve the item
+        if self.raw is not None:
+            return self.raw
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "uri": self.uri,
+            "range": self.range.to_dict(),
+            "selectionRange": self.selection_range.to_dict(),
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class CallHierarchyIncomingCall:
     """An incoming call in the call hierarchy."""
 
@@ -147,6 +266,18 @@ class CallHierarchyIncomingCall:
     from_ranges: list[Range]
 
 
+class _StderrDrain(asyncio.Protocol):
+    """Consumes a server's stderr, logging it at debug level."""
+
+    def __init__(self, server: str):
+        self.server = server
+
+    def data_received(self, data: bytes) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            text = data.decode("utf-8", errors="replace").rstrip()
+            logger.debug(f"{self.server} stderr: {text}")
+
+
 @dataclass
 class CodeClient:
     """Client for communicating with an LSP server."""
@@ -157,7 +288,20 @@ class CodeClient:
     workspace_root: str = ""
     _initialized: bool = field(default=False)
     _pending_responses: dict[int, asyncio.Future] = field(default_factory=dict)
+    _reader: asyncio.StreamReader | None = field(default=None)
+    _reader_transport: asyncio.ReadTransport | None = field(default=None)
     _reader_task: asyncio.Task | None = field(default=None)
+    _stderr_transport: asyncio.ReadTransport | None = field(default=None)
+    # Open documents mapped to their (mtime_ns, size) stamp and version
+    _open_docs: OrderedDict[str, tuple[tuple[int, int] | None, int]] = field(
+        default_factory=OrderedDict
+    )
+    _response_cache: OrderedDict[tuple, Any] = field(default_factory=OrderedDict)
+    _inflight: dict[tuple, asyncio.Future] = field(default_factory=dict)
+    # Raw workspace/symbol results per query, with the time they were fetched
+    _symbol_cache: OrderedDict[str, tuple[float, Any]] = field(
+        default_factory=OrderedDict
+    )
 
     def _get_server_command(self) -> list[str]:
         """Get the command to start the language server."""
@@ -182,6 +326,24 @@ class CodeClient:
                 stderr=subprocess.PIPE,
                 cwd=workspace_root,
             )
+            _grow_pipe(self.process.stdin.fileno())
+            _grow_pipe(self.process.stdout.fileno())
+
+            # Responses are read by a background task, so requests don't
+            # block the event loop and several can be in flight at once
+            loop = asyncio.get_running_loop()
+            self._reader = asyncio.StreamReader()
+            self._reader_transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(self._reader),
+                self.process.stdout,
+            )
+            self._reader_task = asyncio.create_task(self._read_loop())
+            # Nothing else reads stderr; left alone, a full pipe would block
+            # the server mid-write and stall every request
+            self._stderr_transport, _ = await loop.connect_read_pipe(
+                lambda: _StderrDrain(self.server_type.value),
+                self.process.stderr,
+            )
 
             # Initialize the server
             init_result = await self._initialize()
@@ -213,97 +375,154 @@ class CodeClient:
                 self.process.terminate()
                 self.process = None
                 self._initialized = False
+                self._open_docs.clear()
+                self._response_cache.clear()
+                self._symbol_cache.clear()
+                if self._reader_task:
+                    self._reader_task.cancel()
+                    self._reader_task = None
+                if self._reader_transport:
+                    self._reader_transport.close()
+                    self._reader_transport = None
+                if self._stderr_transport:
+                    self._stderr_transport.close()
+                    self._stderr_transport = None
+                self._reader = None
 
     def _send_message(self, message: dict[str, Any]) -> None:
         """Send a JSON-RPC message to the server."""
+        self._send_messages([message])
+
+    def _send_messages(self, messages: list[dict[str, Any]]) -> None:
+        """Send several JSON-RPC messages to the server in a single write."""
         if not self.process or not self.process.stdin:
+            self._open_docs.clear()
             raise RuntimeError("LSP server not running")
 
-        content = json.dumps(message)
-        header = f"Content-Length: {len(content)}\r\n\r\n"
-        full_message = header + content
-
-        self.process.stdin.write(full_message.encode("utf-8"))
-        self.process.stdin.flush()
-
-    def _read_message(self) -> dict[str, Any] | None:
+        frames = []
+        for message in messages:
+            # ASCII-only JSON, so the body is encoded without a UTF-8 pass
+            body = json.dumps(message, separators=(",", ":")).encode("ascii")
+            frames.append(b"Content-Length: %d\r\n\r\n" % len(body))
+            frames.append(body)
+
+        # Written straight to the pipe; every frame is sent at once anyway, so
+        # going through the BufferedWriter would only add a copy and a flush
+        fd = self.process.stdin.fileno()
+        data = memoryview(b"".join(frames))
+        try:
+            while data:
+                data = data[os.write(fd, data) :]
+        except OSError:
+            # Whatever document notifications were in the write may not have
+            # arrived, so stop assuming any document is open on the server
+            self._open_docs.clear()
+            raise
+
+    async def _read_message(self) -> dict[str, Any] | None:
         """Read a JSON-RPC message from the server."""
-        if not self.process or not self.process.stdout:
+        if not self._reader:
             return None
 
-        # Read headers
-        headers: dict[str, str] = {}
-        while True:
-            line = self.process.stdout.readline().decode("utf-8")
-            if line == "\r\n" or line == "\n":
-                break
-            if not line:
-                return None
-            if ":" in line:
-                key, value = line.split(":", 1)
-                headers[key.strip()] = value.strip()
-
-        # Read content
-        content_length = int(headers.get("Content-Length", 0))
+        # Read the header block in one go; only Content-Length matters
+        try:
+            header = await self._reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return None
+        start = header.find(_CONTENT_LENGTH)
+        if start == -1:
+            return None
+        end = header.index(b"\r\n", start)
+        content_length = int(header[start + len(_CONTENT_LENGTH) : end])
         if content_length == 0:
             return None
 
-        content = self.process.stdout.read(content_length).decode("utf-8")
+        try:
+            content = await self._reader.readexactly(content_length)
+        except asyncio.IncompleteReadError:
+            return None
+        # json.loads detects the UTF-8 encoding of bytes itself
         return json.loads(content)
 
-    async def _send_request(self, method: str, params: dict[str, Any]) -> Any:
-        """Send a request and wait for response."""
+    async def _read_loop(self) -> None:
+        """Dispatch server responses to the requests awaiting them."""
+        try:
+            while (message := await self._read_message()) is not None:
+                if "method" in message:
+                    continue  # Server requests and notifications are not handled
+                future = self._pending_responses.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        finally:
+            # The server is gone; fail whatever is still waiting on it
+            for future in self._pending_responses.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("LSP server exited"))
+            self._pending_responses.clear()
+
+    async def _send_request(
+        self,
+        method: str,
+        params: dict[str, Any],
+        notifications: list[dict[str, Any]] | None = None,
+    ) -> Any:
+        """Send a request and wait for response.
+
+        Any notifications given are sent ahead of the request in the same
+        write.
+
+        Raises:
+            TimeoutError: If the server doesn't answer within the method's
+                budget; the request is cancelled on the server
+        """
+        if not self._reader_task or self._reader_task.done():
+            # The notifications were never sent, so the documents they open
+            # aren't open on the server
+            self._open_docs.clear()
+            raise RuntimeError("LSP server not running")
+
         self.request_id += 1
+        request_id = self.request_id
         message = {
             "jsonrpc": "2.0",
-            "id": self.request_id,
+            "id": request_id,
             "method": method,
             "params": params,
         }
 
-        self._send_message(message)
-
-        # Wait for response (simple sync read for now)
-        while True:
-            response = self._read_message()
-            if response and response.get("id") == self.request_id:
-                if "error" in response:
-                    logger.error(f"LSP error: {response['error']}")
-                    return None
-                return response.get("result")
+        future = asyncio.get_running_loop().create_future()
+        self._pending_responses[request_id] = future
+        timeout = _REQUEST_TIMEOUTS.get(method, _DEFAULT_REQUEST_TIMEOUT)
+        try:
+            self._send_messages([*(notifications or ()), message])
+            response = await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            logger.warning(f"LSP request {method} timed out after {timeout}s")
+            if self.process:
+                self._send_notification("$/cancelRequest", {"id": request_id})
+            raise
+        finally:
+            self._pending_responses.pop(request_id, None)
+
+        if "error" in response:
+            logger.error(f"LSP error: {response['error']}")
+            return None
+        return response.get("result")
 
     def _send_notification(self, method: str, params: dict[str, Any]) -> None:
         """Send a notification (no response expected)."""
-        message = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params,
-        }
-        self._send_message(message)
+        self._send_message(_notification(method, params))
 
     async def _initialize(self) -> dict[str, Any] | None:
         """Send the initialize request."""
         params = {
             "processId": os.getpid(),
-            "rootUri": f"file://{self.workspace_root}",
+            "rootUri": _uri(self.workspace_root),
             "rootPath": self.workspace_root,
-            "capabilities": {
-                "textDocument": {
-                    "hover": {"contentFormat": ["markdown", "plaintext"]},
-                    "definition": {"linkSupport": True},
-                    "references": {},
-                    "documentSymbol": {
-                        "hierarchicalDocumentSymbolSupport": True,
-                    },
-                    "callHierarchy": {},
-                },
-                "workspace": {
-                    "symbol": {"symbolKind": {"valueSet": list(range(1, 27))}},
-                },
-            },
+            "capabilities": _CLIENT_CAPABILITIES,
             "workspaceFolders": [
                 {
-                    "uri": f"file://{self.workspace_root}",
+                    "uri": _uri(self.workspace_root),
                     "name": Path(self.workspace_root).name,
                 }
             ],
@@ -314,28 +533,98 @@ class CodeClient:
         """Send the initialized notification."""
         self._send_notification("initialized", {})
 
-    def _open_document(self, file_path: str, content: str, language_id: str) -> None:
-        """Notify the server that a document is open."""
-        uri = f"file://{file_path}"
-        self._send_notification(
-            "textDocument/didOpen",
-            {
-                "textDocument": {
-                    "uri": uri,
-                    "languageId": language_id,
-                    "version": 1,
-                    "text": content,
-                }
-            },
-        )
+    def _sync_document(
+        self, file_path: str
+    ) -> tuple[tuple[int, int] | None, list[dict[str, Any]]]:
+        """Work out the notifications that bring a document up to date.
 
-    def _close_document(self, file_path: str) -> None:
-        """Notify the server that a document is closed."""
-        uri = f"file://{file_path}"
-        self._send_notification(
-            "textDocument/didClose",
-            {"textDocument": {"uri": uri}},
-        )
+        Documents stay open across requests, so repeated lookups in one file
+        skip the read and the didOpen/didClose round. Files that can't be
+        stat'ed are resent every time. The caller must send the returned
+        notifications before anything else about the document.
+
+        Returns:
+            The (mtime_ns, size) stamp of the file, or None if unknown, and
+            the notifications to send
+        """
+        notifications: list[dict[str, Any]] = []
+        try:
+            st = os.stat(file_path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+
+        entry = self._open_docs.get(file_path)
+        if entry is not None and stamp is not None and entry[0] == stamp:
+            self._open_docs.move_to_end(file_path)
+            return stamp, notifications
+
+        content = Path(file_path).read_text()
+        if entry is None:
+            version = 1
+            notifications.append(_did_open(file_path, content, _language_id(file_path)))
+        else:
+            version = entry[1] + 1
+            notifications.append(_did_change(file_path, content, version))
+            for key in [k for k in self._response_cache if k[1] == file_path]:
+                del self._response_cache[key]
+            self._symbol_cache.clear()
+        self._open_docs[file_path] = (stamp, version)
+        self._open_docs.move_to_end(file_path)
+
+        while len(self._open_docs) > _MAX_OPEN_DOCUMENTS:
+            evicted, _ = self._open_docs.popitem(last=False)
+            notifications.append(_did_close(evicted))
+        return stamp, notifications
+
+    async def _document_request(
+        self, method: str, file_path: str, params: dict[str, Any], *key: Any
+    ) -> Any:
+        """Send a request about a document, answering repeats from the cache.
+
+        Results are cached per file stamp, so editing the file invalidates
+        them. Files without a stamp are never cached. Identical requests
+        made while one is in flight wait for its response instead of
+        sending their own.
+        """
+        stamp, notifications = self._sync_document(file_path)
+        cache_key = (method, file_path, stamp, *key)
+        if stamp is not None and cache_key in self._response_cache:
+            # _open_docs already counts these as sent, so they must go out
+            # even though the response doesn't need the server
+            if notifications:
+                self._send_messages(notifications)
+            self._response_cache.move_to_end(cache_key)
+            return self._response_cache[cache_key]
+
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            if notifications:
+                self._send_messages(notifications)
+            # Shielded so a cancelled waiter doesn't fail it for the others
+            return await asyncio.shield(pending)
+
+        # The request is written before the first await, so it goes out in
+        # call order with the document notifications fused in front of it
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await self._send_request(method, params, notifications)
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                e = RuntimeError("LSP request cancelled")
+            future.set_exception(e)
+            future.exception()  # Retrieved, so it isn't logged without waiters
+            raise
+        finally:
+            del self._inflight[cache_key]
+        future.set_result(result)
+
+        if stamp is not None:
+            self._response_cache[cache_key] = result
+            if len(self._response_cache) > _MAX_CACHED_RESPONSES:
+                self._response_cache.popitem(last=False)
+        return result
 
     async def go_to_definition(
         self, file_path: str, line: int, character: int
@@ -353,23 +642,19 @@ class CodeClient:
         if not self._initialized:
             return []
 
-        # Open the document first
         try:
-            content = Path(file_path).read_text()
-            lang_id = self._get_language_id(file_path)
-            self._open_document(file_path, content, lang_id)
-
-            uri = f"file://{file_path}"
-            result = await self._send_request(
+            uri = _uri(file_path)
+            result = await self._document_request(
                 "textDocument/definition",
+                file_path,
                 {
                     "textDocument": {"uri": uri},
                     "position": {"line": line, "character": character},
                 },
+                line,
+                character,
             )
 
-            self._close_document(file_path)
-
             if not result:
                 return []
 
@@ -406,22 +691,20 @@ class CodeClient:
             return []
 
         try:
-            content = Path(file_path).read_text()
-            lang_id = self._get_language_id(file_path)
-            self._open_document(file_path, content, lang_id)
-
-            uri = f"file://{file_path}"
-            result = await self._send_request(
+            uri = _uri(file_path)
+            result = await self._document_request(
                 "textDocument/references",
+                file_path,
                 {
                     "textDocument": {"uri": uri},
                     "position": {"line": line, "character": character},
                     "context": {"includeDeclaration": include_declaration},
                 },
+                line,
+                character,
+                include_declaration,
             )
 
-            self._close_document(file_path)
-
             if not result:
                 return []
 
@@ -448,21 +731,18 @@ class CodeClient:
             return None
 
         try:
-            content = Path(file_path).read_text()
-            lang_id = self._get_language_id(file_path)
-            self._open_document(file_path, content, lang_id)
-
-            uri = f"file://{file_path}"
-            result = await self._send_request(
+            uri = _uri(file_path)
+            result = await self._document_request(
                 "textDocument/hover",
+                file_path,
                 {
                     "textDocument": {"uri": uri},
                     "position": {"line": line, "character": character},
                 },
+                line,
+                character,
             )
 
-            self._close_document(file_path)
-
             if not result or "contents" not in result:
                 return None
 
@@ -481,11 +761,7 @@ class CodeClient:
 
             hover_range = None
             if "range" in result:
-                r = result["range"]
-                hover_range = Range(
-                    start=Position(r["start"]["line"], r["start"]["character"]),
-                    end=Position(r["end"]["line"], r["end"]["character"]),
-                )
+                hover_range = Range.from_dict(result["range"])
 
             return HoverResult(contents=text, range=hover_range)
 
@@ -506,71 +782,41 @@ class CodeClient:
             return []
 
         try:
-            content = Path(file_path).read_text()
-            lang_id = self._get_language_id(file_path)
-            self._open_document(file_path, content, lang_id)
-
-            uri = f"file://{file_path}"
-            result = await self._send_request(
+            uri = _uri(file_path)
+            result = await self._document_request(
                 "textDocument/documentSymbol",
+                file_path,
                 {"textDocument": {"uri": uri}},
             )
 
-            self._close_document(file_path)
-
             if not result:
                 return []
 
             # Result can be DocumentSymbol[] or SymbolInformation[]
             symbols = []
-            for item in result:
+            # DocumentSymbols nest to any depth; walk them in document order
+            stack: list[tuple[dict[str, Any], str | None]] = [
+                (item, None) for item in reversed(result)
+            ]
+            while stack:
+                item, container = stack.pop()
                 if "location" in item:
                     # SymbolInformation format
                     symbols.append(SymbolInformation.from_dict(item))
                 elif "range" in item:
                     # DocumentSymbol format - convert to SymbolInformation
+                    name = item["name"]
                     symbols.append(
                         SymbolInformation(
-                            name=item["name"],
+                            name=name,
                             kind=item["kind"],
-                            location=Location(
-                                uri=uri,
-                                range=Range(
-                                    start=Position(
-                                        item["range"]["start"]["line"],
-                                        item["range"]["start"]["character"],
-                                    ),
-                                    end=Position(
-                                        item["range"]["end"]["line"],
-                                        item["range"]["end"]["character"],
-                                    ),
-                                ),
-                            ),
+                            location=Location(uri, Range.from_dict(item["range"])),
+                            container_name=container,
                         )
                     )
-                    # Recursively add children if present
-                    if "children" in item:
-                        for child in item["children"]:
-                            symbols.append(
-                                SymbolInformation(
-                                    name=child["name"],
-                                    kind=child["kind"],
-                                    location=Location(
-                                        uri=uri,
-                                        range=Range(
-                                            start=Position(
-                                                child["range"]["start"]["line"],
-                                                child["range"]["start"]["character"],
-                                            ),
-                                            end=Position(
-                                                child["range"]["end"]["line"],
-                                                child["range"]["end"]["character"],
-                                            ),
-                                        ),
-                                    ),
-                                    container_name=item["name"],
-                                )
-                            )
+                    children = item.get("children")
+                    if children:
+                        stack.extend((child, name) for child in reversed(children))
             return symbols
 
         except Exception as e:
@@ -590,10 +836,25 @@ class CodeClient:
             return []
 
         try:
-            result = await self._send_request(
-                "workspace/symbol",
-                {"query": query},
-            )
+            # Agents repeat searches while exploring; the workspace changes
+            # little in between, so recent answers are reused for a while
+            now = time.monotonic()
+            cached = self._symbol_cache.get(query)
+            if cached is not None and now - cached[0] < _WORKSPACE_SYMBOL_TTL:
+                self._symbol_cache.move_to_end(query)
+                result = cached[1]
+            else:
+                result = await self._send_request(
+                    "workspace/symbol",
+                    {"query": query},
+                )
+                # Empty answers aren't kept: a server still indexing gives
+                # them, and caching one would hide the real results
+                if result:
+                    self._symbol_cache[query] = (now, result)
+                    self._symbol_cache.move_to_end(query)
+                    if len(self._symbol_cache) > _MAX_CACHED_SYMBOL_QUERIES:
+                        self._symbol_cache.popitem(last=False)
 
             if not result:
                 return []
@@ -621,21 +882,18 @@ class CodeClient:
             return []
 
         try:
-            content = Path(file_path).read_text()
-            lang_id = self._get_language_id(file_path)
-            self._open_document(file_path, content, lang_id)
+            _, notifications = self._sync_document(file_path)
 
-            uri = f"file://{file_path}"
+            uri = _uri(file_path)
             result = await self._send_request(
                 "textDocument/prepareCallHierarchy",
                 {
                     "textDocument": {"uri": uri},
                     "position": {"line": line, "character": character},
                 },
+                notifications,
             )
 
-            self._close_document(file_path)
-
             if not result:
                 return []
 
@@ -662,15 +920,7 @@ class CodeClient:
         try:
             result = await self._send_request(
                 "callHierarchy/incomingCalls",
-                {
-                    "item": {
-                        "name": item.name,
-                        "kind": item.kind,
-                        "uri": item.uri,
-                        "range": item.range.to_dict(),
-                        "selectionRange": item.selection_range.to_dict(),
-                    }
-                },
+                {"item": item.to_dict()},
             )
 
             if not result:
@@ -679,13 +929,7 @@ class CodeClient:
             calls = []
             for call in result:
                 from_item = CallHierarchyItem.from_dict(call["from"])
-                from_ranges = [
-                    Range(
-                        start=Position(r["start"]["line"], r["start"]["character"]),
-                        end=Position(r["end"]["line"], r["end"]["character"]),
-                    )
-                    for r in call.get("fromRanges", [])
-                ]
+                from_ranges = [Range.from_dict(r) for r in call.get("fromRanges", [])]
                 calls.append(
                     CallHierarchyIncomingCall(
                         from_item=from_item, from_ranges=from_ranges
@@ -697,19 +941,6 @@ class CodeClient:
             logger.error(f"Error in incoming_calls: {e}")
             return []
 
-    def _get_language_id(self, file_path: str) -> str:
-        """Get the language ID for a file."""
-        ext = Path(file_path).suffix.lower()
-        mapping = {
-            ".py": "python",
-            ".ts": "typescript",
-            ".tsx": "typescriptreact",
-            ".js": "javascript",
-            ".jsx": "javascriptreact",
-            ".json": "json",
-        }
-        return mapping.get(ext, "plaintext")
-
 
 class CodeManager:
     """Manager for multiple LSP clients."""
@@ -718,6 +949,7 @@ class CodeManager:
         self.workspace_root = workspace_root
         self._clients: dict[LanguageServer, CodeClient] = {}
         self._initialized = False
+        self._ready = asyncio.Event()
 
     async def initialize(self) -> dict[str, bool]:
         """Initialize all available LSP servers.
@@ -727,29 +959,46 @@ class CodeManager:
         """
         results = {}
 
-        # Try to start TypeScript server
-        ts_client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
-        ts_success = await ts_client.start(self.workspace_root)
-        results["typescript"] = ts_success
-        if ts_success:
-            self._clients[LanguageServer.TYPESCRIPT] = ts_client
-
-        # Try to start Python server
-        py_client = CodeClient(server_type=LanguageServer.PYTHON)
-        py_success = await py_client.start(self.workspace_root)
-        results["python"] = py_success
-        if py_success:
-            self._clients[LanguageServer.PYTHON] = py_client
+        # Start the TypeScript and Python servers concurrently
+        clients = [
+            CodeClient(server_type=LanguageServer.TYPESCRIPT),
+            CodeClient(server_type=LanguageServer.PYTHON),
+        ]
+        outcomes = await asyncio.gather(
+            *(client.start(self.workspace_root) for client in clients),
+            return_exceptions=True,
+        )
+        for client, outcome in zip(clients, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Failed to start LSP server: {outcome}")
+                outcome = False
+            results[client.server_type.value] = outcome
+            if outcome:
+                self._clients[client.server_type] = client
 
         self._initialized = True
+        self._ready.set()
         return results
 
+    async def wait_ready(self, timeout: float = _READY_TIMEOUT) -> bool:
+        """Wait for a concurrent initialize() to finish.
+
+        Returns:
+            Whether the manager is initialized
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except TimeoutError:
+            logger.warning("Timed out waiting for LSP servers to start")
+        return self._initialized
+
     async def shutdown(self) -> None:
         """Shutdown all LSP clients."""
         for client in self._clients.values():
             await client.stop()
         self._clients.clear()
         self._initialized = False
+        self._ready.clear()
 
     def get_client(self, file_path: str) -> CodeClient | None:
         """Get the appropriate LSP client for a file.
@@ -775,33 +1024,91 @@ class CodeManager:
         return [server.value for server in self._clients.keys()]
 
 
-# Global LSP manager instance (lazily initialized)
-_code_manager: CodeManager | None = None
+# LSP managers per (event loop, workspace root) (lazily initialized), least
+# recently used first, each with the time it was last handed out. A manager's
+# clients are bound to the loop that started them, so callers on another loop
+# (e.g. the sync tool wrappers) get their own managers.
+_CodeManagerKey = tuple[asyncio.AbstractEventLoop, str]
+_code_managers: OrderedDict[_CodeManagerKey, tuple[CodeManager, float]] = OrderedDict()
+_MAX_CODE_MANAGERS = 4
+_CODE_MANAGER_IDLE_SECONDS = 600.0
 
 
 async def get_code_manager(workspace_root: str | None = None) -> CodeManager:
-    """Get or create the global LSP manager.
+    """Get or create the LSP manager for a workspace.
+
+    Managers are kept per workspace root and event loop, so switching between
+    workspaces doesn't restart the servers. Each call also shuts down any
+    other managers idle for 10 minutes, or beyond the 4 most recently used;
+    there is no background timer, so idle servers linger until the next call.
 
     Args:
-        workspace_root: Workspace root path (required for first call)
+        workspace_root: Workspace root path (defaults to the most recently
+            used workspace on this event loop; required for the first call)
 
     Returns:
         The LSP manager instance
     """
-    global _code_manager
-
-    if _code_manager is None:
-        if workspace_root is None:
+    loop = asyncio.get_running_loop()
+    if workspace_root is None:
+        roots = [root for owner, root in reversed(_code_managers) if owner is loop]
+        if not roots:
             raise ValueError("workspace_root is required for first initialization")
-        _code_manager = CodeManager(workspace_root)
-        await _code_manager.initialize()
-
-    return _code_manager
+        workspace_root = roots[0]
+
+    key = (loop, workspace_root)
+    now = time.monotonic()
+    entry = _code_managers.get(key)
+    if entry is None:
+        manager = CodeManager(workspace_root)
+        _code_managers[key] = (manager, now)
+        await _evict_code_managers(now, keep=key)
+        await manager.initialize()
+        return manager
+
+    manager = entry[0]
+    _code_managers[key] = (manager, now)
+    _code_managers.move_to_end(key)
+    await _evict_code_managers(now, keep=key)
+    if not manager._initialized:
+        # Another caller is still starting the servers; wait for them rather
+        # than returning a manager with no clients yet
+        await manager.wait_ready()
+    return manager
+
+
+async def _evict_code_managers(now: float, keep: _CodeManagerKey) -> None:
+    """Shut down idle managers and any beyond the pool size, except ``keep``."""
+    while _code_managers:
+        key, (manager, last_used) = next(iter(_code_managers.items()))
+        if key == keep:
+            break
+        idle = now - last_used > _CODE_MANAGER_IDLE_SECONDS
+        if not idle and len(_code_managers) <= _MAX_CODE_MANAGERS:
+            break
+        del _code_managers[key]
+        logger.info(f"Shutting down LSP servers for {key[1]}")
+        await _shutdown_on_loop(key[0], manager)
+
+
+async def _shutdown_on_loop(
+    loop: asyncio.AbstractEventLoop, manager: CodeManager
+) -> None:
+    """Shut down a manager on the event loop that owns its clients."""
+    if loop is asyncio.get_running_loop():
+        await manager.shutdown()
+    elif loop.is_running():
+        future = asyncio.run_coroutine_threadsafe(manager.shutdown(), loop)
+        await asyncio.wrap_future(future)
+    else:
+        # The owning loop is gone, and its transports with it
+        logger.warning(
+            f"Dropping LSP manager for {manager.workspace_root} from a stopped loop"
+        )
 
 
 async def shutdown_code_manager() -> None:
-    """Shutdown the global LSP manager."""
-    global _code_manager
-    if _code_manager:
-        await _code_manager.shutdown()
-        _code_manager = None
+    """Shutdown all LSP managers."""
+    while _code_managers:
+        (loop, _), (manager, _) = _code_managers.popitem(last=False)
+        await _shutdown_on_loop(loop, manager)
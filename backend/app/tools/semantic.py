@@ -6,8 +6,12 @@ of code structure, types, and relationships.
 """
 
 import asyncio
+import os
 import re
+import threading
+from functools import lru_cache
 from pathlib import Path
+from typing import Final
 
 from pydantic import BaseModel, Field
 
@@ -105,35 +109,37 @@ class CallHierarchyResult(BaseModel):
     error: str | None = Field(default=None, description="Error message if failed")
 
 
-# Symbol kind mapping from LSP spec
-SYMBOL_KINDS = {
-    1: "File",
-    2: "Module",
-    3: "Namespace",
-    4: "Package",
-    5: "Class",
-    6: "Method",
-    7: "Property",
-    8: "Field",
-    9: "Constructor",
-    10: "Enum",
-    11: "Interface",
-    12: "Function",
-    13: "Variable",
-    14: "Constant",
-    15: "String",
-    16: "Number",
-    17: "Boolean",
-    18: "Array",
-    19: "Object",
-    20: "Key",
-    21: "Null",
-    22: "EnumMember",
-    23: "Struct",
-    24: "Event",
-    25: "Operator",
-    26: "TypeParameter",
-}
+# Symbol kind names from the LSP spec, indexed by kind number. Kinds start
+# at 1, so slot 0 is a placeholder.
+SYMBOL_KINDS: Final[tuple[str | None, ...]] = (
+    None,
+    "File",
+    "Module",
+    "Namespace",
+    "Package",
+    "Class",
+    "Method",
+    "Property",
+    "Field",
+    "Constructor",
+    "Enum",
+    "Interface",
+    "Function",
+    "Variable",
+    "Constant",
+    "String",
+    "Number",
+    "Boolean",
+    "Array",
+    "Object",
+    "Key",
+    "Null",
+    "EnumMember",
+    "Struct",
+    "Event",
+    "Operator",
+    "TypeParameter",
+)
 
 
 def _uri_to_path(uri: str, root: Path) -> str:
@@ -147,15 +153,84 @@ def _uri_to_path(uri: str, root: Path) -> str:
     return uri
 
 
-def _get_line_content(file_path: Path, line_num: int) -> str:
-    """Get the content of a specific line from a file."""
-    try:
-        lines = file_path.read_text().splitlines()
-        if 0 <= line_num < len(lines):
-            return lines[line_num].strip()
-    except Exception:
-        pass
-    return ""
+@lru_cache(maxsize=256)
+def _read_text(path: str, stamp: tuple[int, int]) -> str:
+    """Read a file's text, cached until its (mtime_ns, size) stamp changes."""
+    return Path(path).read_text()
+
+
+@lru_cache(maxsize=256)
+def _read_lines(path: str, stamp: tuple[int, int]) -> tuple[str, ...]:
+    """Split a file into lines, cached like _read_text."""
+    return tuple(_read_text(path, stamp).splitlines())
+
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    """Get the (mtime_ns, size) stamp that keys the file caches."""
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _symbol_pattern(symbol_name: str) -> re.Pattern[str]:
+    """Compile the whole-word pattern for a symbol name."""
+    return re.compile(rf"\b{re.escape(symbol_name)}\b")
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether a character is part of a word, as regex boundaries see it."""
+    return char.isalnum() or char == "_"
+
+
+def _find_word(content: str, symbol_name: str) -> int:
+    """Find the first whole-word occurrence of a symbol name.
+
+    ASCII identifiers, which is nearly every lookup, are found with str.find
+    and a check of the neighbouring characters. Other names fall back to the
+    regex. Returns the offset, or -1 if the name isn't found.
+    """
+    if not (symbol_name.isascii() and symbol_name.isidentifier()):
+        match = _symbol_pattern(symbol_name).search(content)
+        return match.start() if match else -1
+
+    size = len(symbol_name)
+    start = content.find(symbol_name)
+    while start != -1:
+        end = start + size
+        if not (start and _is_word_char(content[start - 1])) and not (
+            end < len(content) and _is_word_char(content[end])
+        ):
+            return start
+        start = content.find(symbol_name, start + 1)
+    return -1
+
+
+def _location_previews(locations: list, root: Path) -> list[tuple[str, str]]:
+    """Get the relative path and source line for each LSP location.
+
+    Locations are grouped by file, so each file is resolved and read once no
+    matter how many locations point into it.
+    """
+    files: dict[str, tuple[str, tuple[str, ...]]] = {}
+    previews = []
+    for loc in locations:
+        entry = files.get(loc.uri)
+        if entry is None:
+            rel_path = _uri_to_path(loc.uri, root)
+            loc_full_path = (
+                Path(rel_path) if os.path.isabs(rel_path) else root / rel_path
+            )
+            try:
+                lines = _read_lines(str(loc_full_path), _file_stamp(loc_full_path))
+            except Exception:
+                lines = ()
+            entry = files[loc.uri] = (rel_path, lines)
+
+        rel_path, lines = entry
+        line_num = loc.range.start.line
+        preview = lines[line_num].strip() if 0 <= line_num < len(lines) else ""
+        previews.append((rel_path, preview))
+    return previews
 
 
 def _find_symbol_in_file(file_path: str, symbol_name: str) -> tuple[int, int] | None:
@@ -167,20 +242,15 @@ def _find_symbol_in_file(file_path: str, symbol_name: str) -> tuple[int, int] |
     root = Path(settings.codebase_root)
     full_path = root / file_path
 
-    if not full_path.exists():
-        return None
-
     try:
-        content = full_path.read_text()
-        lines = content.splitlines()
-
-        # Pattern to find the symbol as a word
-        pattern = re.compile(rf"\b{re.escape(symbol_name)}\b")
-
-        for line_num, line in enumerate(lines):
-            match = pattern.search(line)
-            if match:
-                return (line_num, match.start())
+        # A missing file fails the stat below and returns None
+        content = _read_text(str(full_path), _file_stamp(full_path))
+
+        # One search over the whole file; the position comes from the offset
+        start = _find_word(content, symbol_name)
+        if start != -1:
+            line_start = content.rfind("\n", 0, start) + 1
+            return (content.count("\n", 0, start), start - line_start)
     except Exception:
         pass
 
@@ -214,7 +284,7 @@ async def go_to_definition(
     full_path = root / file_path
 
     # Validate path
-    if not full_path.exists():
+    if not os.path.exists(full_path):
         return DefinitionResult(
             symbol=symbol_name,
             source_file=file_path,
@@ -226,7 +296,7 @@ async def go_to_definition(
 
     # If line/character not provided, find the symbol in the file
     if line is None or character is None:
-        pos = _find_symbol_in_file(file_path, symbol_name)
+        pos = await asyncio.to_thread(_find_symbol_in_file, file_path, symbol_name)
         if pos is None:
             return DefinitionResult(
                 symbol=symbol_name,
@@ -249,25 +319,20 @@ async def go_to_definition(
                 source_line=line,
                 definitions=[],
                 success=False,
-                error=f"No LSP server available for {Path(file_path).suffix} files",
+                error=f"No LSP server available for {full_path.suffix} files",
             )
 
         # LSP uses 0-indexed positions
         locations = await client.go_to_definition(str(full_path), line - 1, character)
 
+        # Fields are built here from trusted LSP values; skip validation
         definitions = []
-        for loc in locations:
-            rel_path = _uri_to_path(loc.uri, root)
+        previews = _location_previews(locations, root)
+        for loc, (rel_path, preview) in zip(locations, previews, strict=True):
             def_line = loc.range.start.line + 1  # Convert to 1-indexed
 
-            # Get preview
-            loc_full_path = (
-                root / rel_path if not Path(rel_path).is_absolute() else Path(rel_path)
-            )
-            preview = _get_line_content(loc_full_path, loc.range.start.line)
-
             definitions.append(
-                DefinitionLocation(
+                DefinitionLocation.model_construct(
                     file=rel_path,
                     line=def_line,
                     character=loc.range.start.character,
@@ -321,7 +386,7 @@ async def find_all_references(
     full_path = root / file_path
 
     # Validate path
-    if not full_path.exists():
+    if not os.path.exists(full_path):
         return ReferencesResult(
             symbol=symbol_name,
             source_file=file_path,
@@ -333,7 +398,7 @@ async def find_all_references(
 
     # If line/character not provided, find the symbol in the file
     if line is None or character is None:
-        pos = _find_symbol_in_file(file_path, symbol_name)
+        pos = await asyncio.to_thread(_find_symbol_in_file, file_path, symbol_name)
         if pos is None:
             return ReferencesResult(
                 symbol=symbol_name,
@@ -356,25 +421,22 @@ async def find_all_references(
                 references=[],
                 total_found=0,
                 success=False,
-                error=f"No LSP server available for {Path(file_path).suffix} files",
+                error=f"No LSP server available for {full_path.suffix} files",
             )
 
         # LSP uses 0-indexed positions
         locations = await client.find_references(str(full_path), line - 1, character)
 
+        # Fields are built here from trusted LSP values; skip validation
+        # Only the returned page needs previews; total_found counts them all
+        shown = locations[:100]
         references = []
-        for loc in locations:
-            rel_path = _uri_to_path(loc.uri, root)
+        previews = _location_previews(shown, root)
+        for loc, (rel_path, context) in zip(shown, previews, strict=True):
             ref_line = loc.range.start.line + 1
 
-            # Get context
-            loc_full_path = (
-                root / rel_path if not Path(rel_path).is_absolute() else Path(rel_path)
-            )
-            context = _get_line_content(loc_full_path, loc.range.start.line)
-
             references.append(
-                ReferenceLocation(
+                ReferenceLocation.model_construct(
                     file=rel_path,
                     line=ref_line,
                     character=loc.range.start.character,
@@ -385,7 +447,7 @@ async def find_all_references(
         return ReferencesResult(
             symbol=symbol_name,
             source_file=file_path,
-            references=references[:100],  # Limit results
+            references=references,
             total_found=len(locations),
             success=True,
         )
@@ -430,7 +492,7 @@ async def get_type_info(
     full_path = root / file_path
 
     # Validate path
-    if not full_path.exists():
+    if not os.path.exists(full_path):
         return TypeInfo(
             symbol=symbol_name,
             file=file_path,
@@ -442,7 +504,7 @@ async def get_type_info(
 
     # If line/character not provided, find the symbol in the file
     if line is None or character is None:
-        pos = _find_symbol_in_file(file_path, symbol_name)
+        pos = await asyncio.to_thread(_find_symbol_in_file, file_path, symbol_name)
         if pos is None:
             return TypeInfo(
                 symbol=symbol_name,
@@ -465,7 +527,7 @@ async def get_type_info(
                 line=line,
                 type_signature="",
                 success=False,
-                error=f"No LSP server available for {Path(file_path).suffix} files",
+                error=f"No LSP server available for {full_path.suffix} files",
             )
 
         # LSP uses 0-indexed positions
@@ -520,7 +582,7 @@ async def get_document_symbols(file_path: str) -> DocumentSymbolsResult:
     full_path = root / file_path
 
     # Validate path
-    if not full_path.exists():
+    if not os.path.exists(full_path):
         return DocumentSymbolsResult(
             file=file_path,
             symbols=[],
@@ -537,16 +599,22 @@ async def get_document_symbols(file_path: str) -> DocumentSymbolsResult:
                 file=file_path,
                 symbols=[],
                 success=False,
-                error=f"No LSP server available for {Path(file_path).suffix} files",
+                error=f"No LSP server available for {full_path.suffix} files",
             )
 
         lsp_symbols = await client.document_symbols(str(full_path))
 
+        # Fields are built here from trusted LSP values; skip validation
         symbols = []
         for sym in lsp_symbols:
-            kind_name = SYMBOL_KINDS.get(sym.kind, f"Unknown({sym.kind})")
+            kind = sym.kind
+            kind_name = (
+                SYMBOL_KINDS[kind]
+                if 0 < kind < len(SYMBOL_KINDS)
+                else f"Unknown({kind})"
+            )
             symbols.append(
-                DocumentSymbol(
+                DocumentSymbol.model_construct(
                     name=sym.name,
                     kind=kind_name,
                     line=sym.location.range.start.line + 1,  # Convert to 1-indexed
@@ -597,7 +665,7 @@ async def get_callers(
     full_path = root / file_path
 
     # Validate path
-    if not full_path.exists():
+    if not os.path.exists(full_path):
         return CallHierarchyResult(
             function_name=function_name,
             file=file_path,
@@ -608,7 +676,7 @@ async def get_callers(
 
     # If line/character not provided, find the symbol in the file
     if line is None or character is None:
-        pos = _find_symbol_in_file(file_path, function_name)
+        pos = await asyncio.to_thread(_find_symbol_in_file, file_path, function_name)
         if pos is None:
             return CallHierarchyResult(
                 function_name=function_name,
@@ -629,7 +697,7 @@ async def get_callers(
                 file=file_path,
                 callers=[],
                 success=False,
-                error=f"No LSP server available for {Path(file_path).suffix} files",
+                error=f"No LSP server available for {full_path.suffix} files",
             )
 
         # First, prepare the call hierarchy
@@ -647,11 +715,12 @@ async def get_callers(
         # Get incoming calls for the first item
         incoming = await client.incoming_calls(items[0])
 
+        # Fields are built here from trusted LSP values; skip validation
         callers = []
         for call in incoming:
             rel_path = _uri_to_path(call.from_item.uri, root)
             callers.append(
-                CallerInfo(
+                CallerInfo.model_construct(
                     name=call.from_item.name,
                     file=rel_path,
                     line=call.from_item.range.start.line + 1,
@@ -678,6 +747,25 @@ async def get_callers(
 # Synchronous wrappers for pydantic-ai tools
 # pydantic-ai handles async tools, but we provide sync wrappers for flexibility
 
+_sync_loop: asyncio.AbstractEventLoop | None = None
+_sync_loop_lock = threading.Lock()
+
+
+def _run_sync(coro):
+    """Run a tool coroutine on a persistent background event loop.
+
+    Language servers started from the sync wrappers stay bound to this loop,
+    so later calls reuse them instead of starting new ones.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_sync_loop.run_forever, name="semantic-sync", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
 
 def go_to_definition_sync(
     file_path: str,
@@ -686,9 +774,7 @@ def go_to_definition_sync(
     character: int | None = None,
 ) -> DefinitionResult:
     """Synchronous wrapper for go_to_definition."""
-    return asyncio.get_event_loop().run_until_complete(
-        go_to_definition(file_path, symbol_name, line, character)
-    )
+    return _run_sync(go_to_definition(file_path, symbol_name, line, character))
 
 
 def find_all_references_sync(
@@ -698,9 +784,7 @@ def find_all_references_sync(
     character: int | None = None,
 ) -> ReferencesResult:
     """Synchronous wrapper for find_all_references."""
-    return asyncio.get_event_loop().run_until_complete(
-        find_all_references(file_path, symbol_name, line, character)
-    )
+    return _run_sync(find_all_references(file_path, symbol_name, line, character))
 
 
 def get_type_info_sync(
@@ -710,14 +794,12 @@ def get_type_info_sync(
     character: int | None = None,
 ) -> TypeInfo:
     """Synchronous wrapper for get_type_info."""
-    return asyncio.get_event_loop().run_until_complete(
-        get_type_info(file_path, symbol_name, line, character)
-    )
+    return _run_sync(get_type_info(file_path, symbol_name, line, character))
 
 
 def get_document_symbols_sync(file_path: str) -> DocumentSymbolsResult:
     """Synchronous wrapper for get_document_symbols."""
-    return asyncio.get_event_loop().run_until_complete(get_document_symbols(file_path))
+    return _run_sync(get_document_symbols(file_path))
 
 
 def get_callers_sync(
@@ -727,6 +809,4 @@ def get_callers_sync(
     character: int | None = None,
 ) -> CallHierarchyResult:
     """Synchronous wrapper for get_callers."""
-    return asyncio.get_event_loop().run_until_complete(
-        get_callers(file_path, function_name, line, character)
-    )
+    return _run_sync(get_callers(file_path, function_name, line, character))
@@ -1,5 +1,6 @@
 """Tests for architecture analysis tools."""
 
+import ast
 import os
 from pathlib import Path
 from unittest.mock import patch
@@ -18,6 +19,7 @@ from app.tools.architecture import (
     DataFlowResult,
     DataFlowStep,
     _should_skip_path,
+    _iter_source_files,
     _infer_purpose,
     _get_main_exports_python,
     _extract_python_imports,
@@ -66,6 +68,10 @@ class TestShouldSkipPath:
     def test_skips_dist(self):
         assert _should_skip_path(Path("project/dist/bundle.js")) is True
 
+    def test_skips_tool_caches(self):
+        assert _should_skip_path(Path("project/.pytest_cache/v/cache")) is True
+        assert _should_skip_path(Path("project/.mypy_cache/3.12/app.json")) is True
+
     def test_allows_src(self):
         assert _should_skip_path(Path("project/src/main.py")) is False
 
@@ -73,6 +79,37 @@ class TestShouldSkipPath:
         assert _should_skip_path(Path("project/app/module.ts")) is False
 
 
+class TestIterSourceFiles:
+    """Tests for the pruning directory walker."""
+
+    def test_matches_filtered_rglob(self, tmp_path):
+        for rel in [
+            "a.py",
+            "src/b.ts",
+            "src/nested/c.py",
+            "node_modules/pkg/index.js",
+            ".git/config",
+            "src/__pycache__/b.pyc",
+        ]:
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("")
+
+        expected = [
+            p
+            for p in tmp_path.rglob("*")
+            if p.is_file() and not _should_skip_path(p.relative_to(tmp_path))
+        ]
+        assert list(_iter_source_files(tmp_path)) == expected
+        assert len(expected) == 3
+
+    def test_does_not_list_skipped_directories(self, tmp_path):
+        (tmp_path / "node_modules").mkdir()
+        with patch("app.tools.architecture.os.scandir", wraps=os.scandir) as scandir:
+            assert list(_iter_source_files(tmp_path)) == []
+        assert scandir.call_count == 1
+
+
 class TestInferPurpose:
     """Tests for the _infer_purpose helper."""
 
@@ -99,6 +136,18 @@ class TestInferPurpose:
     def test_infers_styles_from_files(self):
         assert _infer_purpose("unknown", ["main.css", "theme.scss"]) == "Stylesheets"
 
+    def test_infers_data_files(self):
+        assert (
+            _infer_purpose("unknown", ["data.json", "a.py"])
+            == "Configuration or data files"
+        )
+
+    def test_stylesheets_take_precedence_over_json(self):
+        assert _infer_purpose("unknown", ["data.json", "main.css"]) == "Stylesheets"
+
+    def test_partial_name_match(self):
+        assert _infer_purpose("my-hooks", []) == "React hooks"
+
     def test_default_purpose(self):
         assert _infer_purpose("unknown", ["file.py"]) == "Application module"
 
@@ -125,6 +174,14 @@ class TestGetMainExportsPython:
             exports = _get_main_exports_python(config_path)
             assert len(exports) <= 10
 
+    def test_reparses_after_change(self, tmp_path):
+        module = tmp_path / "mod.py"
+        module.write_text("def first():\n    pass\n")
+        assert _get_main_exports_python(module) == ["def first"]
+
+        module.write_text("def first():\n    pass\n\n\ndef second():\n    pass\n")
+        assert _get_main_exports_python(module) == ["def first", "def second"]
+
 
 class TestExtractPythonImports:
     """Tests for Python import extraction."""
@@ -160,6 +217,41 @@ class TestExtractPydanticSchemas:
                 assert len(settings_schema.fields) > 0
 
 
+class TestPythonSummary:
+    """Tests for the shared single-parse Python extraction."""
+
+    def test_extractors_share_one_parse(self, tmp_path):
+        module = tmp_path / "models.py"
+        module.write_text(
+            "import os\n"
+            "from pydantic import BaseModel\n\n\n"
+            "class Item(BaseModel):\n"
+            "    name: str\n"
+            "    size: int = 0\n"
+        )
+
+        with patch("app.tools.architecture.ast.parse", wraps=ast.parse) as parse:
+            exports = _get_main_exports_python(module)
+            imports = _extract_python_imports(module, tmp_path)
+            schemas = _extract_pydantic_schemas(module, tmp_path)
+
+        assert parse.call_count == 1
+        assert exports == ["class Item"]
+        assert imports == [
+            ("models.py", "os", "namespace"),
+            ("models.py", "pydantic", "named"),
+        ]
+        assert [(f.name, f.required) for f in schemas[0].fields] == [
+            ("name", True),
+            ("size", False),
+        ]
+
+    def test_file_outside_root(self, tmp_path):
+        module = tmp_path / "mod.py"
+        module.write_text("import os\n")
+        assert _extract_python_imports(module, tmp_path / "other") == []
+
+
 # ============================================================================
 # Schema Model Tests
 # ============================================================================
@@ -265,6 +357,55 @@ class TestGetModuleStructure:
         assert len(result.layers) > 0
 
 
+class TestCodebaseCached:
+    """Tests for the fingerprint-keyed tool result cache."""
+
+    @pytest.fixture
+    def small_codebase(self, tmp_path):
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "mod.py").write_text("import os\n")
+        with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+            get_settings.cache_clear()
+            yield tmp_path
+            get_settings.cache_clear()
+
+    def test_reuses_result_for_unchanged_codebase(self, small_codebase):
+        first = get_dependency_graph(scope="pkg")
+        with patch(
+            "app.tools.architecture._extract_python_imports", side_effect=AssertionError
+        ):
+            assert get_dependency_graph(scope="pkg") == first
+        assert get_dependency_graph(scope="all") is not first
+
+    def test_callers_get_their_own_copy(self, small_codebase):
+        first = get_dependency_graph(scope="pkg")
+        first.nodes.clear()
+
+        second = get_dependency_graph(scope="pkg")
+        assert second is not first
+        assert second.nodes == ["pkg/mod.py"]
+
+    def test_recomputes_after_directory_change(self, small_codebase):
+        first = get_module_structure()
+        (small_codebase / "empty").mkdir()
+
+        with patch("app.tools.architecture._FINGERPRINT_TTL", 0):
+            second = get_module_structure()
+            assert "empty" in [m.path for m in second.modules]
+            (small_codebase / "empty").rmdir()
+            assert get_module_structure().modules == first.modules
+
+    def test_recomputes_after_change(self, small_codebase):
+        first = get_dependency_graph(scope="pkg")
+        (small_codebase / "pkg" / "other.py").write_text("import re\n")
+
+        with patch("app.tools.architecture._FINGERPRINT_TTL", 0):
+            second = get_dependency_graph(scope="pkg")
+
+        assert second is not first
+        assert "pkg/other.py" in second.nodes
+
+
 class TestGetDependencyGraph:
     """Tests for get_dependency_graph tool."""
 
@@ -361,6 +502,14 @@ class TestTraceDataFlow:
         assert result.flow_type == "event"
         assert len(result.steps) > 0
 
+    def test_known_flow_steps_are_not_shared(self, mock_codebase_root):
+        first = trace_data_flow("message")
+        first.steps[0].description = "changed"
+        first.steps.clear()
+
+        second = trace_data_flow("chat")
+        assert second.steps[0].description != "changed"
+
     def test_generic_entity_search(self, mock_codebase_root):
         result = trace_data_flow("Settings")
         assert result.entity == "Settings"
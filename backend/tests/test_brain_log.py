@@ -247,6 +247,17 @@ class TestBrainLogCollector:
         assert len(entries) == 2
         assert len(collector.entries) == 0  # Cleared
 
+    def test_pending_batch_unaffected_by_later_entries(self):
+        collector = BrainLogCollector()
+        collector.add(BrainLogEntry(type=LogEntryType.INPUT, title="Test1"))
+
+        entries = collector.get_pending_entries()
+        collector.add(BrainLogEntry(type=LogEntryType.ROUTING, title="Test2"))
+
+        assert [e.title for e in entries] == ["Test1"]
+        assert [e.title for e in collector.get_pending_entries()] == ["Test2"]
+        assert len(collector.get_all_entries()) == 2
+
     def test_add_input_entry(self):
         """Test convenience method for adding input entry."""
         collector = BrainLogCollector()
@@ -1,16 +1,40 @@
 """Tests for codebase oracle tools."""
 
+import json
 import os
-from unittest.mock import patch
+import re
+import subprocess
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from app.tools.codebase import (
+    FindReferencesResult,
+    FindSymbolResult,
+    clone_codebase,
     find_symbol,
     get_file_content,
+    get_folder_tree,
     find_references,
+    warm_codebase_index,
+    _CodebaseIndex,
+    _close_git_cat_files,
+    _git_cat_file,
+    _codebase_index,
     _get_language,
+    _get_snippet,
+    _git_tracked_files,
+    _read_checkout_file,
+    _head_commit,
+    _iter_file_texts,
+    _iter_files,
+    _iter_references,
+    _looks_binary,
+    _reference_pattern,
+    _ripgrep_search,
+    _scan_file_bytes,
     _should_skip_path,
+    _symbol_pattern,
 )
 from pathlib import Path
 
@@ -52,6 +76,13 @@ def test_get_language_unknown():
     assert _get_language("README") == "text"
 
 
+def test_get_language_suffix_edge_cases():
+    """Test that only the final path component's suffix is considered."""
+    assert _get_language("App.PY") == "python"
+    assert _get_language("docs.md/README") == "text"
+    assert _get_language("config/.py") == "text"
+
+
 def test_should_skip_path():
     """Test that certain paths are skipped."""
     assert _should_skip_path(Path("project/.git/config")) is True
@@ -61,6 +92,45 @@ def test_should_skip_path():
     assert _should_skip_path(Path("project/src/main.py")) is False
 
 
+def test_iter_files_prunes_skipped_dirs(tmp_path):
+    """Test that the file walk filters extensions and never enters skipped dirs."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("x = 1\n")
+    (tmp_path / "src" / "notes.txt").write_text("notes\n")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x\n")
+
+    files = list(_iter_files(tmp_path, {".py", ".js"}))
+    assert files == [tmp_path / "src" / "main.py"]
+
+
+def test_iter_file_texts_preserves_order(tmp_path):
+    """Test that concurrent reads yield text files in input order."""
+    paths = []
+    for i in range(100):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f"x = {i}\n")
+        paths.append(path)
+    binary_file = tmp_path / "data.py"
+    binary_file.write_bytes(b"\x00\x01")
+
+    results = list(_iter_file_texts([*paths, binary_file]))
+    assert [path for path, _ in results] == paths
+    assert results[42][1] == "x = 42\n"
+
+
+def test_looks_binary(tmp_path):
+    """Test that files containing null bytes are detected as binary."""
+    binary_file = tmp_path / "image.png"
+    binary_file.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR")
+    text_file = tmp_path / "module.py"
+    text_file.write_text("def main():\n    pass\n")
+
+    assert _looks_binary(binary_file) is True
+    assert _looks_binary(text_file) is False
+    assert _looks_binary(tmp_path / "missing.py") is True
+
+
 def test_find_symbol_python_function(mock_codebase_root):
     """Test finding a Python function definition."""
     result = find_symbol("get_settings")
@@ -69,6 +139,74 @@ def test_find_symbol_python_function(mock_codebase_root):
     assert any("config.py" in loc.file for loc in result.locations)
 
 
+def test_find_symbol_result_serializes(mock_codebase_root):
+    """Test that unvalidated locations still round-trip through JSON."""
+    result = find_symbol("get_settings")
+    restored = FindSymbolResult.model_validate_json(result.model_dump_json())
+    assert restored == result
+
+
+def test_find_symbol_is_case_insensitive(tmp_path):
+    """Test that the substring prefilter does not drop case-insensitive matches."""
+    (tmp_path / "mod.py").write_text("class MyModel:\n    pass\n")
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = find_symbol("mymodel")
+        get_settings.cache_clear()
+
+    assert [(loc.file, loc.line) for loc in result.locations] == [("mod.py", 1)]
+
+
+def test_find_symbol_only_checks_lines_with_the_name(tmp_path):
+    """Test definitions are found whether or not case folding shifts offsets."""
+    (tmp_path / "plain.py").write_text("x = MyModel()\n\nclass MyModel:\n    pass\n")
+    (tmp_path / "folded.py").write_text("# Stra\u00dfe\nclass MyModel:\n    pass\n")
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = find_symbol("MyModel")
+        get_settings.cache_clear()
+
+    assert sorted((loc.file, loc.line) for loc in result.locations) == [
+        ("folded.py", 2),
+        ("plain.py", 3),
+    ]
+
+
+def test_symbol_pattern_is_cached():
+    """Test that definition patterns are compiled once per symbol."""
+    pattern = _symbol_pattern("get_settings")
+    assert _symbol_pattern("get_settings") is pattern
+    assert pattern.search("def get_settings():")
+    assert not pattern.search("get_settings()")
+
+
+def test_symbol_pattern_matches_whole_files_line_by_line():
+    """Test that the multiline pattern never matches across a line break."""
+    pattern = _symbol_pattern("build")
+    content = "def\nbuild(x)\n  def build():\nclass\tBuild:\n"
+    assert [m.start() for m in pattern.finditer(content)] == [13, 28]
+
+
+def test_find_symbol_stops_early_for_common_symbols(tmp_path):
+    """Test that find_symbol only builds a page of locations and caps its count."""
+    (tmp_path / "common.py").write_text("value = 1\n" * 300)
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = find_symbol("value")
+        get_settings.cache_clear()
+
+    assert result.truncated is True
+    assert result.total_found == 200
+    assert len(result.locations) == 20
+    assert result.locations[-1].line == 20
+
+
 def test_find_symbol_not_found(mock_codebase_root):
     """Test finding a symbol that doesn't exist."""
     result = find_symbol("this_symbol_does_not_exist_xyz123")
@@ -104,6 +242,39 @@ def test_get_file_content_path_traversal_blocked(mock_codebase_root):
     assert "Error" in result.content or result.total_lines == 0
 
 
+def test_get_file_content_sibling_prefix_blocked(tmp_path):
+    """Test that a sibling directory sharing the root's prefix is rejected."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    evil = tmp_path / "repo-evil"
+    evil.mkdir()
+    (evil / "secret.py").write_text("TOKEN = 'x'\n")
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(root)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = get_file_content("../repo-evil/secret.py")
+        get_settings.cache_clear()
+
+    assert "outside the codebase root" in result.content
+    assert result.total_lines == 0
+
+
+def test_get_folder_tree_sibling_prefix_blocked(tmp_path):
+    """Test that folder trees cannot escape into a prefix-sharing sibling."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    (tmp_path / "repo-evil").mkdir()
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(root)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = get_folder_tree("../repo-evil")
+        get_settings.cache_clear()
+
+    assert "outside the codebase root" in result.tree
+
+
 def test_find_references(mock_codebase_root):
     """Test finding references to a symbol."""
     result = find_references("Settings")
@@ -118,3 +289,482 @@ def test_find_references_not_found(mock_codebase_root):
     search_term = "".join(["zzz", "never", "exists", "anywhere", "999"])
     result = find_references(search_term)
     assert result.total_found == 0
+
+
+def test_find_references_stops_early_for_common_symbols(tmp_path):
+    """Test that find_references stops scanning once the cap is reached."""
+    (tmp_path / "common.py").write_text("value = 1\n" * 600)
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = find_references("value")
+        get_settings.cache_clear()
+
+    assert result.truncated is True
+    assert result.total_found == 500
+    assert len(result.references) == 50
+
+
+def test_find_references_not_truncated(mock_codebase_root):
+    """Test that small result sets are not marked as truncated."""
+    result = find_references("get_settings")
+    assert result.truncated is False
+
+
+def test_find_references_result_serializes(mock_codebase_root):
+    """Test that unvalidated references still round-trip through JSON."""
+    result = find_references("get_settings")
+    restored = FindReferencesResult.model_validate_json(result.model_dump_json())
+    assert restored == result
+
+
+def test_iter_references_is_lazy(tmp_path):
+    """Test that references are yielded as found, one per matching line."""
+    (tmp_path / "a.py").write_text("value = value + 1\nother = 2\nprint(value)\n")
+
+    found = _iter_references("value", tmp_path)
+    first = next(found)
+    found.close()
+
+    assert first == (tmp_path / "a.py", 1, "value = value + 1")
+    assert [line for _, line, _ in _iter_references("value", tmp_path)] == [1, 3]
+
+
+def _fake_ripgrep(records: list[dict], returncode: int = 0) -> MagicMock:
+    """Build a Popen mock that streams ripgrep JSON records."""
+    proc = MagicMock()
+    proc.stdout.__iter__.return_value = iter(
+        [json.dumps(record).encode() + b"\n" for record in records]
+    )
+    proc.poll.return_value = returncode
+    proc.returncode = returncode
+    return proc
+
+
+def test_ripgrep_search_parses_matches(tmp_path):
+    """Test that only ripgrep match records are turned into results."""
+    path = str(tmp_path / "mod.py")
+    records = [
+        {"type": "begin", "data": {"path": {"text": path}}},
+        {
+            "type": "match",
+            "data": {
+                "path": {"text": path},
+                "lines": {"text": "value = 1\r\n"},
+                "line_number": 3,
+            },
+        },
+        {
+            "type": "match",
+            "data": {
+                "path": {"text": path},
+                "lines": {"bytes": "//4="},
+                "line_number": 4,
+            },
+        },
+        {"type": "end", "data": {"path": {"text": path}}},
+    ]
+    with (
+        patch("app.tools.codebase._RG_PATH", "rg"),
+        patch(
+            "app.tools.codebase.subprocess.Popen", return_value=_fake_ripgrep(records)
+        ) as popen,
+    ):
+        hits = list(
+            _ripgrep_search(re.compile("value", re.IGNORECASE), tmp_path, {".py"})
+        )
+
+    assert hits == [(tmp_path / "mod.py", 3, "value = 1")]
+    args = popen.call_args.args[0]
+    assert "--ignore-case" in args
+    assert "!node_modules/" in args
+
+
+def test_find_references_falls_back_when_ripgrep_fails(tmp_path):
+    """Test that a failing ripgrep run falls back to the Python search."""
+    (tmp_path / "mod.py").write_text("value = 1\n")
+    with (
+        patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}),
+        patch("app.tools.codebase._RG_PATH", "rg"),
+        patch("app.tools.codebase.subprocess.Popen", return_value=_fake_ripgrep([], 2)),
+    ):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = find_references("value")
+        get_settings.cache_clear()
+
+    assert [(ref.file, ref.line) for ref in result.references] == [("mod.py", 1)]
+
+
+def test_head_commit(tmp_path):
+    """Test resolving the checked-out commit from loose and packed refs."""
+    assert _head_commit(tmp_path) is None
+
+    git_dir = tmp_path / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "packed-refs").write_text("# pack-refs\nabc123 refs/heads/main\n")
+    assert _head_commit(tmp_path) == "abc123"
+
+    (git_dir / "refs" / "heads" / "main").write_text("def456\n")
+    assert _head_commit(tmp_path) == "def456"
+
+
+def test_clone_codebase_existing_reads_commit_without_git(tmp_path):
+    """Test that an existing checkout reports its commit without running git."""
+    git_dir = tmp_path / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text("0123456789abcdef\n")
+
+    with (
+        patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}),
+        patch("app.tools.codebase.subprocess.run") as mock_run,
+    ):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = clone_codebase()
+        get_settings.cache_clear()
+
+    assert result.status == "already_exists"
+    assert result.commit_hash == "01234567"
+    mock_run.assert_not_called()
+
+
+def test_clone_codebase_shallow_and_pinned(tmp_path):
+    """Test that clones skip history and pinned commits fall back to the default."""
+    source = tmp_path / "source"
+    git = ["git", "-C", str(source), "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(["git", "init", "-q", str(source)], check=True)
+    subprocess.run([*git, "config", "uploadpack.allowFilter", "true"], check=True)
+    (source / "mod.py").write_text("value = 1\n")
+    subprocess.run([*git, "add", "mod.py"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "first"], check=True)
+    first = _head_commit(source)
+    (source / "mod.py").write_text("value = 2\n")
+    subprocess.run([*git, "commit", "-q", "-am", "second"], check=True)
+    second = _head_commit(source)
+
+    from app.config import get_settings
+
+    for name, commit_hash, expected in [
+        ("tip", "main", second),
+        ("pinned", first, first),
+        ("unknown", "no-such-ref", second),
+    ]:
+        env = {
+            "CODEBASE_ROOT": str(tmp_path / name),
+            "CODEBASE_REPO_URL": source.as_uri(),
+            "CODEBASE_COMMIT_HASH": commit_hash,
+        }
+        with patch.dict(os.environ, env):
+            get_settings.cache_clear()
+            result = clone_codebase()
+            get_settings.cache_clear()
+
+        assert result.status == "cloned"
+        assert result.commit_hash == expected[:8]
+        assert (tmp_path / name / "mod.py").exists()
+
+    # The default branch is cloned without its history
+    assert (tmp_path / "tip" / ".git" / "shallow").exists()
+
+
+def test_find_references_uses_index_per_commit(tmp_path):
+    """Test that file contents are indexed once per checked-out commit."""
+    git_dir = tmp_path / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text("aaaa\n")
+    source = tmp_path / "mod.py"
+    source.write_text("value = 1\n")
+
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        _codebase_index.cache_clear()
+        with patch("app.tools.codebase._CodebaseIndex", wraps=_CodebaseIndex) as build:
+            assert find_references("value").total_found == 1
+            assert find_references("value").total_found == 1
+            # Same commit: the index is built once and reused
+            assert build.call_count == 1
+
+            # New commit: the checkout is indexed again
+            source.write_text("value = 1\nvalue = 2\n")
+            (git_dir / "HEAD").write_text("bbbb\n")
+            assert find_references("value").total_found == 2
+            assert build.call_count == 2
+
+        _codebase_index.cache_clear()
+        get_settings.cache_clear()
+
+
+def test_codebase_index_disk_cache(tmp_path):
+    """Test that a pickled index is reused by a fresh process per commit."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    source = root / "mod.py"
+    source.write_text("value = 1\n")
+    cache_dir = tmp_path / "cache"
+
+    with patch.dict(os.environ, {"CODEBASE_INDEX_CACHE_DIR": str(cache_dir)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        _codebase_index.cache_clear()
+        built = _codebase_index(root, "aaaa")
+        assert (cache_dir / "aaaa.pkl").exists()
+
+        # Simulate a restart: the in-memory cache is gone, the pickle is not
+        _codebase_index.cache_clear()
+        # Loading must not read the checkout again
+        with patch("app.tools.codebase._iter_file_texts", side_effect=AssertionError):
+            loaded = _codebase_index(root, "aaaa")
+        assert loaded is not built
+        assert loaded.files == built.files
+        assert loaded.postings == built.postings
+        source.write_text("value = 1\nvalue = 2\n")
+
+        # A different commit or root is never served from another's cache
+        _codebase_index.cache_clear()
+        assert _codebase_index(root, "bbbb").files[0][2] == "value = 1\nvalue = 2\n"
+        (cache_dir / "bbbb.pkl").replace(cache_dir / "cccc.pkl")
+        other = tmp_path / "other"
+        other.mkdir()
+        assert _codebase_index(other, "cccc").files == []
+
+        _codebase_index.cache_clear()
+        get_settings.cache_clear()
+
+
+def test_warm_codebase_index(tmp_path):
+    """Test that warming writes the configured checkout's index to disk."""
+    root = tmp_path / "repo"
+    (root / ".git").mkdir(parents=True)
+    (root / ".git" / "HEAD").write_text("aaaa\n")
+    (root / "mod.py").write_text("value = 1\n")
+    cache_dir = tmp_path / "cache"
+
+    env = {"CODEBASE_ROOT": str(root), "CODEBASE_INDEX_CACHE_DIR": str(cache_dir)}
+    with patch.dict(os.environ, env):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        _codebase_index.cache_clear()
+        assert warm_codebase_index()
+        assert (cache_dir / "aaaa.pkl").exists()
+
+        # Outside a git checkout there is nothing to key the index on
+        (root / ".git" / "HEAD").unlink()
+        (root / ".git").rmdir()
+        assert not warm_codebase_index()
+
+        _codebase_index.cache_clear()
+        get_settings.cache_clear()
+
+
+def test_codebase_index_trigram_candidates(tmp_path):
+    """Test that the trigram index narrows searches to possible matches."""
+    (tmp_path / "a.py").write_text("class GetSettings:\n    pass\n")
+    (tmp_path / "b.py").write_text("other = 1\n")
+    index = _CodebaseIndex(tmp_path)
+    a_idx = next(i for i, (path, _, _) in enumerate(index.files) if path.name == "a.py")
+
+    assert index.candidates("getsettings") == [a_idx]
+    assert index.candidates("missing") == []
+    assert index.candidates("ab") is None
+    assert [
+        path.name for path, _ in index.iter_texts(frozenset({".py"}), "Settings")
+    ] == ["a.py"]
+
+
+def test_git_tracked_files(tmp_path):
+    """Test that only tracked files with matching extensions are listed."""
+    assert _git_tracked_files(tmp_path, {".py"}) is None
+
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    (tmp_path / "tracked.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    (tmp_path / "untracked.py").write_text("y = 2\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("z = 3\n")
+    (tmp_path / "builder").mkdir()
+    (tmp_path / "builder" / "make.py").write_text("w = 4\n")
+    subprocess.run(["git", "-C", str(tmp_path), "add", "--all", "."], check=True)
+    subprocess.run(
+        ["git", "-C", str(tmp_path), "rm", "-q", "--cached", "untracked.py"], check=True
+    )
+
+    assert _git_tracked_files(tmp_path, {".py"}) == [
+        tmp_path / "builder" / "make.py",
+        tmp_path / "tracked.py",
+    ]
+
+
+def test_read_checkout_file_serves_committed_blobs(tmp_path):
+    """Test that tracked files come from the commit and others from disk."""
+    git = ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    (tmp_path / "tracked.py").write_text("committed = True\n")
+    subprocess.run([*git, "add", "tracked.py"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "init"], check=True)
+    (tmp_path / "untracked.py").write_text("on_disk = True\n")
+
+    assert _read_checkout_file(tmp_path, Path("tracked.py")) == "committed = True\n"
+    assert _read_checkout_file(tmp_path, Path("untracked.py")) == "on_disk = True\n"
+    with pytest.raises(FileNotFoundError):
+        _read_checkout_file(tmp_path, Path("missing.py"))
+
+
+def test_scan_file_bytes(tmp_path):
+    """Test that byte scans report one decoded line per matching line."""
+    source = tmp_path / "mod.py"
+    source.write_bytes("value = value\r\n# caf\u00e9 values\nprint(value)".encode())
+    binary = tmp_path / "data.py"
+    binary.write_bytes(b"value\x00")
+    empty = tmp_path / "empty.py"
+    empty.write_bytes(b"")
+    pattern = _reference_pattern("value")
+
+    assert _scan_file_bytes(b"value", pattern, source) == [
+        (1, "value = value"),
+        (3, "print(value)"),
+    ]
+    assert _scan_file_bytes(b"value", pattern, binary) is None
+    assert _scan_file_bytes(b"value", pattern, empty) is None
+
+
+def test_scan_file_bytes_matches_str_search(tmp_path):
+    """Test that byte scans agree with the str pattern on non-ASCII text."""
+    source = tmp_path / "mod.py"
+    source.write_text(
+        "caf\u00e9 = 1\nx = caf\u00e9\n\u00e9cafe = cafe\n", encoding="utf-8"
+    )
+    latin1 = tmp_path / "latin1.py"
+    latin1.write_bytes("cafe = '\u00e9'\n".encode("latin-1"))
+
+    name = "caf\u00e9"
+    assert _scan_file_bytes(name.encode(), _reference_pattern(name), source) == [
+        (1, "caf\u00e9 = 1"),
+        (2, "x = caf\u00e9"),
+    ]
+    # "cafe" touching a non-ASCII letter is not a whole word
+    assert _scan_file_bytes(b"cafe", _reference_pattern("cafe"), source) == [
+        (3, "\u00e9cafe = cafe"),
+    ]
+    # Files that aren't UTF-8 are skipped, as the str search skips them
+    assert _scan_file_bytes(b"cafe", _reference_pattern("cafe"), latin1) is None
+
+
+def test_get_snippet_by_offset():
+    """Test that snippets are sliced around a line without splitting the file."""
+    content = "a\nb\nc\nd\ne\n"
+    assert _get_snippet(content, 0, 1) == ">>> 1: a\n    2: b\n    3: c"
+    assert _get_snippet(content, 4, 3) == (
+        "    1: a\n    2: b\n>>> 3: c\n    4: d\n    5: e"
+    )
+    assert _get_snippet("x\ny", 2, 2) == "    1: x\n>>> 2: y"
+
+
+def test_get_folder_tree_layout(tmp_path):
+    """Test tree ordering, connectors, depth limits and skipped entries."""
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "deep.py").write_text("")
+    (tmp_path / "src" / "main.py").write_text("")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / ".hidden").write_text("")
+    (tmp_path / "README.md").write_text("")
+    with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        result = get_folder_tree(max_depth=1)
+        get_settings.cache_clear()
+
+    assert result.tree == (
+        "./\n"
+        "\u251c\u2500\u2500 src/\n"
+        "\u2502   \u251c\u2500\u2500 pkg/\n"
+        "\u2502   \u2514\u2500\u2500 main.py\n"
+        "\u2514\u2500\u2500 README.md"
+    )
+    assert (result.total_dirs, result.total_files) == (2, 2)
+
+
+def test_get_folder_tree_cache(tmp_path):
+    """Test that trees are reused until a listed directory changes."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("aaaa\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("")
+    with (
+        patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}),
+        patch("app.tools.codebase._CodebaseIndex", side_effect=AssertionError),
+    ):
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        first = get_folder_tree()
+        assert get_folder_tree() is first
+
+        # A new file in a nested directory is picked up
+        (tmp_path / "src" / "extra.py").write_text("")
+        second = get_folder_tree()
+        get_settings.cache_clear()
+
+    assert second is not first
+    assert "extra.py" in second.tree
+    assert second.total_files == first.total_files + 1
+
+
+def test_git_cat_file_processes_are_closed(tmp_path):
+    """Test that evicted and cleared cat-file processes are stopped."""
+    with (
+        patch("app.tools.codebase._GitCatFile") as cat_file_cls,
+        patch("app.tools.codebase._MAX_CAT_FILES", 2),
+    ):
+        cat_file_cls.side_effect = lambda root: MagicMock(name=str(root))
+        first = _git_cat_file(tmp_path / "a")
+        second = _git_cat_file(tmp_path / "b")
+        assert _git_cat_file(tmp_path / "a") is first
+
+        # "b" is now least recently used and is stopped to make room
+        third = _git_cat_file(tmp_path / "c")
+        second.close.assert_called_once()
+        first.close.assert_not_called()
+
+        _close_git_cat_files()
+        first.close.assert_called_once()
+        third.close.assert_called_once()
+        assert _git_cat_file(tmp_path / "a") is not first
+        _close_git_cat_files()
+
+
+def test_clone_codebase_closes_git_cat_files(tmp_path):
+    """Test that a fresh clone stops cat-file processes for the old checkout."""
+    source = tmp_path / "source"
+    git = ["git", "-C", str(source), "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(["git", "init", "-q", str(source)], check=True)
+    (source / "mod.py").write_text("value = 1\n")
+    subprocess.run([*git, "add", "mod.py"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "first"], check=True)
+
+    from app.config import get_settings
+
+    env = {
+        "CODEBASE_ROOT": str(tmp_path / "clone"),
+        "CODEBASE_REPO_URL": source.as_uri(),
+        "CODEBASE_COMMIT_HASH": "main",
+    }
+    with (
+        patch.dict(os.environ, env),
+        patch("app.tools.codebase._close_git_cat_files") as close_all,
+    ):
+        get_settings.cache_clear()
+        result = clone_codebase()
+        get_settings.cache_clear()
+
+    assert result.status == "cloned"
+    close_all.assert_called_once()
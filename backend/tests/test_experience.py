@@ -1,12 +1,23 @@
 """Tests for experience tools."""
 
+import pytest
+from pydantic import ValidationError
+
 from app.tools.experience import (
+    Education,
+    ProfileData,
+    Experience,
+    ProfileInfo,
+    Project,
+    Skill,
     get_professional_experience,
     get_latest_experience,
     get_skills,
     get_projects,
     get_education,
     get_profile,
+    get_full_profile,
+    get_full_profile_json,
     PROFILE,
     EXPERIENCES,
     SKILLS,
@@ -60,6 +71,27 @@ def test_education_data():
     assert edu.degree is not None
 
 
+def test_static_data_is_valid():
+    """Test that the unvalidated static data conforms to its models."""
+    for model, items in [
+        (ProfileInfo, [PROFILE]),
+        (Experience, EXPERIENCES),
+        (Skill, SKILLS),
+        (Project, PROJECTS),
+        (Education, EDUCATION),
+    ]:
+        for item in items:
+            assert model.model_validate(item.model_dump()) == item
+
+
+def test_static_data_is_frozen():
+    """Test that the shared static data cannot be mutated by callers."""
+    with pytest.raises(ValidationError):
+        EXPERIENCES[0].company = "Other"
+    with pytest.raises(ValidationError):
+        PROFILE.name = "Other"
+
+
 def test_get_professional_experience():
     """Test get_professional_experience tool returns all experiences."""
     result = get_professional_experience()
@@ -106,3 +138,41 @@ def test_get_profile():
     assert result.profile.name == PROFILE.name
     assert result.profile.title is not None
     assert result.profile.email is not None
+
+
+def test_static_responses_are_prebuilt():
+    """Test that static tool responses are built once and reused."""
+    assert get_professional_experience() is get_professional_experience()
+    assert get_skills() is get_skills()
+    assert get_projects() is get_projects()
+    assert get_education() is get_education()
+    assert get_profile() is get_profile()
+    assert get_latest_experience() is get_latest_experience()
+    assert get_full_profile() is get_full_profile()
+    assert str(len(EXPERIENCES)) in get_professional_experience().summary
+    # Responses share the static data rather than copying it
+    assert get_professional_experience().experiences is EXPERIENCES
+    assert get_full_profile().experiences is EXPERIENCES
+    assert get_full_profile().skills is SKILLS
+
+
+def test_static_responses_round_trip():
+    """Test that the unvalidated, deferred-schema responses serialize cleanly."""
+    for getter in (
+        get_professional_experience,
+        get_skills,
+        get_projects,
+        get_education,
+        get_profile,
+        get_latest_experience,
+    ):
+        response = getter()
+        restored = type(response).model_validate_json(response.model_dump_json())
+        assert restored == response
+
+
+def test_full_profile_json_matches_model():
+    """Test that the pre-serialized profile matches the profile model."""
+    data = get_full_profile_json()
+    assert data is get_full_profile_json()
+    assert ProfileData.model_validate_json(data) == get_full_profile()
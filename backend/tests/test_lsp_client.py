@@ -5,7 +5,12 @@ including process management, JSON-RPC communication, and graceful
 handling when LSP servers are not available.
 """
 
+import asyncio
+import json
+import logging
 import os
+import sys
+import threading
 from unittest.mock import MagicMock, patch, AsyncMock
 
 import pytest
@@ -20,6 +25,11 @@ from app.tools.lsp_client import (
     CallHierarchyItem,
     CodeClient,
     CodeManager,
+    _StderrDrain,
+    _did_close,
+    _did_open,
+    _grow_pipe,
+    _language_id,
     get_code_manager,
     shutdown_code_manager,
 )
@@ -62,6 +72,20 @@ class TestRange:
         assert result["start"]["line"] == 1
         assert result["end"]["character"] == 4
 
+    def test_from_dict_round_trip(self):
+        data = {
+            "start": {"line": 1, "character": 2},
+            "end": {"line": 3, "character": 4},
+        }
+        range_ = Range.from_dict(data)
+        assert range_ == Range(Position(1, 2), Position(3, 4))
+        assert range_.to_dict() == data
+
+    def test_uses_slots(self):
+        range_ = Range(Position(0, 0), Position(0, 1))
+        assert not hasattr(range_, "__dict__")
+        assert not hasattr(range_.start, "__dict__")
+
 
 class TestLocation:
     """Tests for Location data class."""
@@ -203,36 +227,29 @@ class TestCodeClientServerCommand:
         assert cmd == ["pyright-langserver", "--stdio"]
 
 
-class TestCodeClientLanguageId:
+class TestLanguageId:
     """Tests for language ID detection."""
 
     def test_python_language_id(self):
-        client = CodeClient(server_type=LanguageServer.PYTHON)
-        assert client._get_language_id("/path/to/file.py") == "python"
+        assert _language_id("/path/to/file.py") == "python"
 
     def test_typescript_language_id(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
-        assert client._get_language_id("/path/to/file.ts") == "typescript"
+        assert _language_id("/path/to/file.ts") == "typescript"
 
     def test_tsx_language_id(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
-        assert client._get_language_id("/path/to/component.tsx") == "typescriptreact"
+        assert _language_id("/path/to/component.tsx") == "typescriptreact"
 
     def test_javascript_language_id(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
-        assert client._get_language_id("/path/to/script.js") == "javascript"
+        assert _language_id("/path/to/script.js") == "javascript"
 
     def test_jsx_language_id(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
-        assert client._get_language_id("/path/to/component.jsx") == "javascriptreact"
+        assert _language_id("/path/to/component.jsx") == "javascriptreact"
 
     def test_json_language_id(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
-        assert client._get_language_id("/path/to/config.json") == "json"
+        assert _language_id("/path/to/config.json") == "json"
 
     def test_unknown_language_id(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
-        assert client._get_language_id("/path/to/file.xyz") == "plaintext"
+        assert _language_id("/path/to/file.xyz") == "plaintext"
 
 
 class TestCodeClientNotInitialized:
@@ -276,6 +293,28 @@ class TestCodeClientNotInitialized:
         assert result == []
 
 
+class TestCodeClientInitialize:
+    """Tests for the initialize request."""
+
+    @pytest.mark.asyncio
+    async def test_initialize_sends_shared_capabilities(self):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client.workspace_root = "/work/repo"
+
+        with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
+            await client._initialize()
+            await client._initialize()
+
+        first, second = (call.args[1] for call in mock_send.call_args_list)
+        assert first["rootUri"] == "file:///work/repo"
+        assert first["workspaceFolders"][0]["name"] == "repo"
+        assert first["capabilities"] is second["capabilities"]
+        wire = json.loads(json.dumps(first))
+        assert wire["capabilities"]["workspace"]["symbol"]["symbolKind"] == {
+            "valueSet": list(range(1, 27))
+        }
+
+
 class TestCodeClientStart:
     """Tests for LSP client start behavior."""
 
@@ -367,6 +406,12 @@ class TestCodeManager:
 # ============================================================================
 
 
+async def _ready_initialize(self):
+    self._initialized = True
+    self._ready.set()
+    return {}
+
+
 class TestGlobalCodeManager:
     """Tests for global LSP manager functions."""
 
@@ -375,7 +420,7 @@ class TestGlobalCodeManager:
         # Reset global manager
         import app.tools.lsp_client as lsp_module
 
-        lsp_module._code_manager = None
+        lsp_module._code_managers.clear()
 
         with pytest.raises(ValueError, match="workspace_root is required"):
             await get_code_manager(None)
@@ -385,16 +430,183 @@ class TestGlobalCodeManager:
         # Should not raise even if manager is None
         import app.tools.lsp_client as lsp_module
 
-        lsp_module._code_manager = None
+        lsp_module._code_managers.clear()
 
         await shutdown_code_manager()  # Should not raise
 
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_wait_for_initialization(self):
+        import app.tools.lsp_client as lsp_module
+
+        lsp_module._code_managers.clear()
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_initialize(self):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            self._clients[LanguageServer.PYTHON] = MagicMock()
+            self._initialized = True
+            self._ready.set()
+            return {"python": True}
+
+        with patch.object(CodeManager, "initialize", slow_initialize):
+            first = asyncio.create_task(get_code_manager("/test"))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(get_code_manager("/test"))
+            await asyncio.sleep(0)
+            assert not second.done()
+
+            release.set()
+            managers = await asyncio.gather(first, second)
+
+        assert calls == 1
+        assert managers[0] is managers[1]
+        assert managers[1].available_servers == ["python"]
+        lsp_module._code_managers.clear()
+
+    @pytest.mark.asyncio
+    async def test_managers_are_pooled_per_workspace(self):
+        import app.tools.lsp_client as lsp_module
+
+        lsp_module._code_managers.clear()
+        with (
+            patch.object(CodeManager, "initialize", _ready_initialize),
+            patch.object(CodeManager, "shutdown", new_callable=AsyncMock) as shutdown,
+            patch.object(lsp_module, "_MAX_CODE_MANAGERS", 2),
+        ):
+            a = await get_code_manager("/repo/a")
+            b = await get_code_manager("/repo/b")
+            assert await get_code_manager("/repo/a") is a
+            assert await get_code_manager() is a  # Most recently used
+
+            # A third workspace evicts the least recently used one
+            await get_code_manager("/repo/c")
+            assert [root for _, root in lsp_module._code_managers] == [
+                "/repo/a",
+                "/repo/c",
+            ]
+            shutdown.assert_awaited_once()
+            assert await get_code_manager("/repo/b") is not b
+
+        lsp_module._code_managers.clear()
+
+    @pytest.mark.asyncio
+    async def test_managers_are_pooled_per_event_loop(self):
+        import app.tools.lsp_client as lsp_module
+
+        lsp_module._code_managers.clear()
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            with (
+                patch.object(CodeManager, "initialize", _ready_initialize),
+                patch.object(
+                    CodeManager, "shutdown", new_callable=AsyncMock
+                ) as shutdown,
+            ):
+                here = await get_code_manager("/repo")
+                future = asyncio.run_coroutine_threadsafe(
+                    get_code_manager("/repo"), other_loop
+                )
+                there = await asyncio.wrap_future(future)
+                assert there is not here
+                assert await get_code_manager("/repo") is here
+
+                # Managers from the other loop are shut down on that loop
+                await shutdown_code_manager()
+                assert shutdown.await_count == 2
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+        assert not lsp_module._code_managers
+
+    @pytest.mark.asyncio
+    async def test_idle_managers_are_shut_down(self):
+        import app.tools.lsp_client as lsp_module
+
+        lsp_module._code_managers.clear()
+        with (
+            patch.object(CodeManager, "initialize", _ready_initialize),
+            patch.object(CodeManager, "shutdown", new_callable=AsyncMock) as shutdown,
+            patch("app.tools.lsp_client.time.monotonic", side_effect=[0.0, 601.0]),
+        ):
+            await get_code_manager("/repo/a")
+            await get_code_manager("/repo/b")
+
+        assert [root for _, root in lsp_module._code_managers] == ["/repo/b"]
+        shutdown.assert_awaited_once()
+        lsp_module._code_managers.clear()
+
+    @pytest.mark.asyncio
+    async def test_idle_managers_are_shut_down_on_cache_hits(self):
+        import app.tools.lsp_client as lsp_module
+
+        lsp_module._code_managers.clear()
+        with (
+            patch.object(CodeManager, "initialize", _ready_initialize),
+            patch.object(CodeManager, "shutdown", new_callable=AsyncMock) as shutdown,
+            patch(
+                "app.tools.lsp_client.time.monotonic", side_effect=[0.0, 10.0, 700.0]
+            ),
+        ):
+            await get_code_manager("/repo/a")
+            b = await get_code_manager("/repo/b")
+            assert await get_code_manager("/repo/b") is b
+
+        assert [root for _, root in lsp_module._code_managers] == ["/repo/b"]
+        shutdown.assert_awaited_once()
+        lsp_module._code_managers.clear()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_every_manager(self):
+        import app.tools.lsp_client as lsp_module
+
+        lsp_module._code_managers.clear()
+        with (
+            patch.object(CodeManager, "initialize", _ready_initialize),
+            patch.object(CodeManager, "shutdown", new_callable=AsyncMock) as shutdown,
+        ):
+            await get_code_manager("/repo/a")
+            await get_code_manager("/repo/b")
+            await shutdown_code_manager()
+
+        assert shutdown.await_count == 2
+        assert not lsp_module._code_managers
+
 
 # ============================================================================
 # Integration Tests
 # ============================================================================
 
 
+@pytest.fixture
+def stdin_writes():
+    """Capture what the client writes to the server's stdin pipe."""
+    writes: list[bytes] = []
+
+    def fake_write(fd, data):
+        writes.append(bytes(data))
+        return len(data)
+
+    with patch("app.tools.lsp_client.os.write", side_effect=fake_write):
+        yield writes
+
+
+def _written_methods(writes: list[bytes]) -> list[str]:
+    methods = []
+    for data in writes:
+        while data:
+            header, data = data.split(b"\r\n\r\n", 1)
+            length = int(header.split(b":")[1])
+            methods.append(json.loads(data[:length])["method"])
+            data = data[length:]
+    return methods
+
+
 class TestCodeClientSendMessage:
     """Tests for LSP client message sending."""
 
@@ -409,83 +621,371 @@ class TestCodeClientSendMessage:
         client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
 
         # Mock process with stdin
-        mock_stdin = MagicMock()
         mock_process = MagicMock()
-        mock_process.stdin = mock_stdin
+        mock_process.stdin.fileno.return_value = 7
         client.process = mock_process
 
-        client._send_message({"jsonrpc": "2.0", "id": 1, "method": "test"})
+        with patch("app.tools.lsp_client.os.write") as mock_write:
+            mock_write.side_effect = lambda fd, data: len(data)
+            client._send_message({"jsonrpc": "2.0", "id": 1, "method": "test"})
 
-        # Verify message was written
-        mock_stdin.write.assert_called_once()
-        mock_stdin.flush.assert_called_once()
+        # Verify message was written straight to the pipe in one call
+        mock_write.assert_called_once()
+        fd, written_data = mock_write.call_args[0]
+        assert fd == 7
+        mock_process.stdin.write.assert_not_called()
 
         # Check the format includes Content-Length header
-        written_data = mock_stdin.write.call_args[0][0]
-        assert b"Content-Length:" in written_data
+        assert b"Content-Length:" in bytes(written_data)
+
+    def test_send_message_retries_partial_writes(self):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client.process = MagicMock()
+        chunks: list[bytes] = []
+
+        def short_write(fd, data):
+            chunks.append(bytes(data[:5]))
+            return min(5, len(data))
+
+        with patch("app.tools.lsp_client.os.write", side_effect=short_write):
+            client._send_message({"jsonrpc": "2.0", "method": "test"})
+
+        header, body = b"".join(chunks).split(b"\r\n\r\n", 1)
+        assert json.loads(body) == {"jsonrpc": "2.0", "method": "test"}
+        assert len(chunks) > 1
+
+    def test_send_message_length_counts_bytes(self, stdin_writes):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client.process = MagicMock()
+
+        message = {"jsonrpc": "2.0", "method": "test", "params": {"text": "café ✓"}}
+        client._send_message(message)
+
+        header, body = stdin_writes[0].split(b"\r\n\r\n", 1)
+        assert header == b"Content-Length: %d" % len(body)
+        assert json.loads(body) == message
+
+
+class TestGrowPipe:
+    """Tests for enlarging the server pipes."""
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="pipe sizes are Linux-only")
+    def test_grow_pipe_enlarges_buffer(self):
+        import fcntl
+
+        read_fd, write_fd = os.pipe()
+        try:
+            _grow_pipe(write_fd)
+            assert fcntl.fcntl(write_fd, fcntl.F_GETPIPE_SZ) > 1 << 16
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_grow_pipe_ignores_errors(self):
+        read_fd, write_fd = os.pipe()
+        os.close(read_fd)
+        os.close(write_fd)
+
+        _grow_pipe(write_fd)  # Closed fd; must not raise
+
+
+class TestStderrDrain:
+    """Tests for draining server stderr."""
+
+    def test_logs_at_debug_level(self, caplog):
+        drain = _StderrDrain("python")
+
+        with caplog.at_level(logging.DEBUG, logger="app.tools.lsp_client"):
+            drain.data_received(b"Loading configuration\n")
+
+        assert "python stderr: Loading configuration" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_drains_more_than_a_pipe_holds(self):
+        read_fd, write_fd = os.pipe()
+        read_file = os.fdopen(read_fd, "rb")
+        transport, _ = await asyncio.get_running_loop().connect_read_pipe(
+            lambda: _StderrDrain("python"), read_file
+        )
+        try:
+            # Blocks forever unless the reading side keeps consuming
+            data = b"x" * (4 << 20)
+
+            def write_all():
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(write_fd, view) :]
+
+            await asyncio.wait_for(asyncio.to_thread(write_all), timeout=10)
+        finally:
+            os.close(write_fd)
+            transport.close()
 
 
 class TestCodeClientReadMessage:
     """Tests for LSP client message reading."""
 
-    def test_read_message_without_process(self):
+    @pytest.mark.asyncio
+    async def test_read_message_without_process(self):
         client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
         client.process = None
 
-        result = client._read_message()
+        result = await client._read_message()
         assert result is None
 
-    def test_read_message_parses_json(self):
+    @pytest.mark.asyncio
+    async def test_read_message_parses_json(self):
+        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
+
+        # Feed a framed message to the stdout reader
+        content = b'{"jsonrpc":"2.0","id":1,"result":null}'
+        client._reader = asyncio.StreamReader()
+        client._reader.feed_data(b"Content-Length: %d\r\n\r\n" % len(content))
+        client._reader.feed_data(content)
+
+        result = await client._read_message()
+        assert result == {"jsonrpc": "2.0", "id": 1, "result": None}
+
+    @pytest.mark.asyncio
+    async def test_read_message_ignores_other_headers(self):
         client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
+        client._reader = asyncio.StreamReader()
+        first = b'{"id":1}'
+        second = b'{"id":2}'
+        client._reader.feed_data(
+            b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n"
+            b"Content-Length: %d\r\n\r\n%s"
+            % (len(first), first)
+            + b"Content-Length: %d\r\n\r\n%s" % (len(second), second)
+        )
+
+        assert await client._read_message() == {"id": 1}
+        assert await client._read_message() == {"id": 2}
+
+    @pytest.mark.asyncio
+    async def test_read_message_at_eof(self):
+        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
+        client._reader = asyncio.StreamReader()
+        client._reader.feed_data(b"Content-Length: 10\r\n\r\n{}")
+        client._reader.feed_eof()
+
+        assert await client._read_message() is None
+
+
+def _frame(message: dict) -> bytes:
+    body = json.dumps(message).encode()
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
 
-        # Create mock with proper header and content
-        mock_stdout = MagicMock()
-        content = '{"jsonrpc":"2.0","id":1,"result":null}'
-        mock_stdout.readline.side_effect = [
-            f"Content-Length: {len(content)}\r\n".encode("utf-8"),
-            b"\r\n",
+
+class TestCodeClientSendRequest:
+    """Tests for dispatching responses to concurrent requests."""
+
+    @pytest.mark.asyncio
+    async def test_send_request_without_reader_raises(self):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+
+        with pytest.raises(RuntimeError, match="LSP server not running"):
+            await client._send_request("test", {})
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_get_their_own_responses(self, stdin_writes):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client.process = MagicMock()
+        client._reader = asyncio.StreamReader()
+        client._reader_task = asyncio.create_task(client._read_loop())
+
+        first = asyncio.create_task(client._send_request("first", {}))
+        second = asyncio.create_task(client._send_request("second", {}))
+        await asyncio.sleep(0)
+
+        # Responses arrive out of order, after a server notification
+        client._reader.feed_data(_frame({"jsonrpc": "2.0", "method": "log"}))
+        client._reader.feed_data(_frame({"jsonrpc": "2.0", "id": 2, "result": "b"}))
+        client._reader.feed_data(_frame({"jsonrpc": "2.0", "id": 1, "result": "a"}))
+
+        assert await first == "a"
+        assert await second == "b"
+        assert client._pending_responses == {}
+
+        # Requests still waiting when the server exits fail instead of hanging
+        pending = asyncio.create_task(client._send_request("third", {}))
+        await asyncio.sleep(0)
+        client._reader.feed_eof()
+        with pytest.raises(RuntimeError, match="LSP server exited"):
+            await pending
+
+    @pytest.mark.asyncio
+    async def test_request_times_out_and_is_cancelled(self, stdin_writes):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client.process = MagicMock()
+        client._reader = asyncio.StreamReader()
+        client._reader_task = asyncio.create_task(client._read_loop())
+
+        with patch.dict(
+            "app.tools.lsp_client._REQUEST_TIMEOUTS", {"textDocument/hover": 0.01}
+        ):
+            with pytest.raises(TimeoutError):
+                await client._send_request("textDocument/hover", {})
+
+        assert client._pending_responses == {}
+        assert _written_methods(stdin_writes) == [
+            "textDocument/hover",
+            "$/cancelRequest",
         ]
-        mock_stdout.read.return_value = content.encode("utf-8")
+        cancel = json.loads(stdin_writes[-1].split(b"\r\n\r\n", 1)[1])
+        assert cancel["params"] == {"id": 1}
+        client._reader.feed_eof()
 
-        mock_process = MagicMock()
-        mock_process.stdout = mock_stdout
-        client.process = mock_process
+    @pytest.mark.asyncio
+    async def test_timed_out_lookup_is_not_cached(self, tmp_path):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client._initialized = True
+        client.process = MagicMock()
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
 
-        result = client._read_message()
-        assert result == {"jsonrpc": "2.0", "id": 1, "result": None}
+        with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = [TimeoutError(), {"contents": "int"}]
+
+            assert await client.hover(str(path), 0, 0) is None
+            result = await client.hover(str(path), 0, 0)
+
+        assert result.contents == "int"
 
 
 class TestCodeClientOpenCloseDocument:
     """Tests for document open/close notifications."""
 
-    def test_open_document_sends_notification(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
+    def test_did_open_carries_document_text(self):
+        message = _did_open("/test/file.ts", "const x = 1;", "typescript")
 
-        # Mock process
-        mock_stdin = MagicMock()
-        mock_process = MagicMock()
-        mock_process.stdin = mock_stdin
-        client.process = mock_process
+        assert message["method"] == "textDocument/didOpen"
+        assert message["params"]["textDocument"] == {
+            "uri": "file:///test/file.ts",
+            "languageId": "typescript",
+            "version": 1,
+            "text": "const x = 1;",
+        }
 
-        client._open_document("/test/file.ts", "const x = 1;", "typescript")
+    def test_did_close_names_document(self):
+        message = _did_close("/test/file.ts")
 
-        mock_stdin.write.assert_called_once()
-        written_data = mock_stdin.write.call_args[0][0].decode("utf-8")
-        assert "textDocument/didOpen" in written_data
+        assert message["method"] == "textDocument/didClose"
+        assert message["params"] == {"textDocument": {"uri": "file:///test/file.ts"}}
 
-    def test_close_document_sends_notification(self):
-        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
+    def test_sync_document_reuses_open_document(self, tmp_path):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
 
-        mock_stdin = MagicMock()
-        mock_process = MagicMock()
-        mock_process.stdin = mock_stdin
-        client.process = mock_process
+        _, first = client._sync_document(str(path))
+        _, second = client._sync_document(str(path))
+
+        assert [n["method"] for n in first] == ["textDocument/didOpen"]
+        assert first[0]["params"]["textDocument"]["languageId"] == "python"
+        assert second == []
+
+    def test_sync_document_resyncs_changed_document(self, tmp_path):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
 
-        client._close_document("/test/file.ts")
+        client._sync_document(str(path))
+        path.write_text("x = 22\n")
+        _, notifications = client._sync_document(str(path))
 
-        mock_stdin.write.assert_called_once()
-        written_data = mock_stdin.write.call_args[0][0].decode("utf-8")
-        assert "textDocument/didClose" in written_data
+        assert [n["method"] for n in notifications] == ["textDocument/didChange"]
+        params = notifications[0]["params"]
+        assert params["textDocument"]["version"] == 2
+        assert params["contentChanges"] == [{"text": "x = 22\n"}]
+
+    def test_sync_document_closes_least_recently_used(self, tmp_path):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        paths = []
+        for name in ("a.py", "b.py", "c.py"):
+            path = tmp_path / name
+            path.write_text("pass\n")
+            paths.append(str(path))
+
+        with patch("app.tools.lsp_client._MAX_OPEN_DOCUMENTS", 2):
+            client._sync_document(paths[0])
+            client._sync_document(paths[1])
+            _, reused = client._sync_document(paths[0])
+            _, notifications = client._sync_document(paths[2])
+
+        assert list(client._open_docs) == [paths[0], paths[2]]
+        assert reused == []
+        assert notifications == [
+            _did_open(paths[2], "pass\n", "python"),
+            _did_close(paths[1]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_document_request_fuses_open_into_request_write(
+        self, tmp_path, stdin_writes
+    ):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client.process = MagicMock()
+        client._reader = asyncio.StreamReader()
+        client._reader_task = asyncio.create_task(client._read_loop())
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
+
+        request = asyncio.create_task(
+            client._document_request(
+                "textDocument/documentSymbol", str(path), {"textDocument": {}}
+            )
+        )
+        await asyncio.sleep(0)
+        client._reader.feed_data(_frame({"jsonrpc": "2.0", "id": 1, "result": []}))
+
+        assert await request == []
+        assert len(stdin_writes) == 1
+        assert _written_methods(stdin_writes) == [
+            "textDocument/didOpen",
+            "textDocument/documentSymbol",
+        ]
+        client._reader.feed_eof()
+
+    @pytest.mark.asyncio
+    async def test_cached_response_still_syncs_evicted_document(
+        self, tmp_path, stdin_writes
+    ):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client.process = MagicMock()
+        paths = []
+        for name in ("a.py", "b.py"):
+            path = tmp_path / name
+            path.write_text("pass\n")
+            paths.append(str(path))
+
+        with (
+            patch("app.tools.lsp_client._MAX_OPEN_DOCUMENTS", 1),
+            patch.object(client, "_send_request", new_callable=AsyncMock) as send,
+        ):
+            send.return_value = []
+            for path in (paths[0], paths[1], paths[0]):
+                await client._document_request("textDocument/documentSymbol", path, {})
+
+        # The third request is answered from the cache, but a.py was closed
+        # in the meantime, so it still has to be reopened (and b.py closed)
+        assert send.await_count == 2
+        assert _written_methods(stdin_writes) == [
+            "textDocument/didOpen",
+            "textDocument/didClose",
+        ]
+        assert list(client._open_docs) == [paths[0]]
+
+    @pytest.mark.asyncio
+    async def test_unsent_notifications_leave_document_closed(self, tmp_path):
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
+
+        with pytest.raises(RuntimeError, match="LSP server not running"):
+            await client._document_request("textDocument/documentSymbol", str(path), {})
+
+        assert not client._open_docs
 
 
 class TestCodeManagerInitialize:
@@ -518,6 +1018,41 @@ class TestCodeManagerInitialize:
         assert result["python"] is False
         assert LanguageServer.TYPESCRIPT in manager._clients
 
+    @pytest.mark.asyncio
+    async def test_initialize_starts_servers_concurrently(self):
+        manager = CodeManager(workspace_root="/test")
+        started = []
+        both_started = asyncio.Event()
+
+        async def fake_start(self, workspace_root):
+            started.append(self.server_type)
+            if len(started) == 2:
+                both_started.set()
+            # Would never finish if the servers were started one at a time
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            if self.server_type == LanguageServer.PYTHON:
+                raise OSError("pyright crashed")
+            return True
+
+        with patch.object(CodeClient, "start", fake_start):
+            result = await manager.initialize()
+
+        assert result == {"typescript": True, "python": False}
+        assert list(manager._clients) == [LanguageServer.TYPESCRIPT]
+
+
+_SETTINGS_SYMBOL = {
+    "name": "Settings",
+    "kind": 5,
+    "location": {
+        "uri": "file:///test/config.py",
+        "range": {
+            "start": {"line": 0, "character": 0},
+            "end": {"line": 0, "character": 8},
+        },
+    },
+}
+
 
 class TestCodeClientAsyncMethods:
     """Tests for async LSP client methods with mocked initialization."""
@@ -531,18 +1066,16 @@ class TestCodeClientAsyncMethods:
 
         # Mock the send_request to return a location
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = {
-                            "uri": "file:///test/file.ts",
-                            "range": {
-                                "start": {"line": 0, "character": 0},
-                                "end": {"line": 0, "character": 5},
-                            },
-                        }
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = {
+                    "uri": "file:///test/file.ts",
+                    "range": {
+                        "start": {"line": 0, "character": 0},
+                        "end": {"line": 0, "character": 5},
+                    },
+                }
 
-                        result = await client.go_to_definition("/test/file.ts", 0, 0)
+                result = await client.go_to_definition("/test/file.ts", 0, 0)
 
         assert len(result) == 1
         assert result[0].uri == "file:///test/file.ts"
@@ -555,27 +1088,25 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = [
-                            {
-                                "uri": "file:///test/file1.ts",
-                                "range": {
-                                    "start": {"line": 0, "character": 0},
-                                    "end": {"line": 0, "character": 5},
-                                },
-                            },
-                            {
-                                "uri": "file:///test/file2.ts",
-                                "range": {
-                                    "start": {"line": 5, "character": 0},
-                                    "end": {"line": 5, "character": 5},
-                                },
-                            },
-                        ]
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = [
+                    {
+                        "uri": "file:///test/file1.ts",
+                        "range": {
+                            "start": {"line": 0, "character": 0},
+                            "end": {"line": 0, "character": 5},
+                        },
+                    },
+                    {
+                        "uri": "file:///test/file2.ts",
+                        "range": {
+                            "start": {"line": 5, "character": 0},
+                            "end": {"line": 5, "character": 5},
+                        },
+                    },
+                ]
 
-                        result = await client.go_to_definition("/test/file.ts", 0, 0)
+                result = await client.go_to_definition("/test/file.ts", 0, 0)
 
         assert len(result) == 2
 
@@ -599,20 +1130,18 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = [
-                            {
-                                "uri": "file:///test/ref.ts",
-                                "range": {
-                                    "start": {"line": 10, "character": 0},
-                                    "end": {"line": 10, "character": 5},
-                                },
-                            }
-                        ]
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = [
+                    {
+                        "uri": "file:///test/ref.ts",
+                        "range": {
+                            "start": {"line": 10, "character": 0},
+                            "end": {"line": 10, "character": 5},
+                        },
+                    }
+                ]
 
-                        result = await client.find_references("/test/file.ts", 0, 0)
+                result = await client.find_references("/test/file.ts", 0, 0)
 
         assert len(result) == 1
         assert result[0].uri == "file:///test/ref.ts"
@@ -625,18 +1154,16 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = {
-                            "contents": "const x: number",
-                            "range": {
-                                "start": {"line": 0, "character": 0},
-                                "end": {"line": 0, "character": 5},
-                            },
-                        }
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = {
+                    "contents": "const x: number",
+                    "range": {
+                        "start": {"line": 0, "character": 0},
+                        "end": {"line": 0, "character": 5},
+                    },
+                }
 
-                        result = await client.hover("/test/file.ts", 0, 0)
+                result = await client.hover("/test/file.ts", 0, 0)
 
         assert result is not None
         assert result.contents == "const x: number"
@@ -649,17 +1176,15 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = {
-                            "contents": {
-                                "kind": "markdown",
-                                "value": "**Type**: number",
-                            },
-                        }
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = {
+                    "contents": {
+                        "kind": "markdown",
+                        "value": "**Type**: number",
+                    },
+                }
 
-                        result = await client.hover("/test/file.ts", 0, 0)
+                result = await client.hover("/test/file.ts", 0, 0)
 
         assert result is not None
         assert "number" in result.contents
@@ -672,17 +1197,15 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = {
-                            "contents": [
-                                {"language": "typescript", "value": "const x: number"},
-                                "A constant",
-                            ],
-                        }
-
-                        result = await client.hover("/test/file.ts", 0, 0)
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = {
+                    "contents": [
+                        {"language": "typescript", "value": "const x: number"},
+                        "A constant",
+                    ],
+                }
+
+                result = await client.hover("/test/file.ts", 0, 0)
 
         assert result is not None
 
@@ -694,15 +1217,60 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = None
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = None
 
-                        result = await client.hover("/test/file.ts", 0, 0)
+                result = await client.hover("/test/file.ts", 0, 0)
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_repeat_requests_are_served_from_cache(self, tmp_path):
+        """Test identical requests on an unchanged file hit the server once."""
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client._initialized = True
+        client.process = MagicMock()
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
+
+        with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = []
+
+            await client.find_references(str(path), 0, 0)
+            await client.find_references(str(path), 0, 0)
+            assert mock_send.call_count == 1
+
+            await client.find_references(str(path), 0, 0, include_declaration=False)
+            assert mock_send.call_count == 2
+
+            path.write_text("x = 22\n")
+            await client.find_references(str(path), 0, 0)
+            assert mock_send.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_identical_inflight_requests_are_shared(self, stdin_writes):
+        """Test concurrent identical requests send a single request."""
+        client = CodeClient(server_type=LanguageServer.TYPESCRIPT)
+        client._initialized = True
+        client.process = MagicMock()
+        release = asyncio.Event()
+
+        async def slow_hover(method, params, notifications=None):
+            await release.wait()
+            return {"contents": "const x: number"}
+
+        with patch.object(client, "_send_request", side_effect=slow_hover) as mock_send:
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                first = asyncio.create_task(client.hover("/test/file.ts", 0, 6))
+                second = asyncio.create_task(client.hover("/test/file.ts", 0, 6))
+                await asyncio.sleep(0)
+                release.set()
+                results = await asyncio.gather(first, second)
+
+        assert mock_send.call_count == 1
+        assert [r.contents for r in results] == ["const x: number"] * 2
+        assert client._inflight == {}
+
     @pytest.mark.asyncio
     async def test_document_symbols_with_location_format(self):
         """Test document_symbols with SymbolInformation format."""
@@ -711,24 +1279,22 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch("pathlib.Path.read_text", return_value="const x = 1;"):
-                        mock_send.return_value = [
-                            {
-                                "name": "myFunction",
-                                "kind": 12,
-                                "location": {
-                                    "uri": "file:///test/file.ts",
-                                    "range": {
-                                        "start": {"line": 0, "character": 0},
-                                        "end": {"line": 5, "character": 0},
-                                    },
-                                },
-                            }
-                        ]
+            with patch("pathlib.Path.read_text", return_value="const x = 1;"):
+                mock_send.return_value = [
+                    {
+                        "name": "myFunction",
+                        "kind": 12,
+                        "location": {
+                            "uri": "file:///test/file.ts",
+                            "range": {
+                                "start": {"line": 0, "character": 0},
+                                "end": {"line": 5, "character": 0},
+                            },
+                        },
+                    }
+                ]
 
-                        result = await client.document_symbols("/test/file.ts")
+                result = await client.document_symbols("/test/file.ts")
 
         assert len(result) == 1
         assert result[0].name == "myFunction"
@@ -741,47 +1307,76 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch(
-                        "pathlib.Path.read_text", return_value="class MyClass {}"
-                    ):
-                        mock_send.return_value = [
+            with patch("pathlib.Path.read_text", return_value="class MyClass {}"):
+                mock_send.return_value = [
+                    {
+                        "name": "MyClass",
+                        "kind": 5,
+                        "range": {
+                            "start": {"line": 0, "character": 0},
+                            "end": {"line": 10, "character": 0},
+                        },
+                        "selectionRange": {
+                            "start": {"line": 0, "character": 6},
+                            "end": {"line": 0, "character": 13},
+                        },
+                        "children": [
                             {
-                                "name": "MyClass",
-                                "kind": 5,
+                                "name": "myMethod",
+                                "kind": 6,
                                 "range": {
-                                    "start": {"line": 0, "character": 0},
-                                    "end": {"line": 10, "character": 0},
+                                    "start": {"line": 2, "character": 0},
+                                    "end": {"line": 5, "character": 0},
                                 },
                                 "selectionRange": {
-                                    "start": {"line": 0, "character": 6},
-                                    "end": {"line": 0, "character": 13},
+                                    "start": {"line": 2, "character": 2},
+                                    "end": {"line": 2, "character": 10},
                                 },
-                                "children": [
-                                    {
-                                        "name": "myMethod",
-                                        "kind": 6,
-                                        "range": {
-                                            "start": {"line": 2, "character": 0},
-                                            "end": {"line": 5, "character": 0},
-                                        },
-                                        "selectionRange": {
-                                            "start": {"line": 2, "character": 2},
-                                            "end": {"line": 2, "character": 10},
-                                        },
-                                    }
-                                ],
                             }
-                        ]
+                        ],
+                    }
+                ]
 
-                        result = await client.document_symbols("/test/file.ts")
+                result = await client.document_symbols("/test/file.ts")
 
         assert len(result) == 2  # Parent + child
         assert result[0].name == "MyClass"
         assert result[1].name == "myMethod"
         assert result[1].container_name == "MyClass"
 
+    @pytest.mark.asyncio
+    async def test_document_symbols_walks_nested_children(self):
+        """Test document_symbols flattens every nesting level in order."""
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client._initialized = True
+
+        def symbol(name, line, children=()):
+            return {
+                "name": name,
+                "kind": 5,
+                "range": {
+                    "start": {"line": line, "character": 0},
+                    "end": {"line": line + 1, "character": 0},
+                },
+                "children": list(children),
+            }
+
+        with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
+            with patch("pathlib.Path.read_text", return_value="class Outer: ..."):
+                mock_send.return_value = [
+                    symbol("Outer", 0, [symbol("Inner", 1, [symbol("method", 2)])]),
+                    symbol("helper", 5),
+                ]
+
+                result = await client.document_symbols("/test/file.py")
+
+        assert [(s.name, s.container_name) for s in result] == [
+            ("Outer", None),
+            ("Inner", "Outer"),
+            ("method", "Inner"),
+            ("helper", None),
+        ]
+
     @pytest.mark.asyncio
     async def test_workspace_symbols_with_initialized_client(self):
         """Test workspace_symbols when client is initialized."""
@@ -809,6 +1404,55 @@ class TestCodeClientAsyncMethods:
         assert len(result) == 1
         assert result[0].name == "globalFunction"
 
+    @pytest.mark.asyncio
+    async def test_workspace_symbols_reuses_recent_results(
+        self, tmp_path, stdin_writes
+    ):
+        """Test repeat searches are answered locally until they go stale."""
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client._initialized = True
+        client.process = MagicMock()
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
+
+        with (
+            patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send,
+            patch("app.tools.lsp_client.time.monotonic") as clock,
+        ):
+            mock_send.return_value = [_SETTINGS_SYMBOL]
+            clock.return_value = 0.0
+
+            await client.workspace_symbols("Settings")
+            await client.workspace_symbols("Settings")
+            assert mock_send.call_count == 1
+
+            clock.return_value = 31.0
+            await client.workspace_symbols("Settings")
+            assert mock_send.call_count == 2
+
+            # Editing a file invalidates every cached search
+            client._sync_document(str(path))
+            path.write_text("x = 22\n")
+            client._sync_document(str(path))
+            await client.workspace_symbols("Settings")
+            assert mock_send.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_workspace_symbols_does_not_cache_empty_results(self):
+        """Test an empty answer (e.g. while indexing) is asked again."""
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client._initialized = True
+
+        with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = [None, [], [_SETTINGS_SYMBOL]]
+
+            assert await client.workspace_symbols("Settings") == []
+            assert await client.workspace_symbols("Settings") == []
+            result = await client.workspace_symbols("Settings")
+
+        assert mock_send.call_count == 3
+        assert [symbol.name for symbol in result] == ["Settings"]
+
     @pytest.mark.asyncio
     async def test_prepare_call_hierarchy_with_initialized_client(self):
         """Test prepare_call_hierarchy when client is initialized."""
@@ -817,30 +1461,24 @@ class TestCodeClientAsyncMethods:
         client.workspace_root = "/test"
 
         with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
-            with patch.object(client, "_open_document"):
-                with patch.object(client, "_close_document"):
-                    with patch(
-                        "pathlib.Path.read_text", return_value="function test() {}"
-                    ):
-                        mock_send.return_value = [
-                            {
-                                "name": "test",
-                                "kind": 12,
-                                "uri": "file:///test/file.ts",
-                                "range": {
-                                    "start": {"line": 0, "character": 0},
-                                    "end": {"line": 0, "character": 20},
-                                },
-                                "selectionRange": {
-                                    "start": {"line": 0, "character": 9},
-                                    "end": {"line": 0, "character": 13},
-                                },
-                            }
-                        ]
+            with patch("pathlib.Path.read_text", return_value="function test() {}"):
+                mock_send.return_value = [
+                    {
+                        "name": "test",
+                        "kind": 12,
+                        "uri": "file:///test/file.ts",
+                        "range": {
+                            "start": {"line": 0, "character": 0},
+                            "end": {"line": 0, "character": 20},
+                        },
+                        "selectionRange": {
+                            "start": {"line": 0, "character": 9},
+                            "end": {"line": 0, "character": 13},
+                        },
+                    }
+                ]
 
-                        result = await client.prepare_call_hierarchy(
-                            "/test/file.ts", 0, 10
-                        )
+                result = await client.prepare_call_hierarchy("/test/file.ts", 0, 10)
 
         assert len(result) == 1
         assert result[0].name == "test"
@@ -890,6 +1528,35 @@ class TestCodeClientAsyncMethods:
         assert len(result) == 1
         assert result[0].from_item.name == "caller"
         assert len(result[0].from_ranges) == 1
+        sent_item = mock_send.call_args[0][1]["item"]
+        assert sent_item["selectionRange"] == item.selection_range.to_dict()
+
+    @pytest.mark.asyncio
+    async def test_incoming_calls_returns_server_item_verbatim(self):
+        """Test items from prepare_call_hierarchy go back exactly as sent."""
+        client = CodeClient(server_type=LanguageServer.PYTHON)
+        client._initialized = True
+        raw = {
+            "name": "get_settings",
+            "kind": 12,
+            "uri": "file:///test/config.py",
+            "range": {
+                "start": {"line": 0, "character": 0},
+                "end": {"line": 3, "character": 0},
+            },
+            "selectionRange": {
+                "start": {"line": 0, "character": 4},
+                "end": {"line": 0, "character": 16},
+            },
+            "data": {"opaque": "server state"},
+        }
+        item = CallHierarchyItem.from_dict(raw)
+
+        with patch.object(client, "_send_request", new_callable=AsyncMock) as mock_send:
+            mock_send.return_value = []
+            await client.incoming_calls(item)
+
+        assert mock_send.call_args[0][1] == {"item": raw}
 
 
 @pytest.mark.integration
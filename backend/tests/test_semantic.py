@@ -4,6 +4,7 @@ These tests verify the semantic tools work correctly, with fallback behavior
 when LSP servers are not available.
 """
 
+import asyncio
 import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -11,6 +12,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from app.config import get_settings
+from app.tools import semantic
+from app.tools.lsp_client import Location, Position, Range
 from app.tools.semantic import (
     DefinitionLocation,
     DefinitionResult,
@@ -22,8 +25,10 @@ from app.tools.semantic import (
     CallHierarchyResult,
     SYMBOL_KINDS,
     _uri_to_path,
-    _get_line_content,
+    _location_previews,
     _find_symbol_in_file,
+    _find_word,
+    _symbol_pattern,
     go_to_definition,
     find_all_references,
     get_type_info,
@@ -79,24 +84,57 @@ class TestUriToPath:
         assert "passwd" in result
 
 
-class TestGetLineContent:
-    """Tests for the _get_line_content helper."""
+class TestLocationPreviews:
+    """Tests for the _location_previews helper."""
 
-    def test_gets_line_from_file(self, mock_codebase_root):
-        config_path = Path(mock_codebase_root) / "backend" / "app" / "config.py"
-        if config_path.exists():
-            content = _get_line_content(config_path, 0)  # First line
-            assert len(content) > 0
+    def test_reads_each_file_once(self, tmp_path):
+        (tmp_path / "a.py").write_text("one = 1\n    two = 2\n")
+        (tmp_path / "b.py").write_text("three = 3\n")
 
-    def test_handles_invalid_line(self, mock_codebase_root):
-        config_path = Path(mock_codebase_root) / "backend" / "app" / "config.py"
-        if config_path.exists():
-            content = _get_line_content(config_path, 99999)  # Way beyond file
-            assert content == ""
+        def loc(name, line):
+            return Location(
+                uri=f"file://{tmp_path}/{name}",
+                range=Range(Position(line, 0), Position(line, 3)),
+            )
+
+        locations = [loc("a.py", 1), loc("b.py", 0), loc("a.py", 0), loc("a.py", 9)]
+        with patch(
+            "app.tools.semantic._file_stamp", wraps=semantic._file_stamp
+        ) as stamp:
+            previews = _location_previews(locations, tmp_path)
+
+        assert previews == [
+            ("a.py", "two = 2"),
+            ("b.py", "three = 3"),
+            ("a.py", "one = 1"),
+            ("a.py", ""),
+        ]
+        assert stamp.call_count == 2
+
+    def test_unreadable_file_has_empty_previews(self, tmp_path):
+        location = Location(
+            uri="file:///nonexistent/file.py",
+            range=Range(Position(0, 0), Position(0, 1)),
+        )
+
+        assert _location_previews([location], tmp_path) == [
+            ("/nonexistent/file.py", "")
+        ]
+
+    def test_rereads_file_after_it_changes(self, tmp_path):
+        path = tmp_path / "mod.py"
+        path.write_text("first = 1\n")
+        location = Location(
+            uri=f"file://{path}", range=Range(Position(0, 0), Position(0, 5))
+        )
+        assert _location_previews([location], tmp_path) == [("mod.py", "first = 1")]
+
+        with patch("pathlib.Path.read_text") as mock_read:
+            assert _location_previews([location], tmp_path)[0][1] == "first = 1"
+        mock_read.assert_not_called()
 
-    def test_handles_nonexistent_file(self):
-        content = _get_line_content(Path("/nonexistent/file.py"), 0)
-        assert content == ""
+        path.write_text("second = 22\n")
+        assert _location_previews([location], tmp_path)[0][1] == "second = 22"
 
 
 class TestFindSymbolInFile:
@@ -117,6 +155,55 @@ class TestFindSymbolInFile:
         result = _find_symbol_in_file("nonexistent/file.py", "Settings")
         assert result is None
 
+    def test_returns_position_of_first_whole_word_match(self, tmp_path):
+        (tmp_path / "mod.py").write_text(
+            "import settings\n\nclass MySettings:\n    x = Settings()\n"
+        )
+        with patch.dict(os.environ, {"CODEBASE_ROOT": str(tmp_path)}):
+            get_settings.cache_clear()
+            result = _find_symbol_in_file("mod.py", "Settings")
+        get_settings.cache_clear()
+
+        assert result == (3, 8)
+
+
+class TestSymbolPattern:
+    """Tests for the cached symbol pattern."""
+
+    def test_matches_whole_words_only(self):
+        pattern = _symbol_pattern("get")
+        assert pattern.search("x = get(1)")
+        assert not pattern.search("x = get_settings()")
+
+    def test_escapes_the_name(self):
+        assert _symbol_pattern("a.b").search("a.b") is not None
+        assert _symbol_pattern("a.b").search("axb") is None
+
+    def test_reuses_compiled_pattern(self):
+        assert _symbol_pattern("Settings") is _symbol_pattern("Settings")
+
+
+class TestFindWord:
+    """Tests for the whole-word symbol search."""
+
+    def test_skips_partial_matches(self):
+        content = "get_settings()\nforget = 1\nx = get(2)"
+        assert _find_word(content, "get") == content.index("get(")
+
+    def test_matches_at_edges(self):
+        assert _find_word("get", "get") == 0
+        assert _find_word("x.get", "get") == 2
+
+    def test_non_ascii_neighbours_are_word_characters(self):
+        assert _find_word("éget get", "get") == 5
+
+    def test_non_identifier_uses_regex(self):
+        assert _find_word("x = a.b", "a.b") == 4
+        assert _find_word("axb", "a.b") == -1
+
+    def test_missing(self):
+        assert _find_word("getter", "get") == -1
+
 
 # ============================================================================
 # Schema Model Tests
@@ -232,6 +319,12 @@ class TestSymbolKinds:
         assert SYMBOL_KINDS[12] == "Function"
         assert SYMBOL_KINDS[13] == "Variable"
 
+    def test_indexed_by_lsp_kind_number(self):
+        assert SYMBOL_KINDS[0] is None
+        assert SYMBOL_KINDS[1] == "File"
+        assert SYMBOL_KINDS[26] == "TypeParameter"
+        assert len(SYMBOL_KINDS) == 27
+
 
 # ============================================================================
 # Tool Function Tests (with mocked LSP)
@@ -444,6 +537,40 @@ class TestFindAllReferencesWithMockedLSP:
             assert isinstance(result, ReferencesResult)
             mock_client.find_references.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_previews_only_returned_references(self, mock_codebase_root):
+        """Locations past the result limit are counted but not previewed."""
+        with (
+            patch("app.tools.semantic.get_code_manager") as mock_get,
+            patch(
+                "app.tools.semantic._location_previews",
+                side_effect=lambda locs, root: (
+                    [("backend/app/main.py", "")] * len(locs)
+                ),
+            ) as mock_previews,
+        ):
+            manager = MagicMock()
+            mock_client = MagicMock()
+            locations = [
+                Location(
+                    uri=f"file://{mock_codebase_root}/backend/app/main.py",
+                    range=Range(start=Position(i, 0), end=Position(i, 8)),
+                )
+                for i in range(150)
+            ]
+            mock_client.find_references = AsyncMock(return_value=locations)
+            manager.get_client.return_value = mock_client
+            mock_get.return_value = manager
+
+            result = await find_all_references(
+                "backend/app/config.py", "Settings", 10, 0
+            )
+
+            assert result.success is True
+            assert result.total_found == 150
+            assert len(result.references) == 100
+            assert len(mock_previews.call_args.args[0]) == 100
+
 
 class TestGetTypeInfoWithMockedLSP:
     """Tests for get_type_info with fully mocked LSP."""
@@ -513,6 +640,30 @@ class TestGetDocumentSymbolsWithMockedLSP:
             assert result.success is True
             assert len(result.symbols) == 1
             assert result.symbols[0].name == "Settings"
+            assert result.symbols[0].kind == "Class"
+
+    @pytest.mark.asyncio
+    async def test_unknown_symbol_kind(self, mock_codebase_root):
+        """Kinds outside the LSP table are reported as Unknown."""
+        with patch("app.tools.semantic.get_code_manager") as mock_get:
+            manager = MagicMock()
+            mock_client = MagicMock()
+            symbols = []
+            for kind in (0, 27):
+                mock_symbol = MagicMock()
+                mock_symbol.name = "thing"
+                mock_symbol.kind = kind
+                mock_symbol.location.range.start = MagicMock(line=0)
+                mock_symbol.container_name = None
+                symbols.append(mock_symbol)
+
+            mock_client.document_symbols = AsyncMock(return_value=symbols)
+            manager.get_client.return_value = mock_client
+            mock_get.return_value = manager
+
+            result = await get_document_symbols("backend/app/config.py")
+
+            assert [s.kind for s in result.symbols] == ["Unknown(0)", "Unknown(27)"]
 
 
 class TestGetCallersWithMockedLSP:
@@ -622,6 +773,25 @@ class TestSemanticToolsExceptionHandling:
             assert "Call hierarchy failed" in result.error
 
 
+class TestSyncWrappers:
+    """Tests for the synchronous tool wrappers."""
+
+    def test_calls_share_one_background_loop(self):
+        loops = []
+
+        async def fake_symbols(file_path):
+            loops.append(asyncio.get_running_loop())
+            return DocumentSymbolsResult(file=file_path, symbols=[], success=True)
+
+        with patch("app.tools.semantic.get_document_symbols", fake_symbols):
+            first = semantic.get_document_symbols_sync("a.py")
+            semantic.get_document_symbols_sync("b.py")
+
+        assert first.file == "a.py"
+        assert loops[0] is loops[1]
+        assert loops[0].is_running()
+
+
 @pytest.mark.integration
 class TestLSPIntegration:
     """Integration tests that require actual LSP servers.
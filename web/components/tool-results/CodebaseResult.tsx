@@ -157,7 +157,8 @@ function SymbolResult({ data }: { data: FindSymbolOutput }) {
           <Search className="text-primary size-4" />
           <span className="text-sm font-medium">Found &quot;{data.symbol}&quot;</span>
           <Badge variant="secondary" className="text-xs">
-            {data.total_found} location{data.total_found !== 1 ? "s" : ""}
+            {data.total_found}
+            {data.truncated ? "+" : ""} location{data.total_found !== 1 ? "s" : ""}
           </Badge>
         </div>
         {isExpanded ? (
@@ -255,7 +256,8 @@ function ReferencesResult({ data }: { data: FindReferencesOutput }) {
           <Link2 className="text-primary size-4" />
           <span className="text-sm font-medium">References to &quot;{data.symbol}&quot;</span>
           <Badge variant="secondary" className="text-xs">
-            {data.total_found} reference{data.total_found !== 1 ? "s" : ""}
+            {data.total_found}
+            {data.truncated ? "+" : ""} reference{data.total_found !== 1 ? "s" : ""}
           </Badge>
         </div>
         {isExpanded ? (
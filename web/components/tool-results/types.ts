@@ -104,6 +104,7 @@ export interface FindSymbolOutput {
   symbol: string;
   locations: SymbolLocation[];
   total_found: number;
+  truncated?: boolean;
 }
 
 export interface FileContentOutput {
@@ -125,6 +126,7 @@ export interface FindReferencesOutput {
   symbol: string;
   references: Reference[];
   total_found: number;
+  truncated?: boolean;
 }
 
 // =============================================================================